@@ -199,9 +199,11 @@ class AdminApi {
     return data;
   }
 
-  async exportLogs(hours: number = 24, format: 'json' | 'csv' = 'json'): Promise<any> {
+  async exportLogs(hours: number = 24, format: 'json' | 'ndjson' | 'csv' = 'json'): Promise<Blob> {
     const { data } = await this.client.get('/api/admin/logs/export', {
       params: { hours, format },
+      responseType: 'blob',
+      timeout: 0, // 대용량 내보내기 (스트리밍)
     });
     return data;
   }
@@ -228,17 +230,29 @@ class AdminApi {
   }
 
   // 캐시 관리 API
-  async getCachedReports(): Promise<{
+  async getCachedReports(params?: { cursor?: number; count?: number; symbol?: string }): Promise<{
     cached_reports: Array<{
       symbol: string;
       report_date: string;
       cache_key: string;
       ttl_seconds: number;
       ttl_minutes: number;
+      size_bytes: number;
     }>;
     total: number;
+    next_cursor: number;
+    has_more: boolean;
   }> {
-    const { data } = await this.client.get('/api/admin/database/cache/reports');
+    const { data } = await this.client.get('/api/admin/database/cache/reports', { params });
+    return data;
+  }
+
+  async deleteSymbolCachedReports(symbol: string): Promise<{
+    message: string;
+    symbol: string;
+    deleted: number;
+  }> {
+    const { data } = await this.client.delete(`/api/admin/database/cache/reports/${symbol}`);
     return data;
   }
 
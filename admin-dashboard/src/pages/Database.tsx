@@ -1,3 +1,4 @@
+import { useState } from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { Database as DatabaseIcon, Table, Activity, Trash2, Clock } from 'lucide-react';
 import { adminApi } from '@/lib/adminApi';
@@ -23,10 +24,13 @@ export default function Database() {
     queryFn: () => adminApi.getDatabaseStatistics(),
   });
 
-  // 캐시 목록 조회
+  // 캐시 목록 조회 (SCAN 커서 페이지네이션 - 지나온 커서 스택)
+  const [cacheCursors, setCacheCursors] = useState<number[]>([0]);
+  const cacheCursor = cacheCursors[cacheCursors.length - 1];
+
   const { data: cacheData } = useQuery({
-    queryKey: ['cached-reports'],
-    queryFn: () => adminApi.getCachedReports(),
+    queryKey: ['cached-reports', cacheCursor],
+    queryFn: () => adminApi.getCachedReports({ cursor: cacheCursor, count: 100 }),
     refetchInterval: 15000, // 15초마다 갱신
   });
 
@@ -43,6 +47,18 @@ export default function Database() {
     },
   });
 
+  // 종목 전체 캐시 삭제 (종목 인덱스 기반)
+  const deleteSymbolCacheMutation = useMutation({
+    mutationFn: (symbol: string) => adminApi.deleteSymbolCachedReports(symbol),
+    onSuccess: (data) => {
+      toast.success(data.message || `${data.symbol} 캐시 ${data.deleted}건이 삭제되었습니다`);
+      queryClient.invalidateQueries({ queryKey: ['cached-reports'] });
+    },
+    onError: (error: any) => {
+      toast.error(error.response?.data?.detail || '종목 캐시 삭제 실패');
+    },
+  });
+
   const formatNumber = (num: number) => {
     return new Intl.NumberFormat('ko-KR').format(num);
   };
@@ -186,7 +202,25 @@ export default function Database() {
             <p className="text-sm text-gray-600 mt-1">Redis에 캐시된 종목 레포트 목록</p>
           </div>
           {cacheData && (
-            <span className="badge badge-info">총 {cacheData.total}개 캐시</span>
+            <div className="flex items-center space-x-2">
+              <span className="badge badge-info">
+                {cacheData.total}개 캐시{cacheData.has_more ? ' (다음 페이지 있음)' : ''}
+              </span>
+              <button
+                onClick={() => setCacheCursors((cursors) => cursors.slice(0, -1))}
+                disabled={cacheCursors.length <= 1}
+                className="btn btn-sm btn-secondary"
+              >
+                이전
+              </button>
+              <button
+                onClick={() => setCacheCursors((cursors) => [...cursors, cacheData.next_cursor])}
+                disabled={!cacheData.has_more}
+                className="btn btn-sm btn-secondary"
+              >
+                다음
+              </button>
+            </div>
           )}
         </div>
 
@@ -217,25 +251,39 @@ export default function Database() {
                       </div>
                     </td>
                     <td className="text-right">
-                      <button
-                        onClick={() => {
-                          if (
-                            window.confirm(
-                              `${cache.symbol} (${cache.report_date}) 캐시를 삭제하시겠습니까?`
-                            )
-                          ) {
-                            deleteCacheMutation.mutate({
-                              symbol: cache.symbol,
-                              reportDate: cache.report_date,
-                            });
-                          }
-                        }}
-                        disabled={deleteCacheMutation.isPending}
-                        className="btn btn-sm bg-red-600 text-white hover:bg-red-700 flex items-center space-x-2"
-                      >
-                        <Trash2 className="w-4 h-4" />
-                        <span>{deleteCacheMutation.isPending ? '삭제 중...' : '삭제'}</span>
-                      </button>
+                      <div className="flex items-center justify-end space-x-2">
+                        <button
+                          onClick={() => {
+                            if (
+                              window.confirm(
+                                `${cache.symbol} (${cache.report_date}) 캐시를 삭제하시겠습니까?`
+                              )
+                            ) {
+                              deleteCacheMutation.mutate({
+                                symbol: cache.symbol,
+                                reportDate: cache.report_date,
+                              });
+                            }
+                          }}
+                          disabled={deleteCacheMutation.isPending}
+                          className="btn btn-sm bg-red-600 text-white hover:bg-red-700 flex items-center space-x-2"
+                        >
+                          <Trash2 className="w-4 h-4" />
+                          <span>{deleteCacheMutation.isPending ? '삭제 중...' : '삭제'}</span>
+                        </button>
+                        <button
+                          onClick={() => {
+                            if (window.confirm(`${cache.symbol} 종목의 캐시를 모두 삭제하시겠습니까?`)) {
+                              deleteSymbolCacheMutation.mutate(cache.symbol);
+                            }
+                          }}
+                          disabled={deleteSymbolCacheMutation.isPending}
+                          className="btn btn-sm bg-gray-700 text-white hover:bg-gray-800 flex items-center space-x-2"
+                        >
+                          <Trash2 className="w-4 h-4" />
+                          <span>{deleteSymbolCacheMutation.isPending ? '삭제 중...' : '종목 전체 삭제'}</span>
+                        </button>
+                      </div>
                     </td>
                   </tr>
                 ))}
@@ -30,25 +30,13 @@ export default function Logs() {
 
   const handleExport = async (format: 'json' | 'csv') => {
     try {
-      const data = await adminApi.exportLogs(timeRange, format);
-
-      if (format === 'json') {
-        const blob = new Blob([JSON.stringify(data.data, null, 2)], {
-          type: 'application/json',
-        });
-        const url = URL.createObjectURL(blob);
-        const a = document.createElement('a');
-        a.href = url;
-        a.download = `admin-logs-${new Date().toISOString()}.json`;
-        a.click();
-      } else {
-        const blob = new Blob([data.data], { type: 'text/csv' });
-        const url = URL.createObjectURL(blob);
-        const a = document.createElement('a');
-        a.href = url;
-        a.download = `admin-logs-${new Date().toISOString()}.csv`;
-        a.click();
-      }
+      // 서버에서 파일로 스트리밍 (CSV/JSON 직렬화는 서버 처리)
+      const blob = await adminApi.exportLogs(timeRange, format);
+      const url = URL.createObjectURL(blob);
+      const a = document.createElement('a');
+      a.href = url;
+      a.download = `admin-logs-${new Date().toISOString()}.${format}`;
+      a.click();
 
       alert('로그가 다운로드되었습니다.');
     } catch (error) {
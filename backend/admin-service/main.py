@@ -72,6 +72,7 @@ print("✅ CORS 미들웨어 설정 완료")
 
 # 라우터 임포트 및 등록
 from routers import users, services, metrics, database, logs
+from services.activity_logger import activity_logger
 
 app.include_router(users.router, prefix="/api/admin/users", tags=["Users"])
 app.include_router(services.router, prefix="/api/admin/services", tags=["Services"])
@@ -81,6 +82,21 @@ app.include_router(logs.router, prefix="/api/admin/logs", tags=["Logs"])
 
 print("✅ 모든 라우터 등록 완료")
 
+
+# 🔥 백그라운드 헬스 폴러 (대시보드는 캐시된 상태 조회)
+# 🔥 활동 로그 Write-Behind 버퍼 (종료 시 남은 로그 저장)
+@app.on_event("startup")
+async def start_background_tasks():
+    await activity_logger.start()
+    await services.health_poller.start()
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    await services.health_poller.stop()
+    await activity_logger.stop()
+
+
 # 헬스체크 엔드포인트
 @app.get("/health")
 async def health():
@@ -89,7 +105,8 @@ async def health():
         "status": "ok",
         "service": "admin-service",
         "version": "1.0.0",
-        "environment": os.getenv("RAILWAY_ENVIRONMENT", "local")
+        "environment": os.getenv("RAILWAY_ENVIRONMENT", "local"),
+        "activity_log": activity_logger.get_stats()
     }
 
 # 루트 엔드포인트
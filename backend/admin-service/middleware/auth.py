@@ -1,12 +1,19 @@
 """
 Admin 인증 미들웨어
 JWT 토큰 검증 + admin role 확인
+
+🔥 요청당 Auth 서버 / users 테이블 왕복 제거
+- JWT는 로컬 검증 (jwt_verifier: HS256 시크릿 또는 JWKS 캐시)
+- role 조회는 사용자 ID별 짧은 TTL 캐시 (역할 변경/삭제 시 invalidate_admin_role 호출)
 """
 from fastapi import Header, HTTPException, Depends
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import os
+import time
+import threading
 from supabase import create_client, Client
 from dotenv import load_dotenv
+from middleware.jwt_verifier import jwt_verifier, TokenVerificationError, VerifierNotConfigured
 
 # .env 파일 로드
 load_dotenv()
@@ -30,6 +37,66 @@ else:
 # 데이터 조회용 클라이언트 (SERVICE_KEY 사용 - RLS 우회)
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
 
+# role 캐시 TTL (초) - 다른 레플리카에서 변경된 권한은 최대 이 시간 후 반영
+ROLE_CACHE_TTL_SECONDS = int(os.getenv("ADMIN_ROLE_CACHE_TTL_SECONDS", "60"))
+
+
+class RoleCache:
+    """사용자 ID → users 행 (id, email, name, role) TTL 캐시"""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[user_id]
+                return None
+            return entry[1]
+
+    def set(self, user_id: str, user_data: dict):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic(), user_data)
+
+    def invalidate(self, user_id: Optional[str] = None):
+        """캐시 무효화 (user_id 미지정 시 전체)"""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+role_cache = RoleCache(ROLE_CACHE_TTL_SECONDS)
+
+
+def invalidate_admin_role(user_id: str):
+    """역할 변경/사용자 삭제 시 호출 (이 인스턴스의 캐시 즉시 무효화)"""
+    role_cache.invalidate(user_id)
+
+
+def _resolve_user_id(token: str) -> str:
+    """토큰 검증 후 user_id 반환 (로컬 검증, 시크릿 미설정 시에만 Auth 서버 호출)"""
+    try:
+        return jwt_verifier.verify(token)["sub"]
+    except VerifierNotConfigured:
+        pass
+    except TokenVerificationError as e:
+        raise HTTPException(status_code=401, detail=f"유효하지 않은 토큰입니다: {str(e)}")
+
+    # Supabase JWT 검증 (ANON_KEY 클라이언트 사용)
+    user_response = supabase_auth.auth.get_user(token)
+
+    if not user_response or not user_response.user:
+        raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다.")
+
+    return user_response.user.id
+
 
 async def verify_admin_token(authorization: Optional[str] = Header(None)) -> dict:
     """
@@ -53,21 +120,19 @@ async def verify_admin_token(authorization: Optional[str] = Header(None)) -> dic
     token = authorization.replace("Bearer ", "")
 
     try:
-        # Supabase JWT 검증 (ANON_KEY 클라이언트 사용)
-        user_response = supabase_auth.auth.get_user(token)
-
-        if not user_response or not user_response.user:
-            raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다.")
+        user_id = _resolve_user_id(token)
 
-        user_id = user_response.user.id
+        # users 테이블에서 role 확인 (캐시 우선)
+        user_data = role_cache.get(user_id)
 
-        # users 테이블에서 role 확인
-        result = supabase.table("users").select("id, email, name, role").eq("id", user_id).maybe_single().execute()
+        if user_data is None:
+            result = supabase.table("users").select("id, email, name, role").eq("id", user_id).maybe_single().execute()
 
-        if not result.data:
-            raise HTTPException(status_code=401, detail="사용자를 찾을 수 없습니다.")
+            if not result.data:
+                raise HTTPException(status_code=401, detail="사용자를 찾을 수 없습니다.")
 
-        user_data = result.data
+            user_data = result.data
+            role_cache.set(user_id, user_data)
 
         # admin 또는 superadmin 권한 확인
         if user_data.get("role") not in ["admin", "superadmin"]:
@@ -0,0 +1,125 @@
+"""
+Supabase JWT 로컬 검증
+- 요청마다 supabase.auth.get_user() 호출 (Auth 서버 왕복) 대신 서명/만료/audience를 로컬 검증
+- HS256: SUPABASE_JWT_SECRET (레거시 공유 시크릿)
+- RS256/ES256: Supabase JWKS ({SUPABASE_URL}/auth/v1/.well-known/jwks.json) 캐시
+  (TTL 만료 또는 모르는 kid일 때만 재조회)
+
+주의: 로컬 검증은 로그아웃/세션 폐기를 토큰 만료 전까지 감지하지 못함 (Supabase 기본 만료 1시간)
+"""
+import os
+import time
+import threading
+from typing import Any, Dict, Optional
+import httpx
+from jose import jwt, JWTError
+
+JWT_AUDIENCE = "authenticated"
+
+# JWKS 캐시 TTL (초)
+JWKS_CACHE_TTL_SECONDS = int(os.getenv("JWKS_CACHE_TTL_SECONDS", "600"))
+
+# 모르는 kid로 인한 재조회 최소 간격 (초) - 위조 토큰으로 JWKS 요청 폭주 방지
+JWKS_MIN_REFRESH_INTERVAL_SECONDS = 30
+
+ASYMMETRIC_ALGORITHMS = {"RS256", "ES256"}
+
+
+class TokenVerificationError(Exception):
+    """토큰 검증 실패 (서명/만료/형식 오류)"""
+
+
+class VerifierNotConfigured(TokenVerificationError):
+    """로컬 검증 불가 (시크릿 미설정) - 호출 측에서 Auth 서버 검증으로 대체"""
+
+
+class JwtVerifier:
+    """Supabase 액세스 토큰 로컬 검증기"""
+
+    def __init__(
+        self,
+        supabase_url: Optional[str] = None,
+        jwt_secret: Optional[str] = None,
+        jwks_ttl: int = JWKS_CACHE_TTL_SECONDS
+    ):
+        self.supabase_url = (supabase_url or os.getenv("SUPABASE_URL") or "").rstrip("/")
+        self.jwt_secret = jwt_secret if jwt_secret is not None else os.getenv("SUPABASE_JWT_SECRET")
+        self.jwks_ttl = jwks_ttl
+
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._keys_fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def jwks_url(self) -> str:
+        return f"{self.supabase_url}/auth/v1/.well-known/jwks.json"
+
+    def _fetch_jwks(self) -> Dict[str, Dict[str, Any]]:
+        response = httpx.get(self.jwks_url, timeout=5.0)
+        response.raise_for_status()
+        return {key["kid"]: key for key in response.json().get("keys", []) if key.get("kid")}
+
+    def _get_signing_key(self, kid: Optional[str]) -> Dict[str, Any]:
+        """kid에 해당하는 JWK (캐시 만료 또는 미등록 kid면 재조회)"""
+        now = time.monotonic()
+        with self._lock:
+            expired = now - self._keys_fetched_at > self.jwks_ttl
+            unknown = kid not in self._keys and now - self._keys_fetched_at > JWKS_MIN_REFRESH_INTERVAL_SECONDS
+
+            if expired or unknown:
+                try:
+                    self._keys = self._fetch_jwks()
+                    self._keys_fetched_at = now
+                except Exception as e:
+                    # 조회 실패 시 기존 키 유지 (Auth 서버 장애가 곧 인증 장애가 되지 않도록)
+                    print(f"⚠️ JWKS 조회 실패: {str(e)}")
+                    if not self._keys:
+                        raise TokenVerificationError(f"JWKS 조회 실패: {str(e)}")
+
+            key = self._keys.get(kid)
+
+        if key is None:
+            raise TokenVerificationError(f"알 수 없는 서명 키 (kid={kid})")
+        return key
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        토큰 검증 후 클레임 반환
+
+        Args:
+            token: Bearer 토큰 (JWT)
+
+        Returns:
+            Dict[str, Any]: 클레임 (sub = user_id, email, role 등)
+
+        Raises:
+            VerifierNotConfigured: HS256 토큰인데 SUPABASE_JWT_SECRET 미설정
+            TokenVerificationError: 서명/만료/audience/형식 오류
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise TokenVerificationError(f"토큰 형식 오류: {str(e)}")
+
+        algorithm = header.get("alg")
+        if algorithm == "HS256":
+            if not self.jwt_secret:
+                raise VerifierNotConfigured("SUPABASE_JWT_SECRET 미설정 (HS256 토큰 로컬 검증 불가)")
+            key = self.jwt_secret
+        elif algorithm in ASYMMETRIC_ALGORITHMS:
+            key = self._get_signing_key(header.get("kid"))
+        else:
+            raise TokenVerificationError(f"지원하지 않는 알고리즘: {algorithm}")
+
+        try:
+            claims = jwt.decode(token, key, algorithms=[algorithm], audience=JWT_AUDIENCE)
+        except JWTError as e:
+            raise TokenVerificationError(str(e))
+
+        if not claims.get("sub"):
+            raise TokenVerificationError("sub 클레임 없음")
+        return claims
+
+
+# 전역 검증기 (JWKS 캐시 공유)
+jwt_verifier = JwtVerifier()
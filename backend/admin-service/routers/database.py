@@ -6,12 +6,14 @@
 - 백업 및 복원 (향후 구현)
 - 레포트 캐시 관리
 """
-from fastapi import APIRouter, HTTPException, Body
+from fastapi import APIRouter, HTTPException, Body, Query
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Tuple
 from datetime import datetime
+import time
 from middleware.auth import AdminUser
 from services.supabase_client import get_supabase
+from services.activity_logger import activity_logger
 import httpx
 import os
 
@@ -37,6 +39,33 @@ MAIN_TABLES = [
     "business_metrics"
 ]
 
+# 🔥 통계 결과 캐시 TTL (초) - 대시보드 새로고침마다 전체 테이블 집계 방지
+DATABASE_STATS_CACHE_TTL_SECONDS = int(os.getenv("DATABASE_STATS_CACHE_TTL_SECONDS", "30"))
+
+_stats_cache: Dict[str, Tuple[float, Any]] = {}
+
+
+def _get_cached(key: str, loader: Callable[[], Any]) -> Any:
+    """TTL 캐시 조회 (만료 시 loader 실행 후 저장)"""
+    entry = _stats_cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < DATABASE_STATS_CACHE_TTL_SECONDS:
+        return entry[1]
+
+    value = loader()
+    _stats_cache[key] = (time.monotonic(), value)
+    return value
+
+
+def _load_table_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    테이블별 행 수(추정) / 크기 / 최근 업데이트 시각 (RPC 1회)
+
+    Returns:
+        Dict[str, Dict]: {테이블명: {row_count, size_bytes, last_updated}}
+    """
+    result = supabase.rpc("admin_table_stats", {"p_tables": MAIN_TABLES}).execute()
+    return {row["table_name"]: row for row in (result.data or [])}
+
 
 class TableStatistics(BaseModel):
     table_name: str
@@ -63,65 +92,34 @@ async def get_table_statistics(admin: dict = AdminUser):
     """
     전체 테이블 목록 및 통계 조회
 
+    🔥 pg_stat_user_tables 기반 RPC 1회 (행 수는 추정치) + 30초 캐시
+
     Returns:
         List[TableStatistics]: 테이블 통계 목록
     """
     try:
-        table_stats = []
+        stats_by_table = _get_cached("tables", _load_table_stats)
 
+        table_stats = []
         for table_name in MAIN_TABLES:
-            try:
-                # 테이블 행 수 조회
-                result = supabase.table(table_name).select("id", count="exact").limit(1).execute()
-                row_count = result.count if result.count is not None else 0
-
-                # 최근 업데이트 시간 조회 (updated_at 또는 created_at 컬럼 사용)
-                last_updated = None
-                try:
-                    recent = supabase.table(table_name) \
-                        .select("updated_at") \
-                        .order("updated_at", desc=True) \
-                        .limit(1) \
-                        .execute()
-
-                    if recent.data and len(recent.data) > 0:
-                        last_updated = recent.data[0].get("updated_at")
-                except Exception:
-                    # updated_at 컬럼이 없으면 created_at 시도
-                    try:
-                        recent = supabase.table(table_name) \
-                            .select("created_at") \
-                            .order("created_at", desc=True) \
-                            .limit(1) \
-                            .execute()
-
-                        if recent.data and len(recent.data) > 0:
-                            last_updated = recent.data[0].get("created_at")
-                    except Exception:
-                        pass
-
-                table_stats.append(TableStatistics(
-                    table_name=table_name,
-                    row_count=row_count,
-                    size_bytes=None,  # Supabase에서 직접 조회 불가 (pg_total_relation_size 필요)
-                    last_updated=last_updated
-                ))
-
-            except Exception as e:
-                print(f"⚠️  테이블 {table_name} 통계 조회 실패: {str(e)}")
-                table_stats.append(TableStatistics(
-                    table_name=table_name,
-                    row_count=0,
-                    size_bytes=None,
-                    last_updated=None
-                ))
+            stats = stats_by_table.get(table_name)
+            if stats is None:
+                print(f"⚠️  테이블 {table_name} 통계 없음 (pg_stat_user_tables 미등록)")
+                stats = {}
+
+            table_stats.append(TableStatistics(
+                table_name=table_name,
+                row_count=stats.get("row_count") or 0,
+                size_bytes=stats.get("size_bytes"),
+                last_updated=stats.get("last_updated")
+            ))
 
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "database_tables_view",
             "target_type": "database"
-        }).execute()
+        })
 
         return table_stats
 
@@ -162,12 +160,12 @@ async def get_table_detail(table_name: str, admin: dict = AdminUser):
             columns = list(sample_data.data[0].keys())
 
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "database_table_detail_view",
             "target_type": "database",
             "target_id": table_name
-        }).execute()
+        })
 
         return {
             "table_name": table_name,
@@ -234,7 +232,7 @@ async def execute_query(request: QueryRequest, admin: dict = AdminUser):
         execution_time = (datetime.utcnow() - start_time).total_seconds() * 1000
 
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "database_query_execute",
             "target_type": "database",
@@ -242,7 +240,7 @@ async def execute_query(request: QueryRequest, admin: dict = AdminUser):
                 "query": query[:200],  # 처음 200자만 로그
                 "description": request.description
             }
-        }).execute()
+        })
 
         return QueryResponse(
             success=False,
@@ -282,14 +280,13 @@ async def check_database_health(admin: dict = AdminUser):
         # 2. 전체 테이블 수 확인
         total_tables = len(MAIN_TABLES)
 
-        # 3. 전체 레코드 수 계산
+        # 3. 전체 레코드 수 계산 (테이블 통계 캐시 공유, 추정치)
         total_records = 0
-        for table_name in MAIN_TABLES:
-            try:
-                result = supabase.table(table_name).select("id", count="exact").limit(1).execute()
-                total_records += result.count if result.count is not None else 0
-            except Exception:
-                pass
+        try:
+            stats_by_table = _get_cached("tables", _load_table_stats)
+            total_records = sum(stats.get("row_count") or 0 for stats in stats_by_table.values())
+        except Exception as e:
+            print(f"⚠️  전체 레코드 수 조회 실패: {str(e)}")
 
         # 4. 최근 활동 확인 (admin_activity_logs)
         recent_activity = supabase.table("admin_activity_logs") \
@@ -352,15 +349,16 @@ async def truncate_table(table_name: str, admin: dict = AdminUser):
         # 전체 삭제 (Supabase에서는 delete().neq("id", "") 패턴 사용)
         # 실제 TRUNCATE는 PostgreSQL 직접 연결 필요
         supabase.table(table_name).delete().neq("id", "00000000-0000-0000-0000-000000000000").execute()
+        _stats_cache.clear()
 
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "database_table_truncate",
             "target_type": "database",
             "target_id": table_name,
             "details": {"deleted_rows": before_count}
-        }).execute()
+        })
 
         return {
             "message": f"테이블 {table_name}의 모든 데이터가 삭제되었습니다.",
@@ -384,29 +382,16 @@ async def get_database_statistics(admin: dict = AdminUser):
         dict: 데이터베이스 통계 정보
     """
     try:
-        # 1. 사용자 통계
-        users_count = supabase.table("users").select("id", count="exact").execute().count
-        admin_count = supabase.table("users").select("id", count="exact").eq("role", "admin").execute().count
-
-        # 2. 포트폴리오 통계
-        portfolios_count = supabase.table("portfolios").select("id", count="exact").execute().count
-        watchlist_count = supabase.table("watchlist").select("id", count="exact").execute().count
-
-        # 3. 레포트 통계
-        reports_count = supabase.table("stock_reports").select("id", count="exact").execute().count
-
-        # 4. 뉴스 통계
-        news_count = supabase.table("news").select("id", count="exact").execute().count
-
-        # 5. 알림 통계
-        alerts_count = supabase.table("alerts").select("id", count="exact").execute().count
-        unread_alerts = supabase.table("alerts").select("id", count="exact").eq("status", "unread").execute().count
-
-        # 6. 시스템 메트릭 통계
-        system_metrics_count = supabase.table("system_metrics").select("id", count="exact").execute().count
+        # 🔥 전체 count를 RPC 1회로 집계 (30초 캐시)
+        counts = _get_cached(
+            "statistics",
+            lambda: supabase.rpc("admin_database_statistics").execute().data or {}
+        )
 
-        # 7. 관리자 활동 로그 통계
-        admin_logs_count = supabase.table("admin_activity_logs").select("id", count="exact").execute().count
+        users_count = counts.get("users", 0)
+        admin_count = counts.get("admins", 0)
+        alerts_count = counts.get("alerts", 0)
+        unread_alerts = counts.get("unread_alerts", 0)
 
         return {
             "users": {
@@ -415,14 +400,14 @@ async def get_database_statistics(admin: dict = AdminUser):
                 "regular_users": users_count - admin_count
             },
             "portfolios": {
-                "total": portfolios_count,
-                "watchlist": watchlist_count
+                "total": counts.get("portfolios", 0),
+                "watchlist": counts.get("watchlist", 0)
             },
             "reports": {
-                "total": reports_count
+                "total": counts.get("reports", 0)
             },
             "news": {
-                "total": news_count
+                "total": counts.get("news", 0)
             },
             "alerts": {
                 "total": alerts_count,
@@ -430,8 +415,8 @@ async def get_database_statistics(admin: dict = AdminUser):
                 "read": alerts_count - unread_alerts
             },
             "system": {
-                "system_metrics": system_metrics_count,
-                "admin_logs": admin_logs_count
+                "system_metrics": counts.get("system_metrics", 0),
+                "admin_logs": counts.get("admin_logs", 0)
             },
             "generated_at": datetime.utcnow().isoformat()
         }
@@ -443,16 +428,25 @@ async def get_database_statistics(admin: dict = AdminUser):
 
 # 🔥 레포트 캐시 관리 엔드포인트
 @router.get("/cache/reports")
-async def get_cached_reports(admin: dict = AdminUser):
+async def get_cached_reports(
+    admin: dict = AdminUser,
+    cursor: int = Query(0, ge=0, description="이전 응답의 next_cursor (0이면 처음부터)"),
+    count: int = Query(100, ge=1, le=1000, description="페이지당 목표 개수"),
+    symbol: Optional[str] = Query(None, description="종목 코드 필터")
+):
     """
-    캐시된 레포트 목록 조회
+    캐시된 레포트 목록 조회 (report-service SCAN 커서 페이지네이션 전달)
 
     Returns:
-        List[Dict]: 캐시된 레포트 정보
+        Dict: cached_reports, next_cursor, has_more
     """
     try:
+        params = {"cursor": cursor, "count": count}
+        if symbol:
+            params["symbol"] = symbol
+
         async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{REPORT_SERVICE_URL}/api/cache/reports")
+            response = await client.get(f"{REPORT_SERVICE_URL}/api/cache/reports", params=params)
 
             if response.status_code != 200:
                 raise HTTPException(
@@ -471,6 +465,47 @@ async def get_cached_reports(admin: dict = AdminUser):
         raise HTTPException(status_code=500, detail=f"캐시 목록 조회 실패: {str(e)}")
 
 
+@router.delete("/cache/reports/{symbol}")
+async def delete_symbol_cached_reports(symbol: str, admin: dict = AdminUser):
+    """
+    종목의 모든 레포트 캐시 삭제
+
+    Args:
+        symbol: 종목 코드
+
+    Returns:
+        Dict: 삭제 결과 (deleted: 삭제 건수)
+    """
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.delete(f"{REPORT_SERVICE_URL}/api/cache/reports/{symbol}")
+
+            if response.status_code != 200:
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail=f"Failed to delete symbol cache: {response.text}"
+                )
+
+            result = response.json()
+
+        # 활동 로그 기록
+        activity_logger.log({
+            "admin_id": admin["id"],
+            "action": "cache_delete_symbol",
+            "target_type": "cache",
+            "target_id": symbol,
+            "details": result
+        })
+
+        return result
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ 종목 캐시 삭제 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"종목 캐시 삭제 실패: {str(e)}")
+
+
 @router.delete("/cache/reports/{symbol}/{report_date}")
 async def delete_cached_report(symbol: str, report_date: str, admin: dict = AdminUser):
     """
@@ -498,13 +533,13 @@ async def delete_cached_report(symbol: str, report_date: str, admin: dict = Admi
             result = response.json()
 
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "cache_delete",
             "target_type": "cache",
             "target_id": f"{symbol}:{report_date}",
             "details": result
-        }).execute()
+        })
 
         return result
 
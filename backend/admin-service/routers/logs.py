@@ -5,15 +5,32 @@
 - 로그 필터링 및 검색
 """
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
 from datetime import datetime, timedelta
+import asyncio
+import csv
+import io
+import json
 from middleware.auth import AdminUser
 from services.supabase_client import get_supabase
+from services.activity_logger import activity_logger
 
 router = APIRouter()
 supabase = get_supabase()
 
+# 로그 내보내기 페이지 크기 (키셋 페이지네이션)
+EXPORT_PAGE_SIZE = 1000
+
+EXPORT_CSV_COLUMNS = ["id", "admin_id", "action", "target_type", "target_id", "details", "created_at"]
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
 
 class AdminActivityLog(BaseModel):
     id: str
@@ -83,19 +100,20 @@ async def get_admin_activity_logs(
 
         result = query.execute()
 
-        # admin_email 정보 추가 (users 테이블 조인)
-        logs_with_admin = []
-        for log in result.data:
-            admin_info = supabase.table("users") \
-                .select("email") \
-                .eq("id", log["admin_id"]) \
-                .maybe_single() \
+        # admin_email 정보 추가 (users 일괄 조회 1회)
+        admin_ids = list({log["admin_id"] for log in result.data if log.get("admin_id")})
+        emails = {}
+        if admin_ids:
+            admins = supabase.table("users") \
+                .select("id, email") \
+                .in_("id", admin_ids) \
                 .execute()
+            emails = {row["id"]: row.get("email") for row in admins.data or []}
 
-            log["admin_email"] = admin_info.data.get("email") if admin_info.data else None
-            logs_with_admin.append(log)
+        for log in result.data:
+            log["admin_email"] = emails.get(log.get("admin_id"))
 
-        return logs_with_admin
+        return result.data
 
     except Exception as e:
         print(f"❌ 관리자 활동 로그 조회 실패: {str(e)}")
@@ -170,66 +188,18 @@ async def get_log_statistics(
     try:
         start_time = datetime.utcnow() - timedelta(hours=hours)
 
-        # 전체 로그 수
-        total_logs_result = supabase.table("admin_activity_logs") \
-            .select("id", count="exact") \
-            .gte("created_at", start_time.isoformat()) \
-            .execute()
-
-        total_logs = total_logs_result.count if total_logs_result.count is not None else 0
-
-        # 액션별 카운트
-        all_logs = supabase.table("admin_activity_logs") \
-            .select("action, admin_id") \
-            .gte("created_at", start_time.isoformat()) \
-            .execute()
-
-        actions_count = {}
-        admin_activity_count = {}
-
-        for log in all_logs.data:
-            action = log.get("action", "unknown")
-            admin_id = log.get("admin_id")
-
-            # 액션별 카운트
-            actions_count[action] = actions_count.get(action, 0) + 1
-
-            # 관리자별 활동 카운트
-            admin_activity_count[admin_id] = admin_activity_count.get(admin_id, 0) + 1
-
-        # 상위 관리자 (활동이 많은 순)
-        top_admin_ids = sorted(admin_activity_count.items(), key=lambda x: x[1], reverse=True)[:5]
-
-        top_admins = []
-        for admin_id, count in top_admin_ids:
-            admin_info = supabase.table("users") \
-                .select("email, name") \
-                .eq("id", admin_id) \
-                .maybe_single() \
-                .execute()
-
-            top_admins.append({
-                "admin_id": admin_id,
-                "email": admin_info.data.get("email") if admin_info.data else None,
-                "name": admin_info.data.get("name") if admin_info.data else None,
-                "activity_count": count
-            })
-
-        # 최근 활동 (액션 이름 목록)
-        recent_activities_result = supabase.table("admin_activity_logs") \
-            .select("action") \
-            .gte("created_at", start_time.isoformat()) \
-            .order("created_at", desc=True) \
-            .limit(10) \
-            .execute()
-
-        recent_activities = [log.get("action") for log in recent_activities_result.data]
+        # 🔥 전체 로그 수 / 액션별 카운트 / 상위 관리자(users 조인) / 최근 활동을 DB에서 집계 (RPC 1회)
+        stats = supabase.rpc("admin_log_statistics", {
+            "p_since": start_time.isoformat() + "+00:00",
+            "p_top_admins": 5,
+            "p_recent": 10
+        }).execute().data or {}
 
         return LogStatistics(
-            total_logs=total_logs,
-            actions_count=actions_count,
-            top_admins=top_admins,
-            recent_activities=recent_activities
+            total_logs=stats.get("total_logs", 0),
+            actions_count=stats.get("actions_count", {}),
+            top_admins=stats.get("top_admins", []),
+            recent_activities=[action for action in stats.get("recent_activities", []) if action]
         )
 
     except Exception as e:
@@ -312,13 +282,13 @@ async def delete_admin_activity_log(log_id: str, admin: dict = AdminUser):
         supabase.table("admin_activity_logs").delete().eq("id", log_id).execute()
 
         # 삭제 자체도 로그에 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "admin_log_delete",
             "target_type": "log",
             "target_id": log_id,
             "details": {"deleted_action": action}
-        }).execute()
+        })
 
         return {
             "message": "관리자 활동 로그가 삭제되었습니다.",
@@ -364,7 +334,7 @@ async def delete_old_logs(
             .execute()
 
         # 삭제 작업 자체도 로그에 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "admin_logs_bulk_delete",
             "target_type": "log",
@@ -372,7 +342,7 @@ async def delete_old_logs(
                 "cutoff_date": cutoff_date.isoformat(),
                 "deleted_count": before_count
             }
-        }).execute()
+        })
 
         return {
             "message": f"{days}일 이전의 로그가 삭제되었습니다.",
@@ -386,76 +356,123 @@ async def delete_old_logs(
         raise HTTPException(status_code=500, detail=f"로그 일괄 삭제 실패: {str(e)}")
 
 
-@router.get("/export")
-async def export_logs(
-    admin: dict = AdminUser,
-    hours: int = Query(24, ge=1, le=720),
-    format: str = Query("json", regex="^(json|csv)$")
-):
+def _fetch_export_page(start_time: datetime, cursor: Optional[Dict[str, str]]) -> List[Dict[str, Any]]:
     """
-    로그 내보내기 (JSON 또는 CSV)
+    로그 한 페이지 조회 (created_at, id 내림차순 키셋 페이지네이션)
 
     Args:
-        hours: 조회 기간 (시간)
-        format: 파일 형식 (json 또는 csv)
-
-    Returns:
-        dict: 내보내기 결과
+        start_time: 조회 시작 시각
+        cursor: 직전 페이지 마지막 행의 created_at / id (첫 페이지는 None)
     """
+    query = supabase.table("admin_activity_logs") \
+        .select("*") \
+        .gte("created_at", start_time.isoformat())
+
+    if cursor:
+        query = query.or_(
+            f'created_at.lt."{cursor["created_at"]}",'
+            f'and(created_at.eq."{cursor["created_at"]}",id.lt.{cursor["id"]})'
+        )
+
+    return query.order("created_at", desc=True) \
+        .order("id", desc=True) \
+        .limit(EXPORT_PAGE_SIZE) \
+        .execute().data or []
+
+
+def _format_rows(rows: List[Dict[str, Any]], format: str, first: bool) -> str:
+    """페이지 단위 직렬화 (CSV는 csv 모듈로 이스케이프)"""
+    if format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if first:
+            writer.writerow(EXPORT_CSV_COLUMNS)
+        for row in rows:
+            writer.writerow([
+                json.dumps(row[column], ensure_ascii=False) if column == "details" and row.get(column) is not None
+                else row.get(column) if row.get(column) is not None else ""
+                for column in EXPORT_CSV_COLUMNS
+            ])
+        return buffer.getvalue()
+
+    lines = [json.dumps(row, ensure_ascii=False, default=str) for row in rows]
+    if format == "ndjson":
+        return "".join(line + "\n" for line in lines)
+
+    # json: 배열을 페이지마다 이어 붙임
+    return ("" if first else ",\n") + ",\n".join(lines)
+
+
+async def _stream_logs(admin: dict, hours: int, format: str) -> AsyncIterator[str]:
+    """로그를 페이지 단위로 조회하며 바로 전송 (메모리 사용량 = 1페이지)"""
+    start_time = datetime.utcnow() - timedelta(hours=hours)
+    cursor = None
+    exported_count = 0
+
+    if format == "csv":
+        # Excel 한글 깨짐 방지 (UTF-8 BOM)
+        yield "\ufeff"
+    elif format == "json":
+        yield "[\n"
+
     try:
-        start_time = datetime.utcnow() - timedelta(hours=hours)
+        while True:
+            rows = await asyncio.to_thread(_fetch_export_page, start_time, cursor)
 
-        # 로그 조회
-        result = supabase.table("admin_activity_logs") \
-            .select("*") \
-            .gte("created_at", start_time.isoformat()) \
-            .order("created_at", desc=True) \
-            .limit(10000) \
-            .execute()
+            if rows or (format == "csv" and exported_count == 0):
+                yield _format_rows(rows, format, first=exported_count == 0)
 
-        logs = result.data
+            exported_count += len(rows)
+            if len(rows) < EXPORT_PAGE_SIZE:
+                break
 
+            cursor = {"created_at": rows[-1]["created_at"], "id": rows[-1]["id"]}
+
+        if format == "json":
+            yield "\n]\n"
+
+    except Exception as e:
+        # 스트리밍 시작 후에는 상태 코드를 바꿀 수 없으므로 로그만 남기고 중단
+        print(f"❌ 로그 내보내기 중단 ({exported_count}건 전송 후): {str(e)}")
+        raise
+
+    finally:
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "admin_logs_export",
             "target_type": "log",
             "details": {
                 "format": format,
                 "hours": hours,
-                "exported_count": len(logs)
+                "exported_count": exported_count
             }
-        }).execute()
+        })
 
-        if format == "json":
-            return {
-                "format": "json",
-                "data": logs,
-                "exported_count": len(logs),
-                "exported_at": datetime.utcnow().isoformat()
-            }
 
-        elif format == "csv":
-            # CSV 형식으로 변환 (간단한 구현)
-            csv_lines = ["id,admin_id,action,target_type,target_id,created_at"]
-
-            for log in logs:
-                csv_lines.append(
-                    f"{log.get('id')},"
-                    f"{log.get('admin_id')},"
-                    f"{log.get('action')},"
-                    f"{log.get('target_type') or ''},"
-                    f"{log.get('target_id') or ''},"
-                    f"{log.get('created_at')}"
-                )
-
-            return {
-                "format": "csv",
-                "data": "\n".join(csv_lines),
-                "exported_count": len(logs),
-                "exported_at": datetime.utcnow().isoformat()
-            }
+@router.get("/export")
+async def export_logs(
+    admin: dict = AdminUser,
+    hours: int = Query(24, ge=1, le=720),
+    format: str = Query("json", regex="^(json|ndjson|csv)$")
+):
+    """
+    로그 내보내기 (CSV / NDJSON / JSON 파일 스트리밍)
 
-    except Exception as e:
-        print(f"❌ 로그 내보내기 실패: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"로그 내보내기 실패: {str(e)}")
+    🔥 created_at/id 키셋 페이지네이션으로 1000건씩 조회하며 바로 전송
+       → 기간과 무관하게 메모리 사용량 일정, 건수 상한 없음
+
+    Args:
+        hours: 조회 기간 (시간, 최대 30일)
+        format: 파일 형식 (json, ndjson, csv)
+
+    Returns:
+        StreamingResponse: 첨부 파일 (최신순)
+    """
+    filename = f"admin-logs-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.{format}"
+
+    return StreamingResponse(
+        _stream_logs(admin, hours, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
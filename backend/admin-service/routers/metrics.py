@@ -10,10 +10,16 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 from middleware.auth import AdminUser
 from services.supabase_client import get_supabase
+from services.activity_logger import activity_logger
+from services.timeseries import RESOLUTIONS, choose_bucket_seconds, source_for_bucket, lttb
 
 router = APIRouter()
 supabase = get_supabase()
 
+# 원본 해상도 조회 시 최대 행 수 (LTTB 입력 상한)
+RAW_MAX_ROWS = 20000
+RAW_PAGE_SIZE = 1000
+
 
 class SystemMetricResponse(BaseModel):
     service_name: str
@@ -32,7 +38,11 @@ class BusinessMetricResponse(BaseModel):
 
 class TimeSeriesDataPoint(BaseModel):
     timestamp: datetime
-    value: float
+    value: float  # 버킷 평균 (원본 해상도면 원본 값)
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    p95_value: Optional[float] = None
+    count: Optional[int] = None
 
 
 class MetricSummary(BaseModel):
@@ -42,6 +52,8 @@ class MetricSummary(BaseModel):
     min_value: float
     max_value: float
     trend: str  # increasing, decreasing, stable
+    resolution: str  # raw, 1m, 1h (조회 티어) 또는 1d (비즈니스 메트릭)
+    bucket_seconds: int  # 0이면 원본 포인트 (LTTB 다운샘플링)
     time_series: List[TimeSeriesDataPoint]
 
 
@@ -131,6 +143,9 @@ async def get_metrics_summary(
     """
     메트릭 요약 대시보드 (주요 지표 집계)
 
+    🔥 system_metrics 원본 대신 분 단위 롤업(system_metrics_rollup_1m)을 DB에서 집계
+       → 메트릭 행 수와 무관하게 일정한 응답 시간
+
     Args:
         hours: 조회 기간 (시간)
 
@@ -140,60 +155,14 @@ async def get_metrics_summary(
     try:
         start_time = datetime.utcnow() - timedelta(hours=hours)
 
-        # 1. 시스템 메트릭 집계
-        system_metrics = supabase.table("system_metrics") \
-            .select("service_name, metric_type, value") \
-            .gte("timestamp", start_time.isoformat()) \
-            .execute()
-
-        # 서비스별 평균 지연시간 계산
-        latency_by_service = {}
-        error_rate_by_service = {}
-
-        for metric in system_metrics.data:
-            service = metric["service_name"]
-            metric_type = metric["metric_type"]
-            value = metric["value"]
-
-            if metric_type == "latency":
-                if service not in latency_by_service:
-                    latency_by_service[service] = []
-                latency_by_service[service].append(value)
-
-            elif metric_type == "error_rate":
-                if service not in error_rate_by_service:
-                    error_rate_by_service[service] = []
-                error_rate_by_service[service].append(value)
-
-        # 평균 계산
-        avg_latency = {
-            service: sum(values) / len(values) if values else 0
-            for service, values in latency_by_service.items()
-        }
-
-        avg_error_rate = {
-            service: sum(values) / len(values) if values else 0
-            for service, values in error_rate_by_service.items()
-        }
-
-        # 2. 비즈니스 메트릭 집계 (오늘 기준)
-        today = datetime.utcnow().date()
-
-        business_today = supabase.table("business_metrics") \
-            .select("*") \
-            .eq("date", today.isoformat()) \
-            .execute()
-
-        business_summary = {
-            metric["metric_name"]: metric["value"]
-            for metric in business_today.data
-        }
-
+        # 🔥 DB 측 집계 (분 단위 롤업 테이블 + 사용자 통계, RPC 1회)
+        # 1. 서비스별 평균 지연시간 / 에러율
+        # 2. 비즈니스 메트릭 (오늘 기준)
         # 3. 사용자 통계
-        users_count = supabase.table("users").select("id", count="exact").execute().count
-        portfolios_count = supabase.table("portfolios").select("id", count="exact").execute().count
-        watchlist_count = supabase.table("watchlist").select("id", count="exact").execute().count
-        reports_count = supabase.table("stock_reports").select("id", count="exact").execute().count
+        summary = supabase.rpc(
+            "admin_metrics_summary",
+            {"p_since": start_time.isoformat() + "+00:00"}
+        ).execute().data or {}
 
         return {
             "time_range": {
@@ -202,16 +171,16 @@ async def get_metrics_summary(
                 "hours": hours
             },
             "system_metrics": {
-                "avg_latency_by_service": avg_latency,
-                "avg_error_rate_by_service": avg_error_rate
-            },
-            "business_metrics": business_summary,
-            "user_statistics": {
-                "total_users": users_count,
-                "total_portfolios": portfolios_count,
-                "total_watchlist": watchlist_count,
-                "total_reports": reports_count
+                "avg_latency_by_service": summary.get("avg_latency_by_service", {}),
+                "avg_error_rate_by_service": summary.get("avg_error_rate_by_service", {})
             },
+            "business_metrics": summary.get("business_metrics", {}),
+            "user_statistics": summary.get("user_statistics", {
+                "total_users": 0,
+                "total_portfolios": 0,
+                "total_watchlist": 0,
+                "total_reports": 0
+            }),
             "generated_at": datetime.utcnow().isoformat()
         }
 
@@ -220,70 +189,149 @@ async def get_metrics_summary(
         raise HTTPException(status_code=500, detail=f"메트릭 요약 조회 실패: {str(e)}")
 
 
+def _calculate_trend(current_value: float, avg_value: float) -> str:
+    """트렌드 계산 (최근 값과 평균 비교)"""
+    if current_value > avg_value * 1.1:
+        return "increasing"
+    elif current_value < avg_value * 0.9:
+        return "decreasing"
+    return "stable"
+
+
+def _fetch_raw_points(metric_name: str, start_time: datetime, service_name: Optional[str]) -> List[Dict]:
+    """원본 포인트 조회 (페이지 단위, RAW_MAX_ROWS 상한)
+
+    🔥 최신 포인트부터 내림차순으로 페이징한 뒤 뒤집어서 반환 - 상한에 걸려도 최근 구간이 잘리지 않도록
+    """
+    rows = []
+    while len(rows) < RAW_MAX_ROWS:
+        query = supabase.table("system_metrics") \
+            .select("value, timestamp") \
+            .eq("metric_type", metric_name) \
+            .gte("timestamp", start_time.isoformat())
+
+        if service_name:
+            query = query.eq("service_name", service_name)
+
+        page = query.order("timestamp", desc=True) \
+            .range(len(rows), len(rows) + RAW_PAGE_SIZE - 1) \
+            .execute().data or []
+
+        rows.extend(page)
+        if len(page) < RAW_PAGE_SIZE:
+            break
+
+    if len(rows) >= RAW_MAX_ROWS:
+        print(f"⚠️ 원본 포인트 {RAW_MAX_ROWS}개 초과 - 최근 {RAW_MAX_ROWS}개만 사용 ({metric_name})")
+
+    rows.reverse()
+    return [
+        {"timestamp": datetime.fromisoformat(row["timestamp"].replace("Z", "+00:00")), "value": row["value"]}
+        for row in rows
+        if row.get("value") is not None
+    ]
+
+
 @router.get("/timeseries/{metric_name}", response_model=MetricSummary)
 async def get_metric_timeseries(
     metric_name: str,
     admin: dict = AdminUser,
-    hours: int = Query(24, ge=1, le=168)
+    hours: int = Query(24, ge=1, le=168),
+    resolution: Optional[str] = Query(
+        None,
+        regex=f"^({'|'.join(RESOLUTIONS)})$",
+        description="버킷 크기 (미지정 시 max_points에 맞춰 자동 선택)"
+    ),
+    max_points: int = Query(500, ge=10, le=2000, description="최대 포인트 수"),
+    service_name: Optional[str] = None
 ):
     """
     특정 메트릭의 시계열 데이터 조회 (트렌드 분석)
 
+    🔥 DB에서 버킷 집계 (avg/min/max/p95) 후 최대 max_points개만 반환
+       - 버킷 < 1분: 원본 테이블, 버킷 < 1시간: 1분 롤업, 그 외: 1시간 롤업
+       - resolution=raw: 원본 포인트를 LTTB로 max_points개까지 다운샘플링
+
     Args:
         metric_name: 메트릭 이름
         hours: 조회 기간 (시간)
+        resolution: 해상도 (raw, 10s, 1m, 5m, 15m, 1h, 6h, 1d)
+        max_points: 최대 포인트 수 (요청 해상도가 더 세밀하면 버킷 크기 상향)
+        service_name: 서비스 이름 필터 (선택)
 
     Returns:
         MetricSummary: 메트릭 요약 및 시계열 데이터
     """
     try:
         start_time = datetime.utcnow() - timedelta(hours=hours)
+        bucket_seconds = choose_bucket_seconds(hours, max_points, resolution)
 
         # system_metrics 또는 business_metrics에서 조회
         # 먼저 system_metrics 시도
-        system_result = supabase.table("system_metrics") \
-            .select("value, timestamp") \
-            .eq("metric_type", metric_name) \
-            .gte("timestamp", start_time.isoformat()) \
-            .order("timestamp", asc=True) \
-            .execute()
-
-        if system_result.data and len(system_result.data) > 0:
-            values = [record["value"] for record in system_result.data]
-            time_series = [
-                TimeSeriesDataPoint(timestamp=record["timestamp"], value=record["value"])
-                for record in system_result.data
-            ]
-
-            current_value = values[-1] if values else 0
-            avg_value = sum(values) / len(values) if values else 0
-            min_value = min(values) if values else 0
-            max_value = max(values) if values else 0
-
-            # 트렌드 계산 (최근 값과 평균 비교)
-            if current_value > avg_value * 1.1:
-                trend = "increasing"
-            elif current_value < avg_value * 0.9:
-                trend = "decreasing"
-            else:
-                trend = "stable"
-
-            return MetricSummary(
-                metric_name=metric_name,
-                current_value=current_value,
-                avg_value=avg_value,
-                min_value=min_value,
-                max_value=max_value,
-                trend=trend,
-                time_series=time_series
-            )
+        if bucket_seconds == 0:
+            raw_points = _fetch_raw_points(metric_name, start_time, service_name)
+
+            if raw_points:
+                values = [point["value"] for point in raw_points]
+                current_value = values[-1]
+                avg_value = sum(values) / len(values)
+
+                return MetricSummary(
+                    metric_name=metric_name,
+                    current_value=current_value,
+                    avg_value=avg_value,
+                    min_value=min(values),
+                    max_value=max(values),
+                    trend=_calculate_trend(current_value, avg_value),
+                    resolution="raw",
+                    bucket_seconds=0,
+                    time_series=[
+                        TimeSeriesDataPoint(**point)
+                        for point in lttb(raw_points, max_points)
+                    ]
+                )
+        else:
+            buckets = supabase.rpc("admin_metric_timeseries", {
+                "p_metric_type": metric_name,
+                "p_since": start_time.isoformat() + "+00:00",
+                "p_bucket_seconds": bucket_seconds,
+                "p_service_name": service_name
+            }).execute().data or []
+            buckets = [bucket for bucket in buckets if bucket.get("avg_value") is not None]
+
+            if buckets:
+                total_count = sum(bucket["sample_count"] for bucket in buckets)
+                current_value = buckets[-1]["avg_value"]
+                avg_value = sum(bucket["avg_value"] * bucket["sample_count"] for bucket in buckets) / total_count
+
+                return MetricSummary(
+                    metric_name=metric_name,
+                    current_value=current_value,
+                    avg_value=avg_value,
+                    min_value=min(bucket["min_value"] for bucket in buckets),
+                    max_value=max(bucket["max_value"] for bucket in buckets),
+                    trend=_calculate_trend(current_value, avg_value),
+                    resolution=source_for_bucket(bucket_seconds),
+                    bucket_seconds=bucket_seconds,
+                    time_series=[
+                        TimeSeriesDataPoint(
+                            timestamp=bucket["bucket"],
+                            value=bucket["avg_value"],
+                            min_value=bucket["min_value"],
+                            max_value=bucket["max_value"],
+                            p95_value=bucket["p95_value"],
+                            count=bucket["sample_count"]
+                        )
+                        for bucket in buckets
+                    ]
+                )
 
-        # business_metrics에서 조회 (일별 데이터)
+        # business_metrics에서 조회 (일별 데이터, 최대 8개)
         business_result = supabase.table("business_metrics") \
             .select("value, date") \
             .eq("metric_name", metric_name) \
             .gte("date", start_time.date().isoformat()) \
-            .order("date", asc=True) \
+            .order("date", desc=False) \
             .execute()
 
         if business_result.data and len(business_result.data) > 0:
@@ -296,25 +344,18 @@ async def get_metric_timeseries(
                 for record in business_result.data
             ]
 
-            current_value = values[-1] if values else 0
-            avg_value = sum(values) / len(values) if values else 0
-            min_value = min(values) if values else 0
-            max_value = max(values) if values else 0
-
-            if current_value > avg_value * 1.1:
-                trend = "increasing"
-            elif current_value < avg_value * 0.9:
-                trend = "decreasing"
-            else:
-                trend = "stable"
+            current_value = values[-1]
+            avg_value = sum(values) / len(values)
 
             return MetricSummary(
                 metric_name=metric_name,
                 current_value=current_value,
                 avg_value=avg_value,
-                min_value=min_value,
-                max_value=max_value,
-                trend=trend,
+                min_value=min(values),
+                max_value=max(values),
+                trend=_calculate_trend(current_value, avg_value),
+                resolution="1d",
+                bucket_seconds=86400,
                 time_series=time_series
             )
 
@@ -361,7 +402,7 @@ async def create_system_metric(
         }).execute()
 
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "system_metric_create",
             "target_type": "metric",
@@ -370,7 +411,7 @@ async def create_system_metric(
                 "metric_type": metric_type,
                 "value": value
             }
-        }).execute()
+        })
 
         return {
             "message": "시스템 메트릭이 생성되었습니다.",
@@ -414,7 +455,7 @@ async def create_business_metric(
         }, on_conflict="metric_name,date").execute()
 
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "business_metric_create",
             "target_type": "metric",
@@ -423,7 +464,7 @@ async def create_business_metric(
                 "value": value,
                 "date": target_date
             }
-        }).execute()
+        })
 
         return {
             "message": "비즈니스 메트릭이 생성되었습니다.",
@@ -1,16 +1,18 @@
 """
 서비스 모니터링 API
 - Railway 서비스 목록 조회
-- 서비스 헬스체크
+- 서비스 헬스체크 (백그라운드 폴러 캐시 조회)
 - 서비스 상세 정보 (로그, 메트릭)
 - 서비스 재시작 (Railway API)
 """
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Query
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime
 from middleware.auth import AdminUser
 from services.supabase_client import get_supabase
+from services.activity_logger import activity_logger
+from services.health_poller import HealthPoller
 import httpx
 import os
 
@@ -46,6 +48,9 @@ RAILWAY_SERVICES = {
     }
 }
 
+# 🔥 백그라운드 헬스 폴러 (main.py startup에서 시작)
+health_poller = HealthPoller(RAILWAY_SERVICES, supabase)
+
 
 class ServiceStatus(BaseModel):
     name: str
@@ -68,79 +73,35 @@ class ServiceDetail(BaseModel):
     uptime_percentage: Optional[float]
 
 
-async def check_service_health(name: str, config: Dict[str, str]) -> ServiceStatus:
-    """
-    서비스 헬스체크 수행
-
-    Args:
-        name: 서비스 이름
-        config: 서비스 설정 (url, health_endpoint 등)
-
-    Returns:
-        ServiceStatus: 서비스 상태 정보
-    """
-    url = f"{config['url']}{config['health_endpoint']}"
-    start_time = datetime.utcnow()
-
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(url)
-            response_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-
-            if response.status_code == 200:
-                return ServiceStatus(
-                    name=name,
-                    url=config['url'],
-                    description=config['description'],
-                    status="online",
-                    response_time_ms=response_time,
-                    last_checked=datetime.utcnow()
-                )
-            else:
-                return ServiceStatus(
-                    name=name,
-                    url=config['url'],
-                    description=config['description'],
-                    status="degraded",
-                    response_time_ms=response_time,
-                    last_checked=datetime.utcnow(),
-                    error_message=f"HTTP {response.status_code}"
-                )
-    except Exception as e:
-        return ServiceStatus(
-            name=name,
-            url=config['url'],
-            description=config['description'],
-            status="offline",
-            response_time_ms=None,
-            last_checked=datetime.utcnow(),
-            error_message=str(e)
-        )
+def _to_service_status(status: Dict[str, Any]) -> ServiceStatus:
+    return ServiceStatus(**{key: value for key, value in status.items() if key != "health_data"})
 
 
 @router.get("", response_model=List[ServiceStatus])
-async def get_services(admin: dict = AdminUser):
+async def get_services(
+    admin: dict = AdminUser,
+    refresh: bool = Query(False, description="캐시 무시하고 즉시 헬스체크")
+):
     """
-    전체 서비스 목록 및 헬스 상태 조회
+    전체 서비스 목록 및 헬스 상태 조회 (폴러 캐시)
+
+    Args:
+        refresh: True면 즉시 전체 서비스 재조회
 
     Returns:
         List[ServiceStatus]: 서비스 상태 목록
     """
     try:
-        service_statuses = []
-
-        # 각 서비스의 헬스체크 수행
-        for name, config in RAILWAY_SERVICES.items():
-            status = await check_service_health(name, config)
-            service_statuses.append(status)
+        await health_poller.ensure_polled(force=refresh)
+        service_statuses = [_to_service_status(status) for status in health_poller.get_statuses()]
 
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "services_list_view",
             "target_type": "system",
             "details": {"services_count": len(service_statuses)}
-        }).execute()
+        })
 
         return service_statuses
 
@@ -150,19 +111,22 @@ async def get_services(admin: dict = AdminUser):
 
 
 @router.get("/health")
-async def get_aggregate_health(admin: dict = AdminUser):
+async def get_aggregate_health(
+    admin: dict = AdminUser,
+    refresh: bool = Query(False, description="캐시 무시하고 즉시 헬스체크")
+):
     """
-    전체 시스템 헬스 집계
+    전체 시스템 헬스 집계 (폴러 캐시)
+
+    Args:
+        refresh: True면 즉시 전체 서비스 재조회
 
     Returns:
         dict: 전체 서비스 상태 요약
     """
     try:
-        service_statuses = []
-
-        for name, config in RAILWAY_SERVICES.items():
-            status = await check_service_health(name, config)
-            service_statuses.append(status)
+        await health_poller.ensure_polled(force=refresh)
+        service_statuses = [_to_service_status(status) for status in health_poller.get_statuses()]
 
         # 상태별 카운트
         online_count = sum(1 for s in service_statuses if s.status == "online")
@@ -189,7 +153,9 @@ async def get_aggregate_health(admin: dict = AdminUser):
             "offline": offline_count,
             "avg_response_time_ms": avg_response_time,
             "services": [s.dict() for s in service_statuses],
-            "checked_at": datetime.utcnow().isoformat()
+            "checked_at": min(
+                (s.last_checked for s in service_statuses), default=datetime.utcnow()
+            ).isoformat()
         }
 
     except Exception as e:
@@ -221,13 +187,13 @@ async def pause_news_crawler(admin: dict = AdminUser):
             result = response.json()
 
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "news_crawler_pause",
             "target_type": "service",
             "target_id": "news-crawler",
             "details": result
-        }).execute()
+        })
 
         return result
 
@@ -261,13 +227,13 @@ async def resume_news_crawler(admin: dict = AdminUser):
             result = response.json()
 
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "news_crawler_resume",
             "target_type": "service",
             "target_id": "news-crawler",
             "details": result
-        }).execute()
+        })
 
         return result
 
@@ -301,7 +267,7 @@ async def get_news_crawler_scheduler_status(admin: dict = AdminUser):
             result = response.json()
 
         # 활동 로그 기록 (조회이므로 필요시에만)
-        # supabase.table("admin_activity_logs").insert({...}).execute()
+        # activity_logger.log({...})
 
         return result
 
@@ -327,20 +293,9 @@ async def get_service_detail(service_name: str, admin: dict = AdminUser):
         if service_name not in RAILWAY_SERVICES:
             raise HTTPException(status_code=404, detail=f"서비스를 찾을 수 없습니다: {service_name}")
 
-        config = RAILWAY_SERVICES[service_name]
-
-        # 헬스체크 수행
-        status = await check_service_health(service_name, config)
-
-        # 헬스 엔드포인트에서 상세 정보 가져오기
-        health_data = None
-        try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{config['url']}{config['health_endpoint']}")
-                if response.status_code == 200:
-                    health_data = response.json()
-        except Exception:
-            pass
+        # 폴러 캐시의 헬스체크 결과 (상세 정보 포함)
+        await health_poller.ensure_polled()
+        status = health_poller.get_status(service_name)
 
         # system_metrics 테이블에서 최근 에러 조회
         recent_errors_result = supabase.table("system_metrics") \
@@ -353,24 +308,24 @@ async def get_service_detail(service_name: str, admin: dict = AdminUser):
 
         recent_errors = recent_errors_result.data if recent_errors_result.data else []
 
-        # 지난 24시간 동안의 Uptime 계산
-        uptime_percentage = await calculate_uptime(service_name)
+        # 지난 24시간 동안의 Uptime (폴러 롤링 카운터)
+        uptime_percentage = health_poller.get_uptime(service_name)
 
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "service_detail_view",
             "target_type": "service",
             "target_id": service_name
-        }).execute()
+        })
 
         return ServiceDetail(
-            name=status.name,
-            url=status.url,
-            description=status.description,
-            status=status.status,
-            response_time_ms=status.response_time_ms,
-            health_data=health_data,
+            name=status["name"],
+            url=status["url"],
+            description=status["description"],
+            status=status["status"],
+            response_time_ms=status["response_time_ms"],
+            health_data=status["health_data"],
             recent_errors=recent_errors,
             uptime_percentage=uptime_percentage
         )
@@ -382,42 +337,6 @@ async def get_service_detail(service_name: str, admin: dict = AdminUser):
         raise HTTPException(status_code=500, detail=f"서비스 상세 조회 실패: {str(e)}")
 
 
-async def calculate_uptime(service_name: str) -> Optional[float]:
-    """
-    지난 24시간 동안의 서비스 Uptime 계산
-
-    Args:
-        service_name: 서비스 이름
-
-    Returns:
-        float: Uptime 퍼센트 (0~100)
-    """
-    try:
-        twenty_four_hours_ago = datetime.utcnow() - timedelta(hours=24)
-
-        # system_metrics 테이블에서 헬스체크 기록 조회
-        result = supabase.table("system_metrics") \
-            .select("value") \
-            .eq("service_name", service_name) \
-            .eq("metric_type", "health_check") \
-            .gte("timestamp", twenty_four_hours_ago.isoformat()) \
-            .execute()
-
-        if not result.data or len(result.data) == 0:
-            return None
-
-        # value가 1이면 online, 0이면 offline
-        total_checks = len(result.data)
-        successful_checks = sum(1 for record in result.data if record.get("value", 0) == 1)
-
-        uptime_percentage = (successful_checks / total_checks) * 100
-        return round(uptime_percentage, 2)
-
-    except Exception as e:
-        print(f"⚠️  Uptime 계산 실패: {str(e)}")
-        return None
-
-
 @router.post("/{service_name}/restart")
 async def restart_service(service_name: str, admin: dict = AdminUser):
     """
@@ -446,13 +365,13 @@ async def restart_service(service_name: str, admin: dict = AdminUser):
         # 현재는 플레이스홀더로 구현
 
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "service_restart",
             "target_type": "service",
             "target_id": service_name,
             "details": {"message": "수동 재시작 요청"}
-        }).execute()
+        })
 
         return {
             "message": f"서비스 재시작 요청이 전송되었습니다: {service_name}",
@@ -7,11 +7,13 @@
 - 사용자 활동 로그 조회
 """
 from fastapi import APIRouter, HTTPException, Request
+import asyncio
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
-from middleware.auth import AdminUser
+from middleware.auth import AdminUser, invalidate_admin_role
 from services.supabase_client import get_supabase
+from services.activity_logger import activity_logger
 
 router = APIRouter()
 supabase = get_supabase()
@@ -129,14 +131,17 @@ async def update_user(
         if not result.data:
             raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
 
+        # 인증 캐시 무효화 (role / name 변경 즉시 반영)
+        invalidate_admin_role(user_id)
+
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "user_update",
             "target_type": "user",
             "target_id": user_id,
             "details": {"updated_fields": list(update_data.keys())}
-        }).execute()
+        })
 
         return result.data[0]
 
@@ -170,13 +175,13 @@ async def suspend_user(user_id: str, admin: dict = AdminUser):
         supabase.table("users").update({"settings": settings}).eq("id", user_id).execute()
 
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "user_suspend",
             "target_type": "user",
             "target_id": user_id,
             "details": {"suspended_at": settings["suspended_at"]}
-        }).execute()
+        })
 
         return {"message": "사용자가 정지되었습니다.", "user_id": user_id}
 
@@ -211,12 +216,12 @@ async def activate_user(user_id: str, admin: dict = AdminUser):
         supabase.table("users").update({"settings": settings}).eq("id", user_id).execute()
 
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "user_activate",
             "target_type": "user",
             "target_id": user_id
-        }).execute()
+        })
 
         return {"message": "사용자가 활성화되었습니다.", "user_id": user_id}
 
@@ -246,15 +251,16 @@ async def delete_user(user_id: str, admin: dict = AdminUser):
 
         # 사용자 삭제 (CASCADE로 portfolios, watchlist, alerts 등 자동 삭제)
         supabase.table("users").delete().eq("id", user_id).execute()
+        invalidate_admin_role(user_id)
 
         # 활동 로그 기록
-        supabase.table("admin_activity_logs").insert({
+        activity_logger.log({
             "admin_id": admin["id"],
             "action": "user_delete",
             "target_type": "user",
             "target_id": user_id,
             "details": {"email": user_email}
-        }).execute()
+        })
 
         return {"message": "사용자가 삭제되었습니다.", "user_id": user_id, "email": user_email}
 
@@ -281,26 +287,42 @@ async def get_user_activity(
         limit: 조회할 레코드 수 (최대 100)
     """
     try:
-        # 사용자 존재 확인
-        user_result = supabase.table("users").select("email, name").eq("id", user_id).maybe_single().execute()
-
-        if not user_result.data:
+        def count_rows(table: str) -> int:
+            return supabase.table(table) \
+                .select("id", count="exact", head=True) \
+                .eq("user_id", user_id) \
+                .execute().count or 0
+
+        # 🔥 서로 독립적인 조회를 동시 실행 (사용자 확인 / 관리자 작업 로그 / 통계 3종)
+        (
+            user_result,
+            admin_logs,
+            portfolios_count,
+            watchlist_count,
+            reports_count
+        ) = await asyncio.gather(
+            # 사용자 존재 확인
+            asyncio.to_thread(
+                lambda: supabase.table("users").select("email, name").eq("id", user_id).maybe_single().execute()
+            ),
+            # 관리자가 이 사용자에게 수행한 작업
+            asyncio.to_thread(
+                lambda: supabase.table("admin_activity_logs")
+                .select("*")
+                .eq("target_id", user_id)
+                .order("created_at", desc=True)
+                .range(skip, skip + min(limit, 100) - 1)
+                .execute()
+            ),
+            # 사용자가 생성한 포트폴리오, 관심종목, 레포트 통계
+            asyncio.to_thread(count_rows, "portfolios"),
+            asyncio.to_thread(count_rows, "watchlist"),
+            asyncio.to_thread(count_rows, "stock_reports")
+        )
+
+        if not user_result or not user_result.data:
             raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
 
-        # 활동 로그 조회 (관리자 작업 + 사용자 자체 활동)
-        # 1. 관리자가 이 사용자에게 수행한 작업
-        admin_logs = supabase.table("admin_activity_logs") \
-            .select("*") \
-            .eq("target_id", user_id) \
-            .order("created_at", desc=True) \
-            .range(skip, skip + min(limit, 100) - 1) \
-            .execute()
-
-        # 2. 사용자가 생성한 레포트, 포트폴리오, 관심종목 통계
-        portfolios_count = supabase.table("portfolios").select("id", count="exact").eq("user_id", user_id).execute().count
-        watchlist_count = supabase.table("watchlist").select("id", count="exact").eq("user_id", user_id).execute().count
-        reports_count = supabase.table("stock_reports").select("id", count="exact").eq("user_id", user_id).execute().count
-
         return {
             "user": user_result.data,
             "admin_logs": admin_logs.data,
@@ -0,0 +1,194 @@
+"""
+관리자 활동 로그 Write-Behind 버퍼
+- 요청 처리 중에는 메모리 버퍼에 추가만 (DB 왕복 없음)
+- 배치 크기 도달 또는 주기마다 admin_activity_logs에 일괄 INSERT
+- 버퍼 상한 초과 시 새 로그 폐기 + 폐기 건수 집계, 종료 시 남은 로그 flush
+- 일시 장애는 재시도 (로그별 ACTIVITY_LOG_MAX_RETRIES회 초과 시 폐기)
+- 행 데이터 오류(4xx)는 배치를 반으로 나눠 문제 행만 폐기
+"""
+import os
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from postgrest.exceptions import APIError
+from supabase import Client
+from services.supabase_client import get_supabase
+
+ACTIVITY_LOG_BATCH_SIZE = int(os.getenv("ACTIVITY_LOG_BATCH_SIZE", "100"))
+ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS = float(os.getenv("ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS", "2"))
+ACTIVITY_LOG_MAX_BUFFER = int(os.getenv("ACTIVITY_LOG_MAX_BUFFER", "10000"))
+ACTIVITY_LOG_MAX_RETRIES = int(os.getenv("ACTIVITY_LOG_MAX_RETRIES", "5"))
+
+# 🔥 행 단위로 재현되는 오류 (22: 데이터 형식, 23: 제약 조건 위반) - 재시도해도 성공하지 않음
+ROW_ERROR_SQLSTATE_CLASSES = ("22", "23")
+
+
+def _is_row_error(error: Exception) -> bool:
+    """특정 행 때문에 배치 전체가 거부된 오류인지 확인"""
+    return isinstance(error, APIError) and (error.code or "")[:2] in ROW_ERROR_SQLSTATE_CLASSES
+
+
+class ActivityLogger:
+    """admin_activity_logs 비동기 일괄 기록기"""
+
+    def __init__(
+        self,
+        supabase: Client,
+        batch_size: int = ACTIVITY_LOG_BATCH_SIZE,
+        flush_interval: float = ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS,
+        max_buffer: int = ACTIVITY_LOG_MAX_BUFFER,
+        max_retries: int = ACTIVITY_LOG_MAX_RETRIES
+    ):
+        self.supabase = supabase
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.max_retries = max_retries
+
+        # (로그 행, 실패 횟수)
+        self._buffer: Deque[Tuple[Dict[str, Any], int]] = deque()
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {"logged": 0, "written": 0, "dropped": 0, "failed_batches": 0}
+
+    def log(self, entry: Dict[str, Any]):
+        """
+        활동 로그 추가 (즉시 반환)
+
+        Args:
+            entry: admin_activity_logs 행 (admin_id, action, target_type, ...)
+        """
+        entry.setdefault("created_at", datetime.utcnow().isoformat())
+
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                self.stats["dropped"] += 1
+                if self.stats["dropped"] % 100 == 1:
+                    print(f"⚠️  활동 로그 버퍼 가득 참 - 폐기 누적 {self.stats['dropped']}건")
+                return
+
+            self._buffer.append((entry, 0))
+            self.stats["logged"] += 1
+            full = len(self._buffer) >= self.batch_size
+
+        if full and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _take_batch(self) -> List[Tuple[Dict[str, Any], int]]:
+        with self._lock:
+            count = min(self.batch_size, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _requeue(self, batch: List[Tuple[Dict[str, Any], int]]):
+        """실패한 배치를 버퍼 앞쪽으로 복귀 (재시도 한도 초과분/상한 초과분은 폐기)"""
+        retry = [(entry, attempts + 1) for entry, attempts in batch if attempts + 1 <= self.max_retries]
+        expired = len(batch) - len(retry)
+        if expired:
+            print(f"⚠️  활동 로그 {expired}건 재시도 {self.max_retries}회 초과 - 폐기")
+
+        with self._lock:
+            room = self.max_buffer - len(self._buffer)
+            keep = retry[:max(0, room)]
+            self.stats["dropped"] += len(batch) - len(keep)
+            self._buffer.extendleft(reversed(keep))
+
+    def _insert(self, rows: List[Dict[str, Any]]):
+        # 🔥 행마다 키가 다름 (target_id/details 선택) - 생략된 키는 NULL 대신 컬럼 기본값 사용
+        self.supabase.table("admin_activity_logs").insert(rows, default_to_null=False).execute()
+
+    async def _write_batch(self, batch: List[Tuple[Dict[str, Any], int]]) -> Tuple[int, bool]:
+        """
+        배치 저장 - 행 데이터 오류면 반씩 나눠 재시도해서 문제 행만 폐기
+
+        Returns:
+            Tuple[int, bool]: (저장된 로그 수, 일시 장애 없이 끝났는지)
+        """
+        written = 0
+        pending = [batch]
+        while pending:
+            chunk = pending.pop()
+            try:
+                await asyncio.to_thread(self._insert, [entry for entry, _ in chunk])
+                written += len(chunk)
+            except Exception as e:
+                if not _is_row_error(e):
+                    # 🔥 일시 장애 - 아직 저장 안 된 로그만 순서대로 복귀
+                    remaining = chunk + [item for part in reversed(pending) for item in part]
+                    self.stats["failed_batches"] += 1
+                    print(f"⚠️  활동 로그 저장 실패 ({len(remaining)}건, 재시도 예정): {str(e)}")
+                    self._requeue(remaining)
+                    return written, False
+
+                if len(chunk) == 1:
+                    self.stats["dropped"] += 1
+                    print(f"⚠️  활동 로그 1건 거부되어 폐기 ({e.code}): {e.message}")
+                    continue
+
+                mid = len(chunk) // 2
+                pending.append(chunk[mid:])
+                pending.append(chunk[:mid])
+
+        return written, True
+
+    async def flush(self, drain: bool = False) -> int:
+        """
+        버퍼 일괄 저장
+
+        Args:
+            drain: True면 버퍼가 빌 때까지 반복 (종료 시)
+
+        Returns:
+            int: 저장된 로그 수
+        """
+        written = 0
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return written
+
+            batch_written, ok = await self._write_batch(batch)
+            written += batch_written
+            self.stats["written"] += batch_written
+            if not ok:
+                return written
+
+            if not drain and len(self._buffer) < self.batch_size:
+                return written
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        print(f"✅ 활동 로그 버퍼 시작 (배치 {self.batch_size}건 / {self.flush_interval:g}초)")
+
+    async def stop(self):
+        """주기 flush 중단 후 남은 로그 저장"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._wakeup = None
+
+        written = await self.flush(drain=True)
+        print(f"✅ 활동 로그 버퍼 종료 (종료 시 저장 {written}건, 폐기 누적 {self.stats['dropped']}건)")
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "buffered": len(self._buffer)}
+
+
+# 전역 활동 로그 기록기
+activity_logger = ActivityLogger(get_supabase())
@@ -0,0 +1,243 @@
+"""
+서비스 헬스 폴러
+- 백그라운드에서 주기적으로 전체 서비스 /health 동시 조회 → 최신 상태 메모리 보관
+- 24시간 Uptime을 시간 단위 버킷 카운터로 증분 유지 (system_metrics 재조회 없음)
+- 조회 결과는 라운드마다 system_metrics에 일괄 저장 (health_check, value 1=online / 0=그 외)
+"""
+import os
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, Optional
+import httpx
+from supabase import Client
+
+HEALTH_POLL_INTERVAL_SECONDS = int(os.getenv("HEALTH_POLL_INTERVAL_SECONDS", "30"))
+HEALTH_PROBE_TIMEOUT_SECONDS = 5.0
+
+# Uptime 집계 기간 (시간 단위 버킷 수)
+UPTIME_WINDOW_HOURS = 24
+
+PAGE_SIZE = 1000
+
+
+class UptimeCounter:
+    """시간 단위 버킷 (hour, 전체, 성공) 롤링 카운터"""
+
+    def __init__(self, window_hours: int = UPTIME_WINDOW_HOURS):
+        self.window_hours = window_hours
+        self._buckets: Deque[List] = deque()
+
+    def record(self, online: bool, at: Optional[datetime] = None):
+        hour = (at or datetime.utcnow()).replace(minute=0, second=0, microsecond=0)
+
+        if self._buckets and self._buckets[-1][0] == hour:
+            bucket = self._buckets[-1]
+        elif self._buckets and hour < self._buckets[-1][0]:
+            # 백필 데이터 (시간 역순 도착) - 해당 버킷 탐색
+            bucket = next((b for b in self._buckets if b[0] == hour), None)
+            if bucket is None:
+                return
+        else:
+            bucket = [hour, 0, 0]
+            self._buckets.append(bucket)
+
+        bucket[1] += 1
+        if online:
+            bucket[2] += 1
+
+    def percentage(self, now: Optional[datetime] = None) -> Optional[float]:
+        cutoff = (now or datetime.utcnow()) - timedelta(hours=self.window_hours)
+        while self._buckets and self._buckets[0][0] + timedelta(hours=1) <= cutoff:
+            self._buckets.popleft()
+
+        total = sum(bucket[1] for bucket in self._buckets)
+        if total == 0:
+            return None
+        return round(sum(bucket[2] for bucket in self._buckets) / total * 100, 2)
+
+
+class HealthPoller:
+    """백그라운드 서비스 헬스 폴러"""
+
+    def __init__(
+        self,
+        services: Dict[str, Dict[str, str]],
+        supabase: Client,
+        interval_seconds: int = HEALTH_POLL_INTERVAL_SECONDS
+    ):
+        self.services = services
+        self.supabase = supabase
+        self.interval_seconds = interval_seconds
+
+        self.latest: Dict[str, Dict[str, Any]] = {}
+        self.uptime: Dict[str, UptimeCounter] = {name: UptimeCounter() for name in services}
+        self.last_polled_at: Optional[float] = None
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._poll_lock: Optional[asyncio.Lock] = None
+
+    # ------------------------------------------------------------------
+    # 수명 주기
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Uptime 카운터 백필 후 폴링 루프 시작"""
+        self._client = httpx.AsyncClient(timeout=HEALTH_PROBE_TIMEOUT_SECONDS)
+        self._poll_lock = asyncio.Lock()
+
+        try:
+            loaded = await asyncio.to_thread(self._backfill_uptime)
+            print(f"✅ Uptime 백필 완료: 헬스체크 기록 {loaded}건")
+        except Exception as e:
+            print(f"⚠️  Uptime 백필 실패: {str(e)}")
+
+        self._task = asyncio.create_task(self._run())
+        print(f"✅ 헬스 폴러 시작 (주기: {self.interval_seconds}초, 서비스 {len(self.services)}개)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                print(f"❌ 헬스 폴링 실패: {str(e)}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def _backfill_uptime(self) -> int:
+        """재시작 시 지난 24시간 헬스체크 기록으로 카운터 초기화 (시작 시 1회)"""
+        since = datetime.utcnow() - timedelta(hours=UPTIME_WINDOW_HOURS)
+        loaded = 0
+        start = 0
+
+        while True:
+            page = self.supabase.table("system_metrics") \
+                .select("service_name, value, timestamp") \
+                .eq("metric_type", "health_check") \
+                .gte("timestamp", since.isoformat()) \
+                .order("timestamp", desc=False) \
+                .range(start, start + PAGE_SIZE - 1) \
+                .execute().data or []
+
+            for row in page:
+                counter = self.uptime.get(row["service_name"])
+                if counter is not None:
+                    at = datetime.fromisoformat(row["timestamp"].replace("Z", "+00:00")).replace(tzinfo=None)
+                    counter.record(row.get("value") == 1, at)
+                    loaded += 1
+
+            if len(page) < PAGE_SIZE:
+                return loaded
+            start += PAGE_SIZE
+
+    # ------------------------------------------------------------------
+    # 폴링
+    # ------------------------------------------------------------------
+
+    async def _probe(self, name: str, config: Dict[str, str]) -> Dict[str, Any]:
+        """단일 서비스 헬스체크"""
+        url = f"{config['url']}{config['health_endpoint']}"
+        status = {
+            "name": name,
+            "url": config["url"],
+            "description": config["description"],
+            "status": "offline",
+            "response_time_ms": None,
+            "last_checked": datetime.utcnow(),
+            "error_message": None,
+            "health_data": None,
+        }
+
+        started = time.monotonic()
+        try:
+            response = await self._client.get(url)
+            status["response_time_ms"] = int((time.monotonic() - started) * 1000)
+
+            if response.status_code == 200:
+                status["status"] = "online"
+                if "application/json" in response.headers.get("content-type", ""):
+                    # 🔥 응답은 왔으므로 JSON 파싱 실패는 offline이 아니라 degraded로 구분
+                    try:
+                        status["health_data"] = response.json()
+                    except ValueError as e:
+                        status["status"] = "degraded"
+                        status["error_message"] = f"헬스 응답 JSON 파싱 실패: {e}"
+            else:
+                status["status"] = "degraded"
+                status["error_message"] = f"HTTP {response.status_code}"
+        except Exception as e:
+            status["error_message"] = str(e)
+
+        status["last_checked"] = datetime.utcnow()
+        return status
+
+    async def poll_once(self):
+        """전체 서비스 동시 조회 + 상태 갱신 + system_metrics 일괄 저장"""
+        async with self._poll_lock:
+            results = await asyncio.gather(*[
+                self._probe(name, config) for name, config in self.services.items()
+            ])
+
+            rows = []
+            for status in results:
+                online = status["status"] == "online"
+                self.latest[status["name"]] = status
+                self.uptime[status["name"]].record(online, status["last_checked"])
+                rows.append({
+                    "service_name": status["name"],
+                    "metric_type": "health_check",
+                    "value": 1 if online else 0,
+                    "metadata": {
+                        "status": status["status"],
+                        "response_time_ms": status["response_time_ms"],
+                        "error_message": status["error_message"],
+                    },
+                    "timestamp": status["last_checked"].isoformat(),
+                })
+
+            self.last_polled_at = time.monotonic()
+
+        try:
+            await asyncio.to_thread(lambda: self.supabase.table("system_metrics").insert(rows).execute())
+        except Exception as e:
+            print(f"⚠️  헬스체크 기록 저장 실패: {str(e)}")
+
+    async def ensure_polled(self, force: bool = False):
+        """
+        캐시된 상태 보장 (첫 폴링 전이거나 force면 즉시 폴링)
+
+        Args:
+            force: 캐시 무시하고 즉시 재조회
+        """
+        if self._poll_lock is None:
+            # 시작 이벤트 전 호출 시 즉석 초기화
+            self._client = httpx.AsyncClient(timeout=HEALTH_PROBE_TIMEOUT_SECONDS)
+            self._poll_lock = asyncio.Lock()
+
+        if force or self.last_polled_at is None:
+            await self.poll_once()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def get_statuses(self) -> List[Dict[str, Any]]:
+        """서비스 설정 순서대로 최신 상태"""
+        return [self.latest[name] for name in self.services if name in self.latest]
+
+    def get_status(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.latest.get(name)
+
+    def get_uptime(self, name: str) -> Optional[float]:
+        counter = self.uptime.get(name)
+        return counter.percentage() if counter else None
@@ -0,0 +1,112 @@
+"""
+시계열 다운샘플링 유틸리티
+- 조회 기간 / 목표 포인트 수에 맞는 버킷 크기 선택
+- 버킷 크기에 따른 원본 / 1분 롤업 / 1시간 롤업 티어 선택
+- LTTB(Largest-Triangle-Three-Buckets) 다운샘플링
+"""
+import math
+from typing import Dict, List, Optional
+
+# 해상도 파라미터 → 버킷 크기 (초), raw는 버킷 없이 원본 포인트 (LTTB로 축소)
+RESOLUTIONS: Dict[str, int] = {
+    "raw": 0,
+    "10s": 10,
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+    "6h": 6 * 3600,
+    "1d": 86400,
+}
+
+# 자동 선택 시 사용할 버킷 크기 (초)
+BUCKET_STEPS = [10, 30, 60, 300, 900, 1800, 3600, 3 * 3600, 6 * 3600, 12 * 3600, 86400]
+
+# 티어 경계 (초)
+ROLLUP_1M_SECONDS = 60
+ROLLUP_1H_SECONDS = 3600
+
+
+def choose_bucket_seconds(hours: int, max_points: int, resolution: Optional[str] = None) -> int:
+    """
+    버킷 크기 결정 (응답 포인트 수가 max_points를 넘지 않도록 보정)
+
+    Args:
+        hours: 조회 기간 (시간)
+        max_points: 최대 포인트 수
+        resolution: 요청 해상도 (None이면 자동)
+
+    Returns:
+        int: 버킷 크기 (초), 0이면 원본 포인트
+    """
+    if resolution == "raw":
+        return 0
+
+    min_bucket = math.ceil(hours * 3600 / max_points)
+    requested = RESOLUTIONS.get(resolution, 0) if resolution else 0
+
+    # 요청 해상도가 너무 세밀하면 가장 가까운 상위 단계로 보정
+    for step in BUCKET_STEPS:
+        if step >= max(min_bucket, requested):
+            return step
+    return BUCKET_STEPS[-1]
+
+
+def source_for_bucket(bucket_seconds: int) -> str:
+    """버킷 크기에 맞는 조회 티어 (raw / 1m / 1h)"""
+    if bucket_seconds >= ROLLUP_1H_SECONDS:
+        return "1h"
+    if bucket_seconds >= ROLLUP_1M_SECONDS:
+        return "1m"
+    return "raw"
+
+
+def lttb(points: List[Dict], threshold: int, key: str = "value") -> List[Dict]:
+    """
+    LTTB 다운샘플링 (첫/마지막 포인트 유지, 구간별 삼각형 면적이 최대인 포인트 선택)
+
+    Args:
+        points: 시간순 정렬된 포인트 ({"timestamp": datetime, key: float, ...})
+        threshold: 목표 포인트 수
+        key: 값 필드 이름
+
+    Returns:
+        List[Dict]: 다운샘플링된 포인트 (원본 dict 그대로)
+    """
+    if threshold >= len(points) or threshold < 3:
+        return points
+
+    xs = [point["timestamp"].timestamp() for point in points]
+    ys = [point[key] for point in points]
+
+    sampled = [points[0]]
+    every = (len(points) - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # 다음 구간 평균 (삼각형의 세 번째 꼭짓점)
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, len(points))
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        # 현재 구간에서 면적 최대 포인트 선택
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        max_area = -1.0
+        selected = start
+        for j in range(start, end):
+            area = abs(
+                (xs[a] - avg_x) * (ys[j] - ys[a])
+                - (xs[a] - xs[j]) * (avg_y - ys[a])
+            )
+            if area > max_area:
+                max_area = area
+                selected = j
+
+        sampled.append(points[selected])
+        a = selected
+
+    sampled.append(points[-1])
+    return sampled
@@ -0,0 +1,150 @@
+"""
+AI 제공자 호출 승인 제어 (Admission Control)
+- 제공자별 동시 호출 수 제한
+- 대기열 길이 제한 → 초과 시 즉시 429 + Retry-After
+- 대기 시간 제한 → 초과 시 503 + Retry-After
+- 대기열 깊이 / 대기 시간 통계 (/health 노출)
+"""
+import os
+import math
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import HTTPException
+
+# 기본 설정 (환경 변수로 조정)
+ADMISSION_MAX_QUEUE = int(os.getenv("AI_ADMISSION_MAX_QUEUE", "64"))
+ADMISSION_MAX_WAIT = float(os.getenv("AI_ADMISSION_MAX_WAIT", "10"))  # 초
+
+# 이동 평균 가중치 (최근 값 비중)
+EWMA_ALPHA = 0.2
+
+MAX_RETRY_AFTER = 60  # 초
+
+
+class AdmissionController:
+    """
+    제공자별 승인 제어기
+    - 동시 실행 슬롯 + 제한된 대기열
+    - 포화 시 대기하지 않고 빠르게 거절 (호출 측 백오프 유도)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        max_wait: float = ADMISSION_MAX_WAIT
+    ):
+        """
+        Args:
+            name: 제공자 이름 (로그/통계용)
+            max_concurrency: 동시 호출 상한
+            max_queue: 최대 대기 요청 수
+            max_wait: 최대 대기 시간 (초)
+        """
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.active = 0
+        self.waiting = 0
+
+        # 통계
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.avg_wait = 0.0          # 평균 대기 시간 (초, EWMA)
+        self.avg_service = 1.0       # 평균 처리 시간 (초, EWMA)
+        self.last_wait = 0.0
+
+    def retry_after(self) -> int:
+        """현재 대기열 기준 예상 재시도 대기 시간 (초)"""
+        estimate = self.avg_service * (self.waiting + 1) / self.max_concurrency
+        return max(1, min(MAX_RETRY_AFTER, math.ceil(estimate)))
+
+    def _is_saturated(self) -> bool:
+        """실행 슬롯 + 대기열이 모두 찬 상태 (대기 중 요청은 슬롯 획득 전까지 waiting으로 집계)"""
+        return self.active + self.waiting >= self.max_concurrency + self.max_queue
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        호출 슬롯 획득
+
+        Raises:
+            HTTPException: 429 (대기열 가득 참) / 503 (대기 시간 초과), Retry-After 헤더 포함
+        """
+        if self._is_saturated():
+            self.rejected_queue_full += 1
+            retry_after = self.retry_after()
+            print(f"🚫 [{self.name}] 대기열 포화 - 요청 거절 (대기 {self.waiting}개, Retry-After {retry_after}s)")
+            raise HTTPException(
+                status_code=429,
+                detail=f"AI 분석 요청이 많습니다 ({self.name} 대기열 포화). {retry_after}초 후 다시 시도해주세요.",
+                headers={"Retry-After": str(retry_after)}
+            )
+
+        self.waiting += 1
+        wait_start = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.rejected_timeout += 1
+            retry_after = self.retry_after()
+            print(f"⏱️ [{self.name}] 대기 시간 초과 ({self.max_wait}s) - 요청 거절 (Retry-After {retry_after}s)")
+            raise HTTPException(
+                status_code=503,
+                detail=f"AI 분석 대기 시간 초과 ({self.name}). {retry_after}초 후 다시 시도해주세요.",
+                headers={"Retry-After": str(retry_after)}
+            )
+        finally:
+            self.waiting -= 1
+
+        self.last_wait = time.monotonic() - wait_start
+        self.avg_wait = (1 - EWMA_ALPHA) * self.avg_wait + EWMA_ALPHA * self.last_wait
+        self.admitted += 1
+        self.active += 1
+
+        service_start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+            service_time = time.monotonic() - service_start
+            self.avg_service = (1 - EWMA_ALPHA) * self.avg_service + EWMA_ALPHA * service_time
+
+    def get_stats(self) -> dict:
+        """
+        통계 조회
+
+        Returns:
+            dict: 실행 중/대기 수, 평균 대기/처리 시간, 거절 수
+        """
+        return {
+            "active": self.active,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.waiting,
+            "max_queue": self.max_queue,
+            "avg_wait_ms": round(self.avg_wait * 1000, 1),
+            "last_wait_ms": round(self.last_wait * 1000, 1),
+            "avg_service_ms": round(self.avg_service * 1000, 1),
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "saturated": self._is_saturated()
+        }
+
+
+# 제공자별 싱글톤 인스턴스
+openai_admission = AdmissionController(
+    "openai",
+    max_concurrency=int(os.getenv("AI_OPENAI_MAX_CONCURRENCY", "8"))
+)
+claude_admission = AdmissionController(
+    "claude",
+    max_concurrency=int(os.getenv("AI_CLAUDE_MAX_CONCURRENCY", "4"))
+)
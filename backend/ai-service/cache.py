@@ -1,21 +1,143 @@
 """
 Redis 캐싱 모듈
 뉴스 분석 결과를 캐싱하여 중복 분석 방지
+
+🔥 2단계 캐시 + 동일 분석 병합
+- 프로세스 내 LRU → Redis 순으로 조회
+- URL 정규화 (추적 파라미터 제거, 네이버 모바일/PC 링크 통일) + 본문 해시 키 → 전재 기사도 캐시 HIT
+- 같은 기사에 대한 동시 분석 요청은 1회만 모델 호출 (single-flight)
 """
 import os
+import re
 import json
+import time
+import asyncio
 import hashlib
 import redis
-from typing import Optional
+from collections import OrderedDict
+from typing import Optional, Tuple, List, Dict, Callable, Awaitable
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# 프로세스 내 LRU 설정
+LOCAL_CACHE_SIZE = int(os.getenv("AI_CACHE_LOCAL_SIZE", "2048"))
+LOCAL_CACHE_TTL = int(os.getenv("AI_CACHE_LOCAL_TTL", "600"))  # Redis보다 짧게 (삭제 전파 지연 제한)
+
+# 본문 해시에 사용할 최소 길이 (너무 짧은 본문은 서로 다른 기사끼리 충돌 가능)
+MIN_FINGERPRINT_LENGTH = 40
+
+# 제거할 추적 파라미터 (모든 호스트 공통 - 광고/SNS 클릭 식별자만)
+TRACKING_PARAMS = {"fbclid", "gclid", "igshid", "mc_cid", "mc_eid"}
+TRACKING_PREFIXES = ("utm_",)
+
+# 호스트별 추가 제거 파라미터 (다른 사이트에서는 sid 등이 기사 식별자일 수 있으므로 호스트 한정)
+NAVER_TRACKING_PARAMS = {"sid", "sid1", "sid2", "ntype", "rc", "from", "mode"}
+
+# 네이버 뉴스 기사 링크 패턴
+NAVER_ARTICLE_PATH = re.compile(r"^/(?:mnews/)?article/(\d+)/(\d+)")
+NAVER_NEWS_HOSTS = {"news.naver.com", "n.news.naver.com", "m.news.naver.com"}
+
+
+def normalize_url(url: str) -> str:
+    """
+    캐시 키용 URL 정규화
+
+    - 스킴/호스트 소문자, fragment 및 끝 슬래시 제거 (스킴은 유지)
+    - utm_* / fbclid 등 추적 파라미터 제거 후 쿼리 정렬 (sid 등은 네이버 뉴스에서만 제거)
+    - 네이버 뉴스 모바일/PC/구형 링크 → https://n.news.naver.com/article/{oid}/{aid}
+
+    Args:
+        url: 원본 URL
+
+    Returns:
+        정규화된 URL
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    strip_params = TRACKING_PARAMS | NAVER_TRACKING_PARAMS if host in NAVER_NEWS_HOSTS else TRACKING_PARAMS
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in strip_params and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+
+    if host in NAVER_NEWS_HOSTS:
+        match = NAVER_ARTICLE_PATH.match(parts.path)
+        params = dict(query)
+        if match:
+            return f"https://n.news.naver.com/article/{match.group(1)}/{match.group(2)}"
+        if params.get("oid") and params.get("aid"):
+            return f"https://n.news.naver.com/article/{params['oid']}/{params['aid']}"
+
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), host, path, urlencode(sorted(query)), ""))
+
+
+def content_fingerprint(title: Optional[str], content: Optional[str]) -> Optional[str]:
+    """
+    기사 본문 해시 (전재/신디케이션 기사 식별용)
+
+    Returns:
+        SHA256 해시 또는 None (본문이 너무 짧은 경우)
+    """
+    text = re.sub(r"\s+", " ", f"{title or ''} {content or ''}").strip().lower()
+    if len(text) < MIN_FINGERPRINT_LENGTH:
+        return None
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class LocalLRUCache:
+    """프로세스 내 LRU 캐시 (TTL 포함)"""
+
+    def __init__(self, maxsize: int = LOCAL_CACHE_SIZE, ttl: int = LOCAL_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: dict):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
 
 
 class NewsCache:
-    """뉴스 분석 결과 캐시"""
+    """뉴스 분석 결과 캐시 (프로세스 내 LRU + Redis)"""
 
     def __init__(self):
         """Redis 클라이언트 초기화"""
         redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
 
+        self.local = LocalLRUCache()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
         try:
             self.client = redis.from_url(redis_url, decode_responses=True)
             # 연결 테스트
@@ -23,7 +145,7 @@ class NewsCache:
             print(f"✅ Redis 연결 성공: {redis_url}")
         except Exception as e:
             print(f"⚠️ Redis 연결 실패: {str(e)}")
-            print("   캐싱 기능이 비활성화됩니다.")
+            print("   Redis 캐싱 기능이 비활성화됩니다. (프로세스 내 캐시만 사용)")
             self.client = None
 
     def get_cache_key(self, url: str) -> str:
@@ -34,41 +156,105 @@ class NewsCache:
             url: 뉴스 URL
 
         Returns:
-            SHA256 해시 기반 캐시 키
+            정규화된 URL의 SHA256 해시 기반 캐시 키
         """
-        # URL을 SHA256 해시로 변환하여 키 생성
-        hash_object = hashlib.sha256(url.encode())
+        hash_object = hashlib.sha256(normalize_url(url).encode())
         return f"news:analysis:{hash_object.hexdigest()}"
 
-    def get(self, url: str) -> Optional[dict]:
+    def get_content_key(self, title: Optional[str], content: Optional[str]) -> Optional[str]:
+        """본문 해시 기반 캐시 키 (본문이 짧으면 None)"""
+        fingerprint = content_fingerprint(title, content)
+        return f"news:analysis:content:{fingerprint}" if fingerprint else None
+
+    def _keys(self, url: str, title: Optional[str] = None, content: Optional[str] = None) -> List[str]:
+        keys = [self.get_cache_key(url)]
+        content_key = self.get_content_key(title, content)
+        if content_key:
+            keys.append(content_key)
+        return keys
+
+    def _lookup(self, key_groups: List[List[str]]) -> List[Optional[dict]]:
+        """
+        키 그룹별 조회 (LRU → Redis MGET 1회), 그룹 내 첫 HIT 반환
+
+        Redis HIT는 같은 그룹의 모든 키로 LRU에 채워둠
+        """
+        results: List[Optional[dict]] = []
+        missing_keys = []
+
+        for keys in key_groups:
+            hit = next((value for value in (self.local.get(key) for key in keys) if value is not None), None)
+            results.append(hit)
+            if hit is None:
+                missing_keys.extend(keys)
+
+        if not missing_keys or not self.client:
+            return results
+
+        try:
+            unique_keys = list(dict.fromkeys(missing_keys))
+            remote = dict(zip(unique_keys, self.client.mget(unique_keys)))
+        except Exception as e:
+            print(f"⚠️ 캐시 조회 오류: {str(e)}")
+            return results
+
+        for index, keys in enumerate(key_groups):
+            if results[index] is not None:
+                continue
+            cached_data = next((remote.get(key) for key in keys if remote.get(key)), None)
+            if cached_data:
+                value = json.loads(cached_data)
+                for key in keys:
+                    self.local.set(key, value)
+                results[index] = value
+
+        return results
+
+    def get(self, url: str, title: Optional[str] = None, content: Optional[str] = None) -> Optional[dict]:
         """
         캐시에서 분석 결과 조회
 
         Args:
             url: 뉴스 URL
+            title: 기사 제목 (본문 해시 조회용, 선택)
+            content: 기사 본문 (본문 해시 조회용, 선택)
 
         Returns:
             분석 결과 dict 또는 None
         """
-        if not self.client:
-            return None
+        cached = self._lookup([self._keys(url, title, content)])[0]
 
-        try:
-            cache_key = self.get_cache_key(url)
-            cached_data = self.client.get(cache_key)
+        if cached is not None:
+            print(f"✅ 캐시 HIT: {url[:50]}...")
+        else:
+            print(f"❌ 캐시 MISS: {url[:50]}...")
+        return cached
 
-            if cached_data:
-                print(f"✅ 캐시 HIT: {url[:50]}...")
-                return json.loads(cached_data)
-            else:
-                print(f"❌ 캐시 MISS: {url[:50]}...")
-                return None
+    def get_many(self, articles: List[Tuple[str, Optional[str], Optional[str]]]) -> List[Optional[dict]]:
+        """
+        여러 기사의 분석 결과를 한 번에 조회 (LRU 확인 후 Redis MGET 1회)
 
-        except Exception as e:
-            print(f"⚠️ 캐시 조회 오류: {str(e)}")
-            return None
+        Args:
+            articles: [(url, title, content)]
 
-    def set(self, url: str, analysis_result: dict, ttl: int = 86400):
+        Returns:
+            입력 순서와 같은 분석 결과 리스트 (MISS는 None)
+        """
+        if not articles:
+            return []
+
+        results = self._lookup([self._keys(url, title, content) for url, title, content in articles])
+        print(f"✅ 캐시 일괄 조회: {sum(1 for r in results if r is not None)}/{len(articles)}개 HIT")
+        return results
+
+    def set(
+        self,
+        url: str,
+        analysis_result: dict,
+        ttl: int = 86400,
+        title: Optional[str] = None,
+        content: Optional[str] = None
+    ):
         """
         분석 결과를 캐시에 저장
 
@@ -76,22 +262,92 @@ class NewsCache:
             url: 뉴스 URL
             analysis_result: AI 분석 결과
             ttl: Time To Live (초), 기본 24시간
+            title: 기사 제목 (본문 해시 키 저장용, 선택)
+            content: 기사 본문 (본문 해시 키 저장용, 선택)
         """
+        keys = self._keys(url, title, content)
+        for key in keys:
+            self.local.set(key, analysis_result)
+
         if not self.client:
             return
 
         try:
-            cache_key = self.get_cache_key(url)
-            self.client.setex(
-                cache_key,
-                ttl,
-                json.dumps(analysis_result, ensure_ascii=False)
-            )
-            print(f"✅ 캐시 저장: {url[:50]}... (TTL: {ttl}s)")
+            payload = json.dumps(analysis_result, ensure_ascii=False)
+            pipe = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipe.setex(key, ttl, payload)
+            pipe.execute()
+            print(f"✅ 캐시 저장: {url[:50]}... (TTL: {ttl}s, 키 {len(keys)}개)")
 
         except Exception as e:
             print(f"⚠️ 캐시 저장 오류: {str(e)}")
 
+    async def get_or_analyze(
+        self,
+        url: str,
+        title: Optional[str],
+        content: Optional[str],
+        analyze: Callable[[], Awaitable[dict]],
+        ttl: int = 86400
+    ) -> Tuple[dict, bool]:
+        """
+        캐시 조회 후 MISS면 분석 (동일 기사 동시 요청은 1회만 분석)
+
+        Args:
+            url: 뉴스 URL
+            title: 기사 제목
+            content: 기사 본문
+            analyze: 분석 코루틴 함수 (결과 dict 반환)
+            ttl: 캐시 TTL (초)
+
+        Returns:
+            (분석 결과, 캐시/병합 여부)
+        """
+        keys = self._keys(url, title, content)
+
+        while True:
+            cached = self._lookup([keys])[0]
+            if cached is not None:
+                return cached, True
+
+            # 이미 진행 중인 동일 분석이 있으면 결과 대기
+            inflight = next((self._inflight[key] for key in keys if key in self._inflight), None)
+            if inflight is None:
+                break
+
+            print(f"🔗 진행 중인 분석 병합: {url[:50]}...")
+            try:
+                return await asyncio.shield(inflight), True
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # 먼저 시작한 분석이 취소됨 → 직접 분석
+
+        future = asyncio.get_running_loop().create_future()
+        for key in keys:
+            self._inflight[key] = future
+
+        try:
+            result = await analyze()
+            self.set(url, result, ttl=ttl, title=title, content=content)
+            future.set_result(result)
+            return result, False
+
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 대기자가 없을 때 미처리 예외 경고 방지
+            raise
+
+        finally:
+            for key in keys:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
     def delete(self, url: str):
         """
         캐시 삭제
@@ -99,11 +355,13 @@ class NewsCache:
         Args:
             url: 뉴스 URL
         """
+        cache_key = self.get_cache_key(url)
+        self.local.delete(cache_key)
+
         if not self.client:
             return
 
         try:
-            cache_key = self.get_cache_key(url)
             self.client.delete(cache_key)
             print(f"✅ 캐시 삭제: {url[:50]}...")
 
@@ -112,6 +370,8 @@ class NewsCache:
 
     def clear_all(self):
         """모든 뉴스 분석 캐시 삭제 (개발/테스트용)"""
+        self.local.clear()
+
         if not self.client:
             return
 
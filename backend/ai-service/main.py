@@ -3,21 +3,29 @@ AI 분석 서비스
 OpenAI GPT-4o-mini (우선) / Claude (폴백) API를 사용한 뉴스 분석
 """
 import os
+import asyncio
+from typing import Optional
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
-from anthropic import Anthropic
-from openai import OpenAI
+from anthropic import AsyncAnthropic, RateLimitError as ClaudeRateLimitError
+from openai import AsyncOpenAI
 import json
 from cache import news_cache
+from admission import openai_admission, claude_admission
 
 load_dotenv()
 
 app = FastAPI(title="AI Analysis Service")
 
-# AI 클라이언트 초기화
-claude_client = Anthropic(api_key=os.getenv("CLAUDE_API_KEY", ""))
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
+# AI 클라이언트 초기화 (비동기 - 일괄 분석 시 동시 호출)
+claude_client = AsyncAnthropic(api_key=os.getenv("CLAUDE_API_KEY", ""))
+openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
+
+# 🔥 일괄 분석 설정
+AI_BATCH_CONCURRENCY = int(os.getenv("AI_BATCH_CONCURRENCY", "8"))  # 동시 모델 호출 상한
+AI_BATCH_MAX_ARTICLES = int(os.getenv("AI_BATCH_MAX_ARTICLES", "500"))  # 요청당 최대 기사 수
 
 
 class NewsAnalysisRequest(BaseModel):
@@ -27,6 +35,11 @@ class NewsAnalysisRequest(BaseModel):
     url: str  # 캐싱을 위한 뉴스 URL
 
 
+class NewsBatchAnalysisRequest(BaseModel):
+    articles: list[NewsAnalysisRequest]
+    max_concurrency: Optional[int] = None  # 서버 상한(AI_BATCH_CONCURRENCY) 이하로만 적용
+
+
 class NewsAnalysisResponse(BaseModel):
     summary: str
     sentiment_score: float  # -1 ~ 1
@@ -53,11 +66,13 @@ async def analyze_with_openai(title: str, content: str, symbols: list[str]) -> N
 """
 
     try:
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"}
-        )
+        # 🔥 제공자별 동시 호출 제한 (포화 시 429/503 즉시 반환)
+        async with openai_admission.slot():
+            response = await openai_client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"}
+            )
 
         result = json.loads(response.choices[0].message.content)
 
@@ -67,6 +82,8 @@ async def analyze_with_openai(title: str, content: str, symbols: list[str]) -> N
             impact_score=result["impact_score"],
             recommended_action=result["recommended_action"]
         )
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"OpenAI API 오류: {str(e)}")
         # Claude로 폴백
@@ -93,11 +110,12 @@ async def analyze_with_claude(title: str, content: str, symbols: list[str]) -> N
 """
 
     try:
-        message = claude_client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1024,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        async with claude_admission.slot():
+            message = await claude_client.messages.create(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=1024,
+                messages=[{"role": "user", "content": prompt}]
+            )
 
         result = json.loads(message.content[0].text)
 
@@ -107,6 +125,16 @@ async def analyze_with_claude(title: str, content: str, symbols: list[str]) -> N
             impact_score=result["impact_score"],
             recommended_action=result["recommended_action"]
         )
+    except HTTPException:
+        raise
+    except ClaudeRateLimitError as e:
+        print(f"Claude API 요청 한도 초과: {str(e)}")
+        retry_after = claude_admission.retry_after()
+        raise HTTPException(
+            status_code=429,
+            detail="AI 제공자 요청 한도 초과 (OpenAI 및 Claude 모두 실패)",
+            headers={"Retry-After": str(retry_after)}
+        )
     except Exception as e:
         print(f"Claude API 오류: {str(e)}")
         raise HTTPException(status_code=500, detail="AI 분석 실패 (OpenAI 및 Claude 모두 실패)")
@@ -114,30 +142,131 @@ async def analyze_with_claude(title: str, content: str, symbols: list[str]) -> N
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "service": "ai-service"}
+    return {
+        "status": "ok",
+        "service": "ai-service",
+        "admission": {
+            "openai": openai_admission.get_stats(),
+            "claude": claude_admission.get_stats()
+        }
+    }
 
 
 @app.post("/analyze", response_model=NewsAnalysisResponse)
 async def analyze_news(request: NewsAnalysisRequest):
-    """뉴스 분석 엔드포인트 (Redis 캐싱 적용)
+    """뉴스 분석 엔드포인트 (LRU + Redis 캐싱, 동일 요청 병합)
 
     우선순위: OpenAI GPT-4o-mini → Claude (폴백)
     """
 
-    # 1. 캐시 확인
-    cached_result = news_cache.get(request.url)
-    if cached_result:
+    async def analyze() -> dict:
+        print(f"🤖 AI 분석 시작 (OpenAI GPT-4o-mini): {request.title[:50]}...")
+        result = await analyze_with_openai(request.title, request.content, request.symbols)
+        return result.model_dump()
+
+    # 캐시 확인 → MISS면 AI 분석 (동일 기사 동시 요청은 1회만 분석, 24시간 TTL)
+    result, cached = await news_cache.get_or_analyze(
+        request.url, request.title, request.content, analyze, ttl=86400
+    )
+    if cached:
         print(f"✅ 캐시에서 분석 결과 반환: {request.title[:50]}...")
-        return NewsAnalysisResponse(**cached_result)
 
-    # 2. 캐시 미스 - AI 분석 수행 (OpenAI 우선)
-    print(f"🤖 AI 분석 시작 (OpenAI GPT-4o-mini): {request.title[:50]}...")
-    result = await analyze_with_openai(request.title, request.content, request.symbols)
+    return NewsAnalysisResponse(**result)
+
 
-    # 3. 결과를 캐시에 저장 (24시간 TTL)
-    news_cache.set(request.url, result.model_dump(), ttl=86400)
+@app.post("/analyze/batch")
+async def analyze_news_batch(request: NewsBatchAnalysisRequest):
+    """뉴스 일괄 분석 엔드포인트 (NDJSON 스트리밍)
+
+    1. 전체 URL 캐시를 한 번에 조회 (Redis MGET)
+    2. 캐시 HIT는 즉시 반환
+    3. MISS는 동시 호출 상한 내에서 병렬 분석, 완료되는 순서대로 반환
+
+    응답 한 줄: {"index": 요청 내 순번, "url": ..., "cached": bool, "result": {...}}
+             또는 {"index", "url", "error", "status_code", "retry_after"(429/503일 때)}
+    """
+    articles = request.articles
+    if len(articles) > AI_BATCH_MAX_ARTICLES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"요청당 최대 {AI_BATCH_MAX_ARTICLES}개 기사까지 분석할 수 있습니다 (요청: {len(articles)}개)"
+        )
+
+    concurrency = max(1, min(request.max_concurrency or AI_BATCH_CONCURRENCY, AI_BATCH_CONCURRENCY))
+
+    # 🔥 제공자 대기열이 이미 포화면 배치 전체를 즉시 거절
+    if openai_admission.get_stats()["saturated"]:
+        retry_after = openai_admission.retry_after()
+        raise HTTPException(
+            status_code=429,
+            detail=f"AI 분석 요청이 많습니다. {retry_after}초 후 다시 시도해주세요.",
+            headers={"Retry-After": str(retry_after)}
+        )
 
-    return result
+    # 1. 캐시 일괄 조회
+    cached_results = news_cache.get_many([(a.url, a.title, a.content) for a in articles])
+
+    # 2. MISS 기사를 정규화 URL 기준으로 묶기 (같은 기사는 한 번만 분석)
+    pending: dict[str, list[int]] = {}
+    for index, article in enumerate(articles):
+        if cached_results[index] is None:
+            pending.setdefault(news_cache.get_cache_key(article.url), []).append(index)
+
+    print(f"📦 일괄 분석 요청: {len(articles)}개 (캐시 HIT {len(articles) - sum(len(v) for v in pending.values())}개, "
+          f"분석 대상 {len(pending)}개, 동시 {concurrency}개)")
+
+    def to_line(payload: dict) -> str:
+        return json.dumps(payload, ensure_ascii=False) + "\n"
+
+    async def stream():
+        for index, article in enumerate(articles):
+            if cached_results[index] is not None:
+                yield to_line({"index": index, "url": article.url, "cached": True, "result": cached_results[index]})
+
+        if not pending:
+            return
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def analyze_one(cache_key: str, article: NewsAnalysisRequest):
+            async def analyze() -> dict:
+                result = await analyze_with_openai(article.title, article.content, article.symbols)
+                return result.model_dump()
+
+            async with semaphore:
+                try:
+                    result, cached = await news_cache.get_or_analyze(
+                        article.url, article.title, article.content, analyze, ttl=86400
+                    )
+                    return cache_key, result, cached, None
+                except HTTPException as e:
+                    return cache_key, None, False, e
+                except Exception as e:
+                    return cache_key, None, False, HTTPException(status_code=500, detail=str(e))
+
+        tasks = [
+            asyncio.create_task(analyze_one(cache_key, articles[indices[0]]))
+            for cache_key, indices in pending.items()
+        ]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                cache_key, result, cached, error = await next_done
+                for index in pending[cache_key]:
+                    url = articles[index].url
+                    if error is None:
+                        yield to_line({"index": index, "url": url, "cached": cached, "result": result})
+                    else:
+                        error_line = {"index": index, "url": url, "error": error.detail, "status_code": error.status_code}
+                        if error.headers and "Retry-After" in error.headers:
+                            error_line["retry_after"] = int(error.headers["Retry-After"])
+                        yield to_line(error_line)
+        finally:
+            # 클라이언트 연결 종료 시 남은 분석 취소
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,199 @@
+"""
+🔥 크롤링 파이프라인 (단계별 asyncio 큐 + 백프레셔)
+수집 → 필터/중복확인 → NER → AI 분석 → 저장 → 알림 단계를 동시에 실행
+
+- 단계 사이는 크기 제한 큐 → 뒤 단계가 느리면 앞 단계가 put에서 대기 (백프레셔)
+- 단계별 워커 수 / 배치 크기 설정 (예: AI 분석은 배치 단위, 알림은 건별)
+- 동기 DB 호출 단계는 blocking=True → 스레드에서 실행해 이벤트 루프를 막지 않음
+- 단계별 처리량 통계 (입력/출력/실패 수, 처리 시간, 최대 큐 길이)
+
+⚠️ 큐는 run() 호출 시 생성 (사이클마다 새 큐, 실행 중인 앱 이벤트 루프에 바인딩)
+"""
+import os
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# 단계 사이 큐 최대 길이
+PIPELINE_QUEUE_SIZE = int(os.getenv("CRAWL_PIPELINE_QUEUE_SIZE", "200"))
+
+# 배치 단계에서 배치를 채우기 위해 추가로 기다리는 시간 (초)
+PIPELINE_BATCH_WAIT = float(os.getenv("CRAWL_PIPELINE_BATCH_WAIT", "0.5"))
+
+# handler(배치) → 다음 단계로 넘길 항목 리스트
+StageHandler = Callable[[List[Any]], Any]
+
+
+class Stage:
+    """파이프라인 단계"""
+
+    def __init__(
+        self,
+        name: str,
+        handler: StageHandler,
+        workers: int = 1,
+        batch_size: int = 1,
+        blocking: bool = False
+    ):
+        """
+        Args:
+            name: 단계 이름 (통계 출력용)
+            handler: 배치(list)를 받아 다음 단계 항목 리스트를 반환하는 함수
+            workers: 동시 워커 수
+            batch_size: 워커가 한 번에 처리할 최대 항목 수
+            blocking: True면 동기 handler를 스레드에서 실행
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.blocking = blocking
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.received = 0
+        self.emitted = 0
+        self.failed = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    async def process(self, batch: List[Any]) -> List[Any]:
+        if self.blocking:
+            result = await asyncio.to_thread(self.handler, batch)
+        else:
+            result = self.handler(batch)
+            if asyncio.iscoroutine(result):
+                result = await result
+        return list(result or [])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """단계별 처리량 통계"""
+        elapsed = (self._finished_at or time.monotonic()) - self._started_at if self._started_at else 0.0
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "batch_size": self.batch_size,
+            "received": self.received,
+            "emitted": self.emitted,
+            "failed": self.failed,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 2),
+            "elapsed_seconds": round(elapsed, 2),
+            "throughput_per_second": round(self.received / elapsed, 1) if elapsed > 0 else None,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+class CrawlPipeline:
+    """단계별 워커 + 크기 제한 큐 파이프라인"""
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        batch_wait: float = PIPELINE_BATCH_WAIT
+    ):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.batch_wait = batch_wait
+        self.source_count = 0
+
+    async def _next_batch(self, stage: Stage, queue: asyncio.Queue) -> List[Any]:
+        """첫 항목은 대기, 이후 batch_wait 동안 batch_size까지 채움"""
+        batch = [await queue.get()]
+        stage.max_queue_depth = max(stage.max_queue_depth, queue.qsize() + 1)
+
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < stage.batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _worker(self, stage: Stage, queue: asyncio.Queue, downstream: Optional[asyncio.Queue]):
+        while True:
+            batch = await self._next_batch(stage, queue)
+            if stage._started_at is None:
+                stage._started_at = time.monotonic()
+
+            started = time.monotonic()
+            try:
+                outputs = await stage.process(batch)
+            except Exception as e:
+                stage.failed += len(batch)
+                outputs = []
+                print(f"❌ [{stage.name}] 단계 처리 오류 ({len(batch)}개): {str(e)}")
+            finally:
+                stage.busy_seconds += time.monotonic() - started
+                stage.received += len(batch)
+                stage.batches += 1
+
+            stage.emitted += len(outputs)
+            if downstream is not None:
+                for item in outputs:
+                    await downstream.put(item)  # 🔥 다음 단계 큐가 가득 차면 대기 (백프레셔)
+
+            stage._finished_at = time.monotonic()
+            for _ in batch:
+                queue.task_done()
+
+    async def run(self, source: Callable[[Callable[[Any], Awaitable[None]]], Awaitable[None]]):
+        """
+        파이프라인 실행 (모든 항목이 마지막 단계까지 처리되면 반환)
+
+        Args:
+            source: emit(item) 함수를 받아 첫 단계에 항목을 넣는 코루틴 함수
+        """
+        for stage in self.stages:
+            stage.reset_stats()
+        self.source_count = 0
+
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        workers = []
+        for index, stage in enumerate(self.stages):
+            downstream = queues[index + 1] if index + 1 < len(queues) else None
+            workers.append([
+                asyncio.create_task(self._worker(stage, queues[index], downstream))
+                for _ in range(stage.workers)
+            ])
+
+        async def emit(item: Any):
+            self.source_count += 1
+            await queues[0].put(item)
+
+        try:
+            await source(emit)
+
+            # 앞 단계부터 순서대로 비워지면 해당 단계 워커 종료
+            for queue, stage_workers in zip(queues, workers):
+                await queue.join()
+                for task in stage_workers:
+                    task.cancel()
+        finally:
+            all_workers = [task for stage_workers in workers for task in stage_workers]
+            for task in all_workers:
+                task.cancel()
+            await asyncio.gather(*all_workers, return_exceptions=True)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        return [stage.get_stats() for stage in self.stages]
+
+    def print_stats(self):
+        print(f"⏱️ 파이프라인 단계별 처리량 (입력 {self.source_count}개):")
+        for stats in self.get_stats():
+            throughput = f"{stats['throughput_per_second']}/초" if stats["throughput_per_second"] is not None else "-"
+            print(f"   - {stats['stage']:<6} 워커 {stats['workers']}, 입력 {stats['received']}, 출력 {stats['emitted']}, "
+                  f"실패 {stats['failed']}, 처리 {stats['busy_seconds']}초 / 경과 {stats['elapsed_seconds']}초, "
+                  f"{throughput}, 최대 큐 {stats['max_queue_depth']}")
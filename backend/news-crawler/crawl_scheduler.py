@@ -0,0 +1,334 @@
+"""
+🔥 asyncio 기반 크롤링 스케줄러
+앱 이벤트 루프 안에서 작업별 주기 실행 (APScheduler BackgroundScheduler 대체)
+
+- 작업별 중복 실행 방지: 이전 실행이 끝나지 않았으면 이번 회차 건너뜀
+- Redis 리스(SET NX PX): 여러 레플리카 중 한 곳만 실행, 실행 중 주기적으로 연장
+- 장 시간 적응형 주기: 장중(KST 평일 08:30~16:00) 짧게, 장 외/주말 길게
+"""
+import os
+import time
+import uuid
+import asyncio
+import traceback
+from datetime import datetime, timedelta, timezone, time as dtime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import redis
+
+KST = timezone(timedelta(hours=9))
+
+# 장 시간 (KST) - 장 시작 전/마감 후 30분 포함
+MARKET_OPEN = dtime(8, 30)
+MARKET_CLOSE = dtime(16, 0)
+
+LEASE_KEY_PREFIX = "news-crawler:lease:"
+
+# 리스 연장 스크립트 (본인 토큰일 때만)
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# 리스 해제 스크립트 (본인 토큰일 때만)
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+STATE_STOPPED = 0
+STATE_RUNNING = 1
+STATE_PAUSED = 2
+
+
+def is_market_hours(now: Optional[datetime] = None) -> bool:
+    """KST 평일 장 시간 여부 (장 시작 전/마감 후 30분 포함)"""
+    now = (now or datetime.now(KST)).astimezone(KST)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+class AdaptiveSchedule:
+    """장 시간 적응형 주기"""
+
+    def __init__(self, market_minutes: float, off_hours_minutes: float):
+        """
+        Args:
+            market_minutes: 장중 실행 주기 (분)
+            off_hours_minutes: 장 외/주말 실행 주기 (분)
+        """
+        self.market_minutes = market_minutes
+        self.off_hours_minutes = off_hours_minutes
+
+    def next_delay(self, now: Optional[datetime] = None) -> float:
+        """
+        다음 실행까지 대기 시간 (초)
+        장 외 주기 중간에 장이 열리면 장 시작 시각에 맞춰 실행
+        """
+        now = (now or datetime.now(KST)).astimezone(KST)
+        if is_market_hours(now):
+            return self.market_minutes * 60
+
+        delay = self.off_hours_minutes * 60
+        next_open = self._next_market_open(now)
+        return max(0.0, min(delay, (next_open - now).total_seconds()))
+
+    @staticmethod
+    def _next_market_open(now: datetime) -> datetime:
+        day = now.date()
+        while True:
+            candidate = datetime.combine(day, MARKET_OPEN, tzinfo=KST)
+            if candidate > now and candidate.weekday() < 5:
+                return candidate
+            day += timedelta(days=1)
+
+    def describe(self) -> str:
+        return f"장중 {self.market_minutes:g}분 / 장 외 {self.off_hours_minutes:g}분"
+
+
+class RedisLease:
+    """Redis 기반 실행 리스 (레플리카 간 단일 실행 보장)"""
+
+    def __init__(self, client, name: str, ttl_seconds: int):
+        self.client = client
+        self.key = f"{LEASE_KEY_PREFIX}{name}"
+        self.ttl_ms = int(ttl_seconds * 1000)
+        self.token: Optional[str] = None
+
+    def acquire(self) -> bool:
+        if self.client is None:
+            return True
+        token = f"{os.getpid()}:{uuid.uuid4().hex}"
+        try:
+            if self.client.set(self.key, token, nx=True, px=self.ttl_ms):
+                self.token = token
+                return True
+            return False
+        except Exception as e:
+            # Redis 장애 시 크롤링 중단보다 중복 실행이 낫다고 판단 → 실행
+            print(f"⚠️ 리스 획득 실패 (Redis 오류, 로컬 실행): {str(e)}")
+            return True
+
+    def renew(self) -> bool:
+        if self.client is None or self.token is None:
+            return True
+        try:
+            return bool(self.client.eval(_RENEW_SCRIPT, 1, self.key, self.token, self.ttl_ms))
+        except Exception as e:
+            print(f"⚠️ 리스 연장 실패: {str(e)}")
+            return False
+
+    def release(self):
+        if self.client is None or self.token is None:
+            return
+        try:
+            self.client.eval(_RELEASE_SCRIPT, 1, self.key, self.token)
+        except Exception as e:
+            print(f"⚠️ 리스 해제 실패: {str(e)}")
+        finally:
+            self.token = None
+
+
+class CrawlJob:
+    """스케줄 작업"""
+
+    def __init__(
+        self,
+        job_id: str,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        schedule: AdaptiveSchedule,
+        lease_ttl: int,
+        run_on_start: bool = True,
+        exclusive: bool = True
+    ):
+        self.id = job_id
+        self.name = name
+        self.func = func
+        self.schedule = schedule
+        self.lease_ttl = lease_ttl
+        self.run_on_start = run_on_start
+        self.exclusive = exclusive
+
+        self.running = False
+        self.next_run_time: Optional[datetime] = None
+        self.last_started_at: Optional[datetime] = None
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.run_count = 0
+        self.skipped_overlap = 0
+        self.skipped_lease = 0
+
+        self._task: Optional[asyncio.Task] = None
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "schedule": self.schedule.describe(),
+            "exclusive": self.exclusive,
+            "running": self.running,
+            "next_run_time": self.next_run_time.isoformat() if self.next_run_time else None,
+            "last_started_at": self.last_started_at.isoformat() if self.last_started_at else None,
+            "last_duration_seconds": round(self.last_duration, 1) if self.last_duration is not None else None,
+            "last_error": self.last_error,
+            "run_count": self.run_count,
+            "skipped_overlap": self.skipped_overlap,
+            "skipped_lease": self.skipped_lease,
+        }
+
+
+class AsyncCrawlScheduler:
+    """앱 이벤트 루프에서 동작하는 크롤링 스케줄러"""
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.jobs: Dict[str, CrawlJob] = {}
+        self.state = STATE_STOPPED
+        self._resumed: Optional[asyncio.Event] = None
+        self.redis_client = None
+
+        redis_url = redis_url or os.getenv("REDIS_URL")
+        if redis_url:
+            try:
+                self.redis_client = redis.from_url(redis_url, decode_responses=True)
+                self.redis_client.ping()
+                print(f"✅ 스케줄러 Redis 리스 사용: {redis_url}")
+            except Exception as e:
+                print(f"⚠️ 스케줄러 Redis 연결 실패: {str(e)} (프로세스 내 중복 방지만 사용)")
+                self.redis_client = None
+        else:
+            print("ℹ️ REDIS_URL 미설정 - 프로세스 내 중복 방지만 사용 (단일 레플리카 전제)")
+
+    def add_job(
+        self,
+        job_id: str,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        schedule: AdaptiveSchedule,
+        lease_ttl: int = 600,
+        run_on_start: bool = True,
+        exclusive: bool = True
+    ) -> CrawlJob:
+        """
+        작업 등록
+
+        Args:
+            job_id: 작업 ID (리스 키에 사용)
+            name: 표시 이름
+            func: 실행할 코루틴 함수
+            schedule: 적응형 주기
+            lease_ttl: 리스 만료 시간 (초) - 실행 중에는 1/3 주기로 연장
+            run_on_start: 시작 시 즉시 1회 실행
+            exclusive: True면 Redis 리스로 레플리카 중 1곳만 실행 (False면 레플리카마다 실행 - 로컬 캐시 갱신 등)
+        """
+        job = CrawlJob(job_id, name, func, schedule, lease_ttl, run_on_start, exclusive)
+        self.jobs[job_id] = job
+        return job
+
+    # ------------------------------------------------------------------
+    # 실행 제어
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """현재 이벤트 루프에서 작업별 루프 시작"""
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+        self.state = STATE_RUNNING
+
+        for job in self.jobs.values():
+            job._task = asyncio.create_task(self._job_loop(job))
+
+    async def shutdown(self):
+        """모든 작업 루프 종료 (실행 중인 작업 취소 + 리스 해제)"""
+        self.state = STATE_STOPPED
+        tasks = [job._task for job in self.jobs.values() if job._task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def pause(self):
+        if self.state == STATE_STOPPED:
+            raise RuntimeError("Scheduler is not running")
+        self.state = STATE_PAUSED
+        self._resumed.clear()
+
+    def resume(self):
+        if self.state == STATE_STOPPED:
+            raise RuntimeError("Scheduler is not running")
+        self.state = STATE_RUNNING
+        self._resumed.set()
+
+    async def run_now(self, job_id: str) -> bool:
+        """
+        수동 실행 (완료까지 대기)
+
+        Returns:
+            bool: 실행 여부 (이미 실행 중이거나 다른 레플리카가 리스 보유 시 False)
+        """
+        return await self._run_guarded(self.jobs[job_id])
+
+    def get_jobs(self) -> List[CrawlJob]:
+        return list(self.jobs.values())
+
+    # ------------------------------------------------------------------
+    # 내부 루프
+    # ------------------------------------------------------------------
+
+    async def _job_loop(self, job: CrawlJob):
+        delay = 0.0 if job.run_on_start else job.schedule.next_delay()
+
+        while True:
+            job.next_run_time = datetime.now(KST) + timedelta(seconds=delay)
+            await asyncio.sleep(delay)
+
+            # 일시중지 중이면 재개까지 대기
+            await self._resumed.wait()
+
+            # 🔥 이전 실행이 길어져도 끝난 뒤 다음 주기부터 계산 (회차 누적 없음)
+            await self._run_guarded(job)
+            delay = job.schedule.next_delay()
+
+    async def _run_guarded(self, job: CrawlJob) -> bool:
+        # 1. 프로세스 내 중복 실행 방지
+        if job.running:
+            job.skipped_overlap += 1
+            print(f"⏭️ [{job.name}] 이전 실행이 진행 중이라 건너뜀")
+            return False
+
+        # 2. 레플리카 간 중복 실행 방지 (Redis 리스, exclusive 작업만)
+        lease = RedisLease(self.redis_client if job.exclusive else None, job.id, job.lease_ttl)
+        if not lease.acquire():
+            job.skipped_lease += 1
+            print(f"⏭️ [{job.name}] 다른 인스턴스가 실행 중이라 건너뜀")
+            return False
+
+        job.running = True
+        job.last_started_at = datetime.now(KST)
+        started = time.monotonic()
+        renew_task = asyncio.create_task(self._renew_lease(job, lease))
+
+        try:
+            await job.func()
+            job.last_error = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.last_error = str(e)
+            print(f"❌ [{job.name}] 실행 오류: {str(e)}")
+            traceback.print_exc()
+        finally:
+            renew_task.cancel()
+            lease.release()
+            job.running = False
+            job.run_count += 1
+            job.last_duration = time.monotonic() - started
+
+        return True
+
+    async def _renew_lease(self, job: CrawlJob, lease: RedisLease):
+        while True:
+            await asyncio.sleep(max(1, job.lease_ttl / 3))
+            if not lease.renew():
+                print(f"⚠️ [{job.name}] 리스 연장 실패 - 다른 인스턴스가 실행할 수 있음")
@@ -0,0 +1,174 @@
+"""
+🔥 소스별 증분 크롤링 상태 (Redis 저장)
+(소스, 종목)마다 마지막 발행 시각 / 최근 URL / ETag·Last-Modified를 유지
+
+- 조건부 요청 (If-None-Match / If-Modified-Since) → 304면 파싱 생략
+- 이미 본 URL 또는 마지막 발행 시각 이전 기사에 도달하면 파싱/페이지 조회 중단
+- Redis 미연결 시 프로세스 메모리에만 유지 (재시작 시 초기화)
+- load()는 복사본 반환 → 기사 저장 성공 후 save()해야 반영 (실패 시 다음 사이클 재수집)
+"""
+import os
+import json
+import hashlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+import redis
+
+STATE_KEY_PREFIX = "news-crawler:state:"
+STATE_TTL_SECONDS = int(os.getenv("CRAWL_STATE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# 종목별 보관할 최근 URL 수
+MAX_RECENT_URLS = int(os.getenv("CRAWL_STATE_MAX_URLS", "200"))
+
+# 발행 시각 여유 (소스 색인 지연으로 늦게 노출되는 기사 고려)
+PUBLISHED_MARGIN = timedelta(minutes=int(os.getenv("CRAWL_STATE_MARGIN_MINUTES", "30")))
+
+
+class SourceState:
+    """(소스, 종목) 크롤링 상태"""
+
+    def __init__(self, data: Optional[Dict] = None):
+        data = data or {}
+        self.last_published_at: Optional[datetime] = (
+            datetime.fromisoformat(data["last_published_at"]) if data.get("last_published_at") else None
+        )
+        self.recent_urls: List[str] = list(data.get("recent_urls", []))
+        self.etag: Optional[str] = data.get("etag")
+        self.last_modified: Optional[str] = data.get("last_modified")
+        self.body_hash: Optional[str] = data.get("body_hash")  # ETag 미지원 소스용
+        self._known = set(self.recent_urls)
+        self.dirty = False
+
+    @property
+    def is_initial(self) -> bool:
+        """이전 크롤링 기록 없음"""
+        return self.last_published_at is None and not self.recent_urls
+
+    def is_known(self, url: str, published_at: Optional[datetime] = None) -> bool:
+        """이미 본 기사 여부 (URL 일치 또는 마지막 발행 시각 - 여유분 이전)"""
+        if url in self._known:
+            return True
+        if published_at is not None and self.last_published_at is not None and published_at.tzinfo is not None:
+            return published_at < self.last_published_at - PUBLISHED_MARGIN
+        return False
+
+    def record(self, items: Iterable[Dict]):
+        """새 기사 반영 (최근 URL 앞쪽 추가, 최신 발행 시각 갱신)"""
+        new_urls = []
+        for item in items:
+            if item["url"] not in self._known:
+                new_urls.append(item["url"])
+                self._known.add(item["url"])
+
+            published_at = datetime.fromisoformat(item["published_at"].replace('Z', '+00:00'))
+            if published_at.tzinfo is not None and (self.last_published_at is None or published_at > self.last_published_at):
+                self.last_published_at = published_at
+                self.dirty = True
+
+        if new_urls:
+            self.recent_urls = (new_urls + self.recent_urls)[:MAX_RECENT_URLS]
+            self._known = set(self.recent_urls)
+            self.dirty = True
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """조건부 요청 헤더"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def update_validators(self, response_headers):
+        """응답의 ETag / Last-Modified 저장"""
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        if etag != self.etag or last_modified != self.last_modified:
+            self.etag = etag
+            self.last_modified = last_modified
+            self.dirty = True
+
+    def body_unchanged(self, body: bytes) -> bool:
+        """응답 본문이 직전과 같으면 True (아니면 해시 갱신)"""
+        body_hash = hashlib.sha1(body).hexdigest()
+        if body_hash == self.body_hash:
+            return True
+        self.body_hash = body_hash
+        self.dirty = True
+        return False
+
+    def to_dict(self) -> Dict:
+        return {
+            "last_published_at": self.last_published_at.isoformat() if self.last_published_at else None,
+            "recent_urls": self.recent_urls,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "body_hash": self.body_hash,
+        }
+
+
+class CrawlStateStore:
+    """크롤링 상태 저장소 (Redis + 프로세스 메모리)"""
+
+    def __init__(self):
+        redis_url = os.getenv("REDIS_URL")
+        self._local: Dict[str, SourceState] = {}
+        self.client = None
+
+        if redis_url:
+            try:
+                self.client = redis.from_url(redis_url, decode_responses=True)
+                self.client.ping()
+                print(f"✅ 크롤링 상태 Redis 연결: {redis_url}")
+            except Exception as e:
+                print(f"⚠️ 크롤링 상태 Redis 연결 실패: {str(e)} (프로세스 메모리만 사용)")
+                self.client = None
+
+    @staticmethod
+    def _key(source: str, name: str) -> str:
+        return f"{STATE_KEY_PREFIX}{source}:{name}"
+
+    def load(self, source: str, names: List[str]) -> Dict[str, SourceState]:
+        """
+        종목별 상태 일괄 조회 (Redis MGET 1회)
+
+        Returns:
+            Dict[str, SourceState]: {종목명: 상태 복사본} (save() 전까지 저장소에 반영되지 않음)
+        """
+        keys = [self._key(source, name) for name in names]
+        states = {}
+
+        if self.client is not None and keys:
+            try:
+                for name, key, raw in zip(names, keys, self.client.mget(keys)):
+                    if raw:
+                        self._local[key] = SourceState(json.loads(raw))
+            except Exception as e:
+                print(f"⚠️ 크롤링 상태 조회 실패: {str(e)}")
+
+        for name, key in zip(names, keys):
+            cached = self._local.get(key)
+            states[name] = SourceState(cached.to_dict()) if cached else SourceState()
+        return states
+
+    def save(self, source: str, states: Dict[str, SourceState]):
+        """변경된 상태만 저장 (프로세스 메모리 + Redis 파이프라인 1회)"""
+        dirty = {name: state for name, state in states.items() if state.dirty}
+        if not dirty:
+            return
+
+        for name, state in dirty.items():
+            self._local[self._key(source, name)] = state
+
+        if self.client is not None:
+            try:
+                pipe = self.client.pipeline(transaction=False)
+                for name, state in dirty.items():
+                    pipe.setex(self._key(source, name), STATE_TTL_SECONDS, json.dumps(state.to_dict(), ensure_ascii=False))
+                pipe.execute()
+            except Exception as e:
+                print(f"⚠️ 크롤링 상태 저장 실패: {str(e)}")
+                return
+
+        for state in dirty.values():
+            state.dirty = False
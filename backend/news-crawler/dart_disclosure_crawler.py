@@ -3,10 +3,12 @@
 금융감독원 전자공시시스템(DART) 공시 정보 수집
 """
 import os
+import json
 import asyncio
 import aiohttp
+import tempfile
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 import zipfile
 import io
@@ -14,6 +16,16 @@ import xml.etree.ElementTree as ET
 
 load_dotenv()
 
+# 🔥 DART 기업 코드 인덱스 (종목 코드 → 기업 코드) 로컬 캐시
+DART_CORP_CODE_CACHE_PATH = os.getenv(
+    "DART_CORP_CODE_CACHE_PATH",
+    os.path.join(tempfile.gettempdir(), "dart_corp_codes.json")
+)
+DART_CORP_CODE_MAX_AGE_HOURS = int(os.getenv("DART_CORP_CODE_MAX_AGE_HOURS", "24"))
+
+# 다운로드 실패 후 재시도 대기 (분) - 실패 시 종목마다 60초짜리 ZIP 다운로드를 반복하지 않도록
+DART_CORP_CODE_RETRY_MINUTES = int(os.getenv("DART_CORP_CODE_RETRY_MINUTES", "60"))
+
 
 class DartDisclosureCrawler:
     """DART 전자공시 크롤러"""
@@ -27,10 +39,134 @@ class DartDisclosureCrawler:
             print("⚠️ DART_API_KEY 환경 변수가 설정되지 않았습니다.")
             print("   https://opendart.fss.or.kr/ 에서 API 키를 발급받으세요.")
 
+        # 종목 코드 → 기업 코드 (로컬 인덱스, 하루 1회 갱신)
+        self._corp_codes: Dict[str, str] = {}
+        self._corp_codes_updated_at: Optional[datetime] = None
+        self._corp_codes_failed_at: Optional[datetime] = None
+        self._corp_code_lock: Optional[asyncio.Lock] = None
+        self._load_corp_code_index()
+
+    def _load_corp_code_index(self):
+        """로컬 기업 코드 인덱스 로드 (시작 시 1회)"""
+        try:
+            with open(DART_CORP_CODE_CACHE_PATH, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            self._corp_codes = index.get("codes", {})
+            self._corp_codes_updated_at = datetime.fromisoformat(index["downloaded_at"])
+            print(f"✅ DART 기업 코드 인덱스 로드: {len(self._corp_codes)}개 ({self._corp_codes_updated_at:%Y-%m-%d %H:%M})")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ DART 기업 코드 인덱스 로드 실패: {str(e)}")
+
+    @staticmethod
+    def _parse_corp_codes(xml_file) -> Dict[str, str]:
+        """
+        corpCode.xml 스트리밍 파싱 (iterparse, 처리한 요소는 즉시 해제)
+
+        Returns:
+            Dict[str, str]: {종목 코드: 기업 코드} (상장사만)
+        """
+        codes = {}
+        for _, elem in ET.iterparse(xml_file, events=("end",)):
+            if elem.tag != "list":
+                continue
+
+            stock_code = (elem.findtext("stock_code") or "").strip()
+            corp_code = (elem.findtext("corp_code") or "").strip()
+            if stock_code and corp_code:
+                codes[stock_code] = corp_code
+            elem.clear()
+        return codes
+
+    @classmethod
+    def _build_corp_code_index(cls, zip_data: bytes) -> Tuple[Dict[str, str], datetime]:
+        """
+        ZIP 내 corpCode.xml 파싱 + 로컬 JSON 저장 (동기 - 스레드에서 실행)
+
+        Returns:
+            Tuple[Dict[str, str], datetime]: (기업 코드 인덱스, 다운로드 시각)
+        """
+        # ZIP 내 XML을 메모리에 풀지 않고 스트림으로 파싱
+        with zipfile.ZipFile(io.BytesIO(zip_data)) as z:
+            with z.open(z.namelist()[0]) as xml_file:
+                codes = cls._parse_corp_codes(xml_file)
+
+        downloaded_at = datetime.now()
+        tmp_path = f"{DART_CORP_CODE_CACHE_PATH}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"downloaded_at": downloaded_at.isoformat(), "codes": codes}, f, separators=(",", ":"))
+        os.replace(tmp_path, DART_CORP_CODE_CACHE_PATH)
+
+        return codes, downloaded_at
+
+    def _in_corp_code_backoff(self) -> bool:
+        """최근 다운로드 실패 후 재시도 대기 중 여부"""
+        return (
+            self._corp_codes_failed_at is not None
+            and datetime.now() - self._corp_codes_failed_at < timedelta(minutes=DART_CORP_CODE_RETRY_MINUTES)
+        )
+
+    def _is_corp_code_index_stale(self) -> bool:
+        if not self._corp_codes or self._corp_codes_updated_at is None:
+            return True
+        return datetime.now() - self._corp_codes_updated_at > timedelta(hours=DART_CORP_CODE_MAX_AGE_HOURS)
+
+    async def refresh_corp_codes(self, force: bool = False) -> int:
+        """
+        DART 기업 코드 인덱스 갱신 (하루 1회)
+        corpCode.xml ZIP 다운로드 → 스트리밍 파싱 → 로컬 JSON 저장 (파싱/저장은 스레드에서 실행)
+        실패 시 DART_CORP_CODE_RETRY_MINUTES 동안 재다운로드 생략 (기존 인덱스 유지)
+
+        Args:
+            force: 갱신 주기와 무관하게 다운로드
+
+        Returns:
+            int: 인덱스 종목 수
+        """
+        if not self.api_key:
+            return len(self._corp_codes)
+
+        if self._corp_code_lock is None:
+            self._corp_code_lock = asyncio.Lock()
+
+        async with self._corp_code_lock:
+            # 대기 중 다른 요청이 갱신했으면 생략
+            if not force and (not self._is_corp_code_index_stale() or self._in_corp_code_backoff()):
+                return len(self._corp_codes)
+
+            try:
+                async with aiohttp.ClientSession() as session:
+                    url = f"{self.base_url}/corpCode.xml"
+                    params = {"crtfc_key": self.api_key}
+
+                    async with session.get(url, params=params, timeout=60) as response:
+                        if response.status != 200:
+                            self._corp_codes_failed_at = datetime.now()
+                            print(f"⚠️ DART corpCode 다운로드 실패: HTTP {response.status} ({DART_CORP_CODE_RETRY_MINUTES}분 후 재시도)")
+                            return len(self._corp_codes)
+                        zip_data = await response.read()
+
+                codes, downloaded_at = await asyncio.to_thread(self._build_corp_code_index, zip_data)
+
+                self._corp_codes = codes
+                self._corp_codes_updated_at = downloaded_at
+                self._corp_codes_failed_at = None
+                print(f"✅ DART 기업 코드 인덱스 갱신: {len(codes)}개 상장사")
+
+            except Exception as e:
+                self._corp_codes_failed_at = datetime.now()
+                print(f"❌ DART 기업 코드 인덱스 갱신 실패: {str(e)} ({DART_CORP_CODE_RETRY_MINUTES}분 후 재시도)")
+
+            return len(self._corp_codes)
+
     async def get_corp_code(self, stock_code: str) -> Optional[str]:
         """
         종목 코드로 DART 기업 코드 조회
 
+        🔥 로컬 인덱스 조회 (O(1)), 인덱스가 없거나 하루 이상 지났으면 먼저 갱신
+           (최근 갱신 실패 후 재시도 대기 중이면 기존 인덱스 그대로 사용)
+
         Args:
             stock_code: 종목 코드 (예: '005930')
 
@@ -38,45 +174,14 @@ class DartDisclosureCrawler:
             str: DART 기업 코드 (8자리)
         """
         # DART는 종목코드와 별도의 기업코드(corp_code) 사용
-        # 매핑 테이블이 필요하거나 API로 조회
-
-        # 간단한 매핑 (실제로는 DART corpCode.xml 파일 다운로드 필요)
         # https://opendart.fss.or.kr/api/corpCode.xml?crtfc_key={api_key}
+        if self._is_corp_code_index_stale():
+            await self.refresh_corp_codes()
 
-        try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/corpCode.xml"
-                params = {"crtfc_key": self.api_key}
-
-                async with session.get(url, params=params, timeout=30) as response:
-                    if response.status != 200:
-                        print(f"⚠️ DART corpCode 조회 실패: HTTP {response.status}")
-                        return None
-
-                    # ZIP 파일 다운로드 및 압축 해제
-                    zip_data = await response.read()
-                    with zipfile.ZipFile(io.BytesIO(zip_data)) as z:
-                        xml_filename = z.namelist()[0]
-                        xml_data = z.read(xml_filename)
-
-                    # XML 파싱
-                    root = ET.fromstring(xml_data)
-
-                    # 종목 코드로 검색
-                    for corp in root.findall('list'):
-                        stock_code_elem = corp.find('stock_code')
-                        if stock_code_elem is not None and stock_code_elem.text:
-                            if stock_code_elem.text.strip() == stock_code:
-                                corp_code_elem = corp.find('corp_code')
-                                if corp_code_elem is not None:
-                                    return corp_code_elem.text.strip()
-
-                    print(f"⚠️ 종목 코드 {stock_code}에 해당하는 DART 기업 코드를 찾을 수 없습니다.")
-                    return None
-
-        except Exception as e:
-            print(f"❌ DART 기업 코드 조회 실패: {str(e)}")
-            return None
+        corp_code = self._corp_codes.get(stock_code)
+        if corp_code is None:
+            print(f"⚠️ 종목 코드 {stock_code}에 해당하는 DART 기업 코드를 찾을 수 없습니다.")
+        return corp_code
 
     async def crawl_disclosures(
         self,
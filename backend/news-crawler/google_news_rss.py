@@ -3,26 +3,39 @@
 - Google News RSS Feed를 통해 종목 관련 뉴스 수집
 - 네이버 API 보완용 추가 뉴스 소스
 """
+import os
+import asyncio
 import feedparser
 import httpx
 from datetime import datetime, timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import quote_plus
+from rate_limiter import TokenBucket
+from crawl_state import SourceState, CrawlStateStore
+
+# 🔥 동시 검색 설정 (환경 변수로 조정)
+GOOGLE_NEWS_MAX_CONCURRENCY = int(os.getenv("GOOGLE_NEWS_MAX_CONCURRENCY", "10"))
+GOOGLE_NEWS_REQUESTS_PER_SECOND = float(os.getenv("GOOGLE_NEWS_REQUESTS_PER_SECOND", "15"))
 
 
 class GoogleNewsRSS:
     """Google News RSS Feed 크롤러"""
 
+    SOURCE = "google_news"
+
     def __init__(self):
         self.base_url = "https://news.google.com/rss/search"
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
         }
+        self.stats = {"not_modified": 0, "unchanged": 0, "known": 0}  # 직전 다중 검색 증분 통계
 
     async def search_stock_news(
         self,
         stock_name: str,
-        max_results: int = 10
+        max_results: int = 10,
+        client: Optional[httpx.AsyncClient] = None,
+        state: Optional[SourceState] = None
     ) -> List[Dict[str, Any]]:
         """
         특정 종목명으로 Google News 검색
@@ -30,6 +43,8 @@ class GoogleNewsRSS:
         Args:
             stock_name: 종목명 (예: "삼성전자")
             max_results: 최대 결과 수
+            client: 공유 HTTP 클라이언트 (없으면 요청마다 생성)
+            state: 증분 크롤링 상태 (있으면 조건부 요청 + 이미 본 기사 제외)
 
         Returns:
             List[Dict]: 뉴스 리스트
@@ -54,10 +69,25 @@ class GoogleNewsRSS:
 
             print(f"📰 [Google News RSS] 검색: {stock_name} (URL: {rss_url[:80]}...)")
 
-            # HTTP 요청 (비동기)
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(rss_url, headers=self.headers)
-                response.raise_for_status()
+            # HTTP 요청 (비동기, 🔥 ETag/Last-Modified 조건부 요청)
+            headers = {**self.headers, **(state.conditional_headers() if state else {})}
+            if client is None:
+                async with httpx.AsyncClient(timeout=10.0) as own_client:
+                    response = await own_client.get(rss_url, headers=headers)
+            else:
+                response = await client.get(rss_url, headers=headers)
+
+            if response.status_code == 304:
+                self.stats["not_modified"] += 1
+                return []
+            response.raise_for_status()
+
+            if state is not None:
+                state.update_validators(response.headers)
+                # 피드 본문이 직전과 같으면 파싱 생략
+                if state.body_unchanged(response.content):
+                    self.stats["unchanged"] += 1
+                    return []
 
             # RSS 파싱
             feed = feedparser.parse(response.text)
@@ -75,8 +105,14 @@ class GoogleNewsRSS:
                         published_dt = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
                         published_iso = published_dt.isoformat()
                     else:
+                        published_dt = None
                         published_iso = datetime.now(timezone.utc).isoformat()
 
+                    # 🔥 이미 본 기사 제외 (검색 결과는 발행순 정렬이 아니므로 중단 대신 건너뜀)
+                    if state is not None and state.is_known(entry.link, published_dt):
+                        self.stats["known"] += 1
+                        continue
+
                     # 콘텐츠 추출 (description 또는 summary)
                     content = ""
                     if hasattr(entry, 'summary'):
@@ -104,6 +140,9 @@ class GoogleNewsRSS:
                     print(f"⚠️ [Google News RSS] 항목 파싱 오류: {str(e)}")
                     continue
 
+            if state is not None:
+                state.record(news_list)
+
             print(f"✅ [Google News RSS] {stock_name}: {len(news_list)}개 수집")
             return news_list
 
@@ -117,32 +156,58 @@ class GoogleNewsRSS:
     async def search_multiple_stocks(
         self,
         stock_names: List[str],
-        results_per_stock: int = 5
-    ) -> List[Dict[str, Any]]:
+        results_per_stock: int = 5,
+        client: Optional[httpx.AsyncClient] = None,
+        state_store: Optional[CrawlStateStore] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, SourceState]]:
         """
-        여러 종목에 대해 뉴스 검색 (중복 제거)
+        여러 종목에 대해 뉴스 동시 검색 (중복 제거)
+
+        🔥 동시 검색 (GOOGLE_NEWS_MAX_CONCURRENCY) + 초당 요청 제한 (GOOGLE_NEWS_REQUESTS_PER_SECOND)
+        🔥 state_store가 있으면 종목별 증분 크롤링 (조건부 요청, 새 기사만 반환)
 
         Args:
             stock_names: 종목명 리스트
             results_per_stock: 종목당 결과 수
+            client: 공유 HTTP 클라이언트 (없으면 이번 호출 동안 생성)
+            state_store: 증분 크롤링 상태 저장소
 
         Returns:
-            List[Dict]: 중복 제거된 뉴스 리스트
+            Tuple[List[Dict], Dict[str, SourceState]]: (중복 제거된 뉴스 리스트, 갱신된 종목별 상태)
+            ⚠️ 상태는 저장하지 않음 - 호출자가 기사 저장 성공 후 state_store.save() 호출
         """
-        all_news = []
-        seen_urls = set()
+        if client is None:
+            limits = httpx.Limits(max_connections=GOOGLE_NEWS_MAX_CONCURRENCY, max_keepalive_connections=GOOGLE_NEWS_MAX_CONCURRENCY)
+            async with httpx.AsyncClient(timeout=10.0, limits=limits) as own_client:
+                return await self.search_multiple_stocks(stock_names, results_per_stock, own_client, state_store)
+
+        semaphore = asyncio.Semaphore(GOOGLE_NEWS_MAX_CONCURRENCY)
+        bucket = TokenBucket(capacity=GOOGLE_NEWS_REQUESTS_PER_SECOND, refill_rate=GOOGLE_NEWS_REQUESTS_PER_SECOND)
+        states = await asyncio.to_thread(state_store.load, self.SOURCE, stock_names) if state_store else {}
+        self.stats = {"not_modified": 0, "unchanged": 0, "known": 0}
 
-        for stock_name in stock_names:
-            news_list = await self.search_stock_news(stock_name, results_per_stock)
+        async def search_one(stock_name: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                await bucket.acquire()
+                return await self.search_stock_news(stock_name, results_per_stock, client, states.get(stock_name))
 
-            # 중복 제거 (URL 기준)
+        results = await asyncio.gather(*[search_one(name) for name in stock_names])
+
+        if state_store:
+            print(f"📊 [Google News RSS] 증분 크롤링: 304 {self.stats['not_modified']}개, 피드 동일 {self.stats['unchanged']}개, "
+                  f"이미 본 기사 {self.stats['known']}개 제외")
+
+        # 중복 제거 (URL 기준, 종목 순서 유지)
+        all_news = []
+        seen_urls = set()
+        for news_list in results:
             for news in news_list:
                 if news["url"] not in seen_urls:
                     seen_urls.add(news["url"])
                     all_news.append(news)
 
         print(f"📊 [Google News RSS] 총 {len(all_news)}개 뉴스 수집 (중복 제거 후)")
-        return all_news
+        return all_news, states
 
 
 # 테스트 코드
@@ -164,7 +229,7 @@ if __name__ == "__main__":
         # 다중 종목 테스트
         print("\n\n=== 다중 종목 테스트 ===")
         stocks = ["삼성전자", "SK하이닉스", "NAVER"]
-        all_news = await crawler.search_multiple_stocks(stocks, results_per_stock=3)
+        all_news, _ = await crawler.search_multiple_stocks(stocks, results_per_stock=3)
         print(f"\n총 {len(all_news)}개 뉴스 수집")
 
     asyncio.run(test())
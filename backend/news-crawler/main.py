@@ -5,18 +5,28 @@
 🔥 Phase 2.1: Google News RSS 추가
 """
 import os
+import json
+import time
+import threading
 from fastapi import FastAPI, HTTPException
-from apscheduler.schedulers.background import BackgroundScheduler
 import asyncio
 from dotenv import load_dotenv
 import httpx
 from datetime import datetime, timedelta, timezone
 from supabase import create_client, Client
 from nlp.ner import StockNER
+from stock_master_index import StockMasterIndex
 from naver_api import NaverNewsAPI
 from google_news_rss import GoogleNewsRSS  # 🔥 Phase 2.1
 from naver_discussion_crawler import NaverDiscussionCrawler  # 🔥 Phase 2.2
 from dart_disclosure_crawler import DartDisclosureCrawler  # 🔥 Phase 2.3
+from news_features import NewsFeatureStore
+from near_duplicate import NearDuplicateIndex, news_fingerprint
+from crawl_state import CrawlStateStore
+from news_store import SeenUrlCache, find_existing_urls, bulk_insert_news, DEDUPE_CHUNK_SIZE, INSERT_CHUNK_SIZE
+from crawl_pipeline import CrawlPipeline, Stage
+from crawl_scheduler import AsyncCrawlScheduler, AdaptiveSchedule, is_market_hours
+from subscription_index import SubscriptionIndex, build_news_alerts, bulk_insert_alerts
 
 load_dotenv()
 
@@ -34,8 +44,15 @@ AI_SERVICE_URL = os.getenv("AI_SERVICE_URL", "http://localhost:3003")
 # 🔥 AI 분석 활성화 여부 (환경 변수로 제어)
 AI_ANALYSIS_ENABLED = os.getenv("AI_ANALYSIS_ENABLED", "true").lower() == "true"
 
-# 종목명 추출기 초기화
-stock_ner = StockNER(supabase)
+# 🔥 AI 서비스 포화(429/503) 시 재시도 설정
+AI_BATCH_MAX_RETRIES = int(os.getenv("AI_BATCH_MAX_RETRIES", "2"))
+AI_BATCH_MAX_BACKOFF = int(os.getenv("AI_BATCH_MAX_BACKOFF", "30"))  # 초
+
+# 🔥 종목 마스터 인덱스 (종목코드/종목명 조회, 변경 시 자동 재로드)
+stock_master_index = StockMasterIndex(lambda: supabase)
+
+# 종목명 추출기 초기화 (종목 마스터 재로드 시 오토마톤 재구성)
+stock_ner = StockNER(supabase, stock_index=stock_master_index)
 
 # 네이버 API 클라이언트 초기화
 naver_api = NaverNewsAPI()
@@ -49,129 +66,149 @@ naver_discussion = NaverDiscussionCrawler()
 # 🔥 Phase 2.3: DART 전자공시 크롤러 초기화
 dart_crawler = DartDisclosureCrawler()
 
+# 🔥 종목별 뉴스 Feature Store (1/3/7일 롤링 집계)
+news_feature_store = NewsFeatureStore(supabase)
+
+# 🔥 유사 뉴스 클러스터링 인덱스 (최근 3일 대표 기사 MinHash)
+near_duplicate_index = NearDuplicateIndex()
+
+# 🔥 최근 처리한 뉴스 URL (DB 중복 조회 생략용)
+seen_urls_cache = SeenUrlCache()
+
+# 🔥 소스/종목별 증분 크롤링 상태 (Redis)
+crawl_state_store = CrawlStateStore()
+
+# 🔥 종목 → 보유/관심 사용자 역인덱스 (추적 종목 + 알림 대상)
+subscription_index = SubscriptionIndex(supabase)
+
+# 🔥 크롤링 주기 (분, 장중 / 장 외) 및 검색용 공유 HTTP 커넥션 풀
+CRAWL_INTERVAL_MINUTES = int(os.getenv("CRAWL_INTERVAL_MINUTES", "5"))
+CRAWL_OFF_HOURS_INTERVAL_MINUTES = int(os.getenv("CRAWL_OFF_HOURS_INTERVAL_MINUTES", "30"))
+DISCUSSION_INTERVAL_MINUTES = int(os.getenv("DISCUSSION_INTERVAL_MINUTES", "15"))
+DISCUSSION_OFF_HOURS_INTERVAL_MINUTES = int(os.getenv("DISCUSSION_OFF_HOURS_INTERVAL_MINUTES", "120"))
+DART_INTERVAL_MINUTES = int(os.getenv("DART_INTERVAL_MINUTES", "30"))
+DART_OFF_HOURS_INTERVAL_MINUTES = int(os.getenv("DART_OFF_HOURS_INTERVAL_MINUTES", "180"))
+SEARCH_HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+
+# 🔥 파이프라인 단계별 워커 수 / AI 분석 배치 크기
+PIPELINE_WORKERS = {
+    "filter": int(os.getenv("CRAWL_FILTER_WORKERS", "2")),
+    "ner": int(os.getenv("CRAWL_NER_WORKERS", "1")),
+    "ai": int(os.getenv("CRAWL_AI_WORKERS", "4")),
+    "persist": int(os.getenv("CRAWL_PERSIST_WORKERS", "1")),
+    "alert": int(os.getenv("CRAWL_ALERT_WORKERS", "2")),
+}
+AI_PIPELINE_BATCH_SIZE = int(os.getenv("CRAWL_AI_BATCH_SIZE", "20"))
+
+# 마지막 사이클 파이프라인 통계 (관리자 조회용)
+last_pipeline_stats: list = []
+
+# 🔥 토론방 / DART 종목별 스냅샷 (Redis, report-service 등에서 조회)
+SNAPSHOT_KEY_PREFIX = "news-crawler:snapshot:"
+SNAPSHOT_CONCURRENCY = 4
+
 # 🔥 스케줄러 전역 변수 (관리자 제어용)
-scheduler: BackgroundScheduler = None
+scheduler: AsyncCrawlScheduler = None
 
 
-async def analyze_news_with_ai(title: str, content: str, symbols: list, url: str) -> dict:
-    """AI 서비스로 뉴스 분석 (URL 포함으로 캐싱 활용)"""
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{AI_SERVICE_URL}/analyze",
-                json={
-                    "title": title,
-                    "content": content,
-                    "symbols": symbols,
-                    "url": url  # 캐싱을 위한 URL 추가
-                }
-            )
+async def _request_ai_batch(articles: list, indices: list) -> tuple:
+    """
+    /analyze/batch 1회 요청
 
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"⚠️ AI 분석 실패 (status {response.status_code})")
-                return None
+    Returns:
+        tuple: ({기사 순번: AI 분석 결과}, 거절된 기사 순번 리스트(429/503), Retry-After 초)
+    """
+    results = {}
+    rejected = []
+    retry_after = 0
+
+    payload = {
+        "articles": [
+            {
+                "title": articles[i]["title"],
+                "content": articles[i]["content"],
+                "symbols": articles[i]["related_symbols"],
+                "url": articles[i]["url"]  # 캐싱을 위한 URL
+            }
+            for i in indices
+        ]
+    }
 
-    except Exception as e:
-        print(f"❌ AI 분석 오류: {str(e)}")
-        return None
+    async with httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=10.0)) as client:
+        async with client.stream("POST", f"{AI_SERVICE_URL}/analyze/batch", json=payload) as response:
+            if response.status_code in (429, 503):
+                # AI 서비스 포화 → 배치 전체 재시도 대상
+                retry_after = int(response.headers.get("Retry-After", "5"))
+                print(f"⏳ AI 서비스 포화 (status {response.status_code}, Retry-After {retry_after}s)")
+                return results, list(indices), retry_after
+
+            if response.status_code != 200:
+                print(f"⚠️ AI 일괄 분석 실패 (status {response.status_code})")
+                return results, rejected, retry_after
 
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
 
-async def create_alerts_for_news(news_data: dict, ai_result: dict):
+                item = json.loads(line)
+                index = indices[item["index"]]
+                if item.get("result"):
+                    results[index] = item["result"]
+                elif item.get("status_code") in (429, 503):
+                    rejected.append(index)
+                    retry_after = max(retry_after, item.get("retry_after", 5))
+                else:
+                    print(f"⚠️ AI 분석 실패: {item.get('url')} - {item.get('error')}")
+
+    return results, rejected, retry_after
+
+
+async def analyze_news_batch_with_ai(articles: list) -> dict:
     """
-    영향도가 높은 뉴스에 대해 관련 종목을 보유/관심 중인 사용자에게 알림 생성
+    AI 서비스 일괄 분석 (/analyze/batch, NDJSON 스트리밍)
+    - 캐시 조회 1회 + 서버 측 동시 분석 (기사별 순차 요청 대체)
+    - 🔥 AI 서비스가 429/503으로 거절한 기사는 Retry-After만큼 대기 후 재시도
 
     Args:
-        news_data: 뉴스 데이터
-        ai_result: AI 분석 결과
+        articles: [{"title", "content", "related_symbols", "url"}]
+
+    Returns:
+        dict: {기사 순번: AI 분석 결과} (실패한 기사는 제외)
     """
+    results = {}
+    pending = list(range(len(articles)))
+
     try:
-        related_symbols = news_data.get("related_symbols", [])
-        if not related_symbols:
-            return
-
-        impact_score = ai_result.get("impact_score", 0)
-        sentiment_score = ai_result.get("sentiment_score", 0)
-        recommended_action = ai_result.get("recommended_action", "hold")
-
-        # 1. 해당 종목을 보유/관심 중인 사용자 조회
-        portfolio_users = supabase.table("portfolios") \
-            .select("user_id") \
-            .in_("symbol", related_symbols) \
-            .execute()
+        for attempt in range(AI_BATCH_MAX_RETRIES + 1):
+            if not pending:
+                break
 
-        watchlist_users = supabase.table("watchlist") \
-            .select("user_id") \
-            .in_("symbol", related_symbols) \
-            .execute()
+            batch_results, pending, retry_after = await _request_ai_batch(articles, pending)
+            results.update(batch_results)
 
-        # 사용자 ID 중복 제거
-        user_ids = set()
-        if portfolio_users.data:
-            user_ids.update([item["user_id"] for item in portfolio_users.data])
-        if watchlist_users.data:
-            user_ids.update([item["user_id"] for item in watchlist_users.data])
-
-        if not user_ids:
-            print(f"   ℹ️ 관련 사용자 없음 (종목: {related_symbols})")
-            return
-
-        # 2. 각 사용자에게 알림 생성
-        alerts = []
-        for user_id in user_ids:
-            # 감성에 따른 이모지
-            emoji = "📈" if sentiment_score > 0 else "📉" if sentiment_score < 0 else "📊"
-
-            # 권고에 따른 액션 텍스트
-            action_text = {
-                "buy": "매수 검토",
-                "sell": "매도 검토",
-                "hold": "관망 권장"
-            }.get(recommended_action, "정보 확인")
-
-            alert = {
-                "user_id": user_id,
-                "type": "news",
-                "title": f"{emoji} 중요 뉴스 ({', '.join(related_symbols[:3])})",
-                "message": f"{news_data['title'][:100]}... [{action_text}]",
-                "params": {
-                    "news_url": news_data.get("url"),
-                    "impact_score": impact_score,
-                    "sentiment_score": sentiment_score,
-                    "recommended_action": recommended_action,
-                    "related_symbols": related_symbols,
-                },
-                "status": "unread",
-            }
-            alerts.append(alert)
+            if pending and attempt < AI_BATCH_MAX_RETRIES:
+                wait_seconds = min(retry_after, AI_BATCH_MAX_BACKOFF)
+                print(f"⏳ AI 분석 거절 {len(pending)}개 - {wait_seconds}초 후 재시도 ({attempt + 1}/{AI_BATCH_MAX_RETRIES})")
+                await asyncio.sleep(wait_seconds)
 
-        # 3. 배치 삽입
-        if alerts:
-            supabase.table("alerts").insert(alerts).execute()
-            print(f"   🔔 알림 생성 완료: {len(alerts)}명 사용자")
+        if pending:
+            print(f"⚠️ AI 분석 거절로 미분석 저장: {len(pending)}개")
 
     except Exception as e:
-        print(f"❌ 알림 생성 오류: {str(e)}")
+        print(f"❌ AI 일괄 분석 오류: {str(e)}")
+
+    print(f"🤖 AI 일괄 분석 완료: {len(results)}/{len(articles)}개 성공")
+    return results
 
 
 async def get_user_tracked_stocks() -> list:
-    """모든 사용자의 보유 종목 + 관심 종목 조회 (중복 제거)"""
+    """모든 사용자의 보유 종목 + 관심 종목 조회 (중복 제거, 사이클당 1회 역인덱스 갱신)"""
     try:
-        # 1. 보유 종목 조회
-        portfolio_result = supabase.table("portfolios") \
-            .select("symbol") \
-            .execute()
-
-        # 2. 관심 종목 조회
-        watchlist_result = supabase.table("watchlist") \
-            .select("symbol") \
-            .execute()
-
-        # 3. 종목 코드 합치고 중복 제거
-        portfolio_symbols = {item["symbol"] for item in (portfolio_result.data or [])}
-        watchlist_symbols = {item["symbol"] for item in (watchlist_result.data or [])}
-        all_symbols = portfolio_symbols | watchlist_symbols  # 집합 합집합 (중복 자동 제거)
+        # 1~3. 보유 + 관심 종목 전체 로드 → 종목별 사용자 역인덱스 재구성 (알림 대상 조회에도 사용)
+        await asyncio.to_thread(subscription_index.refresh)
+        portfolio_symbols = subscription_index.portfolio_symbols
+        watchlist_symbols = subscription_index.watchlist_symbols
+        all_symbols = subscription_index.symbols
 
         if not all_symbols:
             print("⚠️ 사용자의 보유/관심 종목이 없습니다. 기본 종목 사용")
@@ -183,16 +220,13 @@ async def get_user_tracked_stocks() -> list:
                 {"symbol": "051910", "name": "LG화학"},
             ]
 
-        # 4. stock_master에서 종목명 조회
-        symbols_list = list(all_symbols)
-        stock_master_result = supabase.table("stock_master") \
-            .select("symbol, name") \
-            .in_("symbol", symbols_list) \
-            .execute()
+        # 4. 종목 마스터 인덱스에서 종목명 조회 (DB 호출 없음)
+        await asyncio.to_thread(stock_master_index.refresh_if_stale)
+        tracked_stocks = stock_master_index.lookup_many(sorted(all_symbols))
 
-        if stock_master_result.data:
-            print(f"📊 사용자 추적 종목 {len(stock_master_result.data)}개 조회 완료 (보유 {len(portfolio_symbols)}개 + 관심 {len(watchlist_symbols)}개)")
-            return [{"symbol": item["symbol"], "name": item["name"]} for item in stock_master_result.data]
+        if tracked_stocks:
+            print(f"📊 사용자 추적 종목 {len(tracked_stocks)}개 조회 완료 (보유 {len(portfolio_symbols)}개 + 관심 {len(watchlist_symbols)}개)")
+            return [{"symbol": item["symbol"], "name": item["name"]} for item in tracked_stocks]
         else:
             print("⚠️ stock_master에서 종목 정보를 찾을 수 없습니다. 기본 종목 사용")
             return [
@@ -214,6 +248,44 @@ async def get_user_tracked_stocks() -> list:
         ]
 
 
+def warm_up_near_duplicate_index():
+    """DB 최근 3일 뉴스로 유사 뉴스 인덱스 초기화 (프로세스 시작 후 1회)"""
+    try:
+        since = (datetime.now(timezone.utc) - timedelta(days=near_duplicate_index.retention_days)).isoformat()
+        result = supabase.table("news") \
+            .select("url, title, content, published_at, related_symbols, duplicate_urls") \
+            .gte("published_at", since) \
+            .order("published_at", desc=True) \
+            .limit(5000) \
+            .execute()
+
+        near_duplicate_index.warm_up(result.data or [])
+        print(f"🧬 유사 뉴스 인덱스 초기화: 대표 기사 {len(near_duplicate_index)}개")
+
+    except Exception as e:
+        print(f"⚠️ 유사 뉴스 인덱스 초기화 실패: {str(e)}")
+
+
+def link_duplicates_to_existing(cluster_links: dict):
+    """
+    이전 사이클에 저장된 대표 기사에 중복 URL 연결
+
+    Args:
+        cluster_links: {대표 기사 URL: [중복 URL]}
+    """
+    if not cluster_links:
+        return
+
+    try:
+        # 🔥 기존 duplicate_urls와 병합 (RPC 1회, 대표 기사별 UPDATE 없음)
+        linked = supabase.rpc("link_news_duplicates", {"p_links": cluster_links}).execute().data
+
+        print(f"🔗 기존 대표 기사 {linked or 0}개에 유사 뉴스 연결")
+
+    except Exception as e:
+        print(f"⚠️ 유사 뉴스 연결 실패: {str(e)}")
+
+
 async def crawl_news():
     """🔥 Phase 2.1: 네이버 API + Google News RSS 뉴스 크롤링"""
     print(f"[{datetime.now()}] 멀티 소스 뉴스 크롤링 시작...")
@@ -224,106 +296,180 @@ async def crawl_news():
 
     print(f"🎯 사용자 추적 종목: {len(stock_names)}개")
 
-    # 2. 네이버 API로 종목별 뉴스 검색 (종목당 10개)
-    naver_news = []
-    try:
-        naver_news = await naver_api.search_multiple_stocks(
-            stock_names=stock_names,
-            results_per_stock=10
-        )
-
-        print(f"📰 [Naver] {len(naver_news)}개 뉴스 수집 (중복 제거 후)")
-
-        # API 사용량 로깅
-        api_calls = len(stock_names) * 10
-        print(f"📊 [Naver] API 호출 수: {api_calls}개 (일일 한도: 25,000)")
-
-    except Exception as e:
-        print(f"⚠️ [Naver] API 호출 오류: {str(e)}")
-
-    # 🔥 Phase 2.1: Google News RSS로 추가 뉴스 검색 (종목당 5개)
-    google_news_list = []
-    try:
-        google_news_list = await google_news.search_multiple_stocks(
-            stock_names=stock_names,
-            results_per_stock=5
-        )
+    # 🔥 소스별 증분 크롤링 상태 (기사 저장까지 성공한 경우에만 사이클 종료 후 저장)
+    source_states = {}
 
-        print(f"📰 [Google News] {len(google_news_list)}개 뉴스 수집 (중복 제거 후)")
+    # 2. 네이버 API (종목당 10개) + Google News RSS (종목당 5개) 동시 검색
+    async def fetch_naver(http_client: httpx.AsyncClient) -> list:
+        try:
+            news, source_states[naver_api.SOURCE] = await naver_api.search_multiple_stocks(
+                stock_names=stock_names,
+                results_per_stock=10,
+                client=http_client,
+                interval_minutes=CRAWL_INTERVAL_MINUTES,
+                state_store=crawl_state_store
+            )
 
-    except Exception as e:
-        print(f"⚠️ [Google News] RSS 크롤링 오류: {str(e)}")
+            print(f"📰 [Naver] {len(news)}개 새 뉴스 수집 (중복 제거 후)")
 
-    # 3. 두 소스 병합 및 URL 기준 중복 제거
-    all_news = naver_news + google_news_list
-    seen_urls = set()
-    unique_news = []
+            # API 사용량 로깅
+            print(f"📊 [Naver] API 호출 수: {naver_api.last_call_count}개 (오늘 남은 한도: {naver_api.quota.remaining:,})")
+            return news
 
-    for news in all_news:
-        if news["url"] not in seen_urls:
-            seen_urls.add(news["url"])
-            unique_news.append(news)
+        except Exception as e:
+            print(f"⚠️ [Naver] API 호출 오류: {str(e)}")
+            return []
 
-    all_news = unique_news
-    print(f"📊 [통합] 총 {len(all_news)}개 뉴스 (Naver + Google News, 중복 제거 후)")
+    # 🔥 Phase 2.1: Google News RSS로 추가 뉴스 검색
+    async def fetch_google(http_client: httpx.AsyncClient) -> list:
+        try:
+            news, source_states[google_news.SOURCE] = await google_news.search_multiple_stocks(
+                stock_names=stock_names,
+                results_per_stock=5,
+                client=http_client,
+                state_store=crawl_state_store
+            )
 
-    if not all_news:
-        print("⚠️ 수집된 뉴스가 없습니다.")
-        return
+            print(f"📰 [Google News] {len(news)}개 새 뉴스 수집 (중복 제거 후)")
+            return news
 
-    # 3. 각 뉴스 처리
-    new_count = 0
-    duplicate_count = 0
-    old_news_count = 0
+        except Exception as e:
+            print(f"⚠️ [Google News] RSS 크롤링 오류: {str(e)}")
+            return []
+
+    # 🔥 파이프라인 단계별 통계
+    counts = {"collected": 0, "duplicate": 0, "near_duplicate": 0, "old": 0, "saved": 0, "save_failed": 0}
+    alerts = []  # 사이클 종료 후 일괄 저장
+    db_calls = [0]
+    cluster_links = {}  # {대표 기사 URL: [유사 뉴스 URL]}
+    state_lock = threading.Lock()  # 필터/NER/저장 단계는 스레드에서 실행
+    cluster_lock = threading.Lock()  # 유사 뉴스 조회 → 대표 등록을 원자적으로 (NER 워커 여러 개일 때)
+    new_representatives = set()  # 이번 사이클에 인덱스에 등록한 대표 기사 URL
+    persisted_urls = set()  # 이번 사이클에 실제로 저장된 URL
 
     # 3일 이전 시간 계산 (최신 뉴스 위주)
     # UTC timezone aware datetime 사용
     cutoff_time = datetime.now(timezone.utc) - timedelta(days=3)
 
-    for news_item in all_news:
-        try:
-            # 발행 시간 체크 (3일 이내만 처리)
-            published_at = datetime.fromisoformat(news_item["published_at"].replace('Z', '+00:00'))
-            if published_at < cutoff_time:
-                old_news_count += 1
+    # 🔥 유사 뉴스 인덱스 준비 (최초 1회 DB 로드 + 오래된 항목 정리)
+    if not near_duplicate_index.warmed:
+        await asyncio.to_thread(warm_up_near_duplicate_index)
+    near_duplicate_index.prune()
+
+    # 3. [수집] 두 소스를 동시에 검색, 먼저 끝난 소스부터 파이프라인에 투입 (URL 기준 중복 제거)
+    async def fetch_sources(emit):
+        seen_urls = set()
+        async with httpx.AsyncClient(timeout=10.0, limits=SEARCH_HTTP_LIMITS) as http_client:
+            for source in asyncio.as_completed([fetch_naver(http_client), fetch_google(http_client)]):
+                for news in await source:
+                    if news["url"] in seen_urls:
+                        continue
+                    seen_urls.add(news["url"])
+                    counts["collected"] += 1
+                    await emit(news)
+        print(f"⏱️ 뉴스 검색 소요: {time.monotonic() - crawl_started:.1f}초 ({len(stock_names)}개 종목)")
+
+    # 4. [필터] 발행 시간 / 최근 처리 URL / 유사 뉴스 연결 여부 + 청크 단위 DB 중복 체크
+    def filter_stage(batch: list) -> list:
+        fresh_news = []
+        for news_item in batch:
+            try:
+                # 발행 시간 체크 (3일 이내만 처리)
+                published_at = datetime.fromisoformat(news_item["published_at"].replace('Z', '+00:00'))
+                if published_at < cutoff_time:
+                    with state_lock:
+                        counts["old"] += 1
+                    continue
+
+                # 최근 사이클에서 이미 저장/확인된 URL 또는 대표 기사에 연결된 유사 뉴스
+                if news_item["url"] in seen_urls_cache or near_duplicate_index.representative_of(news_item["url"]):
+                    with state_lock:
+                        counts["duplicate"] += 1
+                    continue
+
+                news_item["_published_at"] = published_at
+                fresh_news.append(news_item)
+
+            except Exception as e:
+                print(f"❌ 뉴스 처리 오류: {str(e)}")
                 continue
 
-            # 중복 체크 (URL 기준)
-            existing = supabase.table("news").select("id").eq("url", news_item["url"]).execute()
-
-            if existing.data:
-                duplicate_count += 1
-                continue
+        if not fresh_news:
+            return []
 
-            title = news_item["title"]
-            content = news_item["content"]
-            url = news_item["url"]
-
-            # 4. NER로 종목 코드 추출 및 검증
-            full_text = f"{title} {content}"
-            related_symbols = stock_ner.extract_symbols(full_text)
-
-            print(f"\n📰 새 뉴스: {title[:50]}...")
-            print(f"   URL: {url}")
-            print(f"   NER 추출 종목: {related_symbols}")
-
-            # 5. AI 분석 요청 (환경 변수로 제어)
-            ai_result = None
-            if AI_ANALYSIS_ENABLED:
-                ai_result = await analyze_news_with_ai(title, content, related_symbols, url)
-            else:
-                print(f"   ⏸️ AI 분석 비활성화됨 (AI_ANALYSIS_ENABLED=false)")
-
-            # 6. Supabase에 저장
-            news_data = {
-                "source": news_item["source"],
-                "title": title,
-                "content": content,
-                "url": url,
-                "published_at": news_item["published_at"],
-                "related_symbols": related_symbols,
-            }
+        try:
+            existing_urls, calls = find_existing_urls(supabase, [item["url"] for item in fresh_news])
+            with state_lock:
+                db_calls[0] += calls
+        except Exception as e:
+            print(f"⚠️ 중복 URL 조회 실패: {str(e)}")
+            existing_urls = set()
+
+        seen_urls_cache.add_many(existing_urls)
+        with state_lock:
+            counts["duplicate"] += sum(1 for item in fresh_news if item["url"] in existing_urls)
+        return [item for item in fresh_news if item["url"] not in existing_urls]
+
+    # 5. [NER] 종목 추출 + 유사 뉴스 클러스터링 (CPU 작업 → 스레드에서 실행)
+    def ner_stage(batch: list) -> list:
+        candidates = []
+        for news_item in batch:
+            try:
+                title = news_item["title"]
+                content = news_item["content"]
+                url = news_item["url"]
+
+                # NER로 종목 코드 추출 및 검증
+                full_text = f"{title} {content}"
+                related_symbols = stock_ner.extract_symbols(full_text)
+
+                # 🔥 유사 뉴스 체크 (MinHash + 종목 집합 일치) → 대표 기사에 URL만 연결
+                fingerprint = news_fingerprint(title, content)
+                with cluster_lock:
+                    representative_url = (
+                        near_duplicate_index.find(fingerprint, related_symbols, url) if fingerprint is not None else None
+                    )
+                    if representative_url:
+                        near_duplicate_index.link(url, representative_url)
+                    elif fingerprint is not None:
+                        near_duplicate_index.add(fingerprint, url, news_item["_published_at"], related_symbols)
+                        new_representatives.add(url)
+
+                if representative_url:
+                    with state_lock:
+                        counts["near_duplicate"] += 1
+                        cluster_links.setdefault(representative_url, []).append(url)
+                    print(f"🧬 유사 뉴스 → 대표 기사 연결: {title[:50]}...")
+                    continue
+
+                print(f"\n📰 새 뉴스: {title[:50]}...")
+                print(f"   URL: {url}")
+                print(f"   NER 추출 종목: {related_symbols}")
+
+                candidates.append({
+                    "source": news_item["source"],
+                    "title": title,
+                    "content": content,
+                    "url": url,
+                    "published_at": news_item["published_at"],
+                    "related_symbols": related_symbols,
+                })
 
+            except Exception as e:
+                print(f"❌ 뉴스 처리 오류: {str(e)}")
+                continue
+        return candidates
+
+    # 6. [AI] 배치 단위 일괄 분석 (환경 변수로 제어) → (뉴스, AI 결과)
+    async def ai_stage(batch: list) -> list:
+        ai_results = await analyze_news_batch_with_ai(batch) if AI_ANALYSIS_ENABLED else {}
+        return [(news_data, ai_results.get(index)) for index, news_data in enumerate(batch)]
+
+    # 7. [저장] url 기준 upsert (청크 단위)
+    def persist_stage(batch: list) -> list:
+        ai_results_by_url = {}
+        rows = []
+        for news_data, ai_result in batch:
             # AI 분석 결과 추가
             if ai_result:
                 news_data.update({
@@ -332,50 +478,181 @@ async def crawl_news():
                     "impact_score": ai_result.get("impact_score"),
                     "recommended_action": ai_result.get("recommended_action"),
                 })
-                print(f"   AI 분석 완료 - 영향도: {ai_result.get('impact_score'):.2f}, 감정: {ai_result.get('sentiment_score'):.2f}, 권고: {ai_result.get('recommended_action')}")
-
-            # DB 저장
-            result = supabase.table("news").insert(news_data).execute()
-            new_count += 1
-            print(f"✅ 뉴스 저장 완료")
+                ai_results_by_url[news_data["url"]] = ai_result
+
+            # 이미 발견된 유사 뉴스 URL 연결 (이후 발견분은 사이클 종료 후 연결)
+            with state_lock:
+                news_data["duplicate_urls"] = cluster_links.pop(news_data["url"], [])
+            rows.append(news_data)
+
+        saved_news, calls, failed = bulk_insert_news(supabase, rows)
+        with state_lock:
+            db_calls[0] += calls
+            counts["saved"] += len(saved_news)
+            counts["save_failed"] += failed
+            persisted_urls.update(news_data["url"] for news_data in saved_news)
+        seen_urls_cache.add_many(news_data["url"] for news_data in saved_news)
+        print(f"✅ 뉴스 저장 완료: {len(saved_news)}개 (DB 호출 {calls}회)")
+        return [(news_data, ai_results_by_url.get(news_data["url"])) for news_data in saved_news]
+
+    # 8. [알림] 영향도 기반 알림 생성 (impact_score >= 0.7, 역인덱스 조회) + 종목별 집계 누적
+    def alert_stage(batch: list) -> list:
+        for news_data, ai_result in batch:
+            news_feature_store.record(news_data)
+            if not ai_result or ai_result.get("impact_score", 0) < 0.7:
+                continue
 
-            # 7. 영향도 기반 알림 생성 (impact_score >= 0.7)
-            if ai_result and ai_result.get("impact_score", 0) >= 0.7:
-                await create_alerts_for_news(news_data, ai_result)
+            related_symbols = news_data.get("related_symbols", [])
+            user_ids = subscription_index.users_for(related_symbols)
+            if not user_ids:
+                print(f"   ℹ️ 관련 사용자 없음 (종목: {related_symbols})")
+                continue
 
-        except Exception as e:
-            print(f"❌ 뉴스 처리 오류: {str(e)}")
-            continue
+            alerts.extend(build_news_alerts(user_ids, news_data, ai_result))
+        return []
 
-    print(f"\n[{datetime.now()}] 멀티 소스 뉴스 크롤링 완료 (Naver + Google News)")
-    print(f"📈 통계: 신규 {new_count}개, 중복 {duplicate_count}개, 3일 이전 {old_news_count}개\n")
+    if not AI_ANALYSIS_ENABLED:
+        print(f"   ⏸️ AI 분석 비활성화됨 (AI_ANALYSIS_ENABLED=false)")
 
+    pipeline = CrawlPipeline([
+        Stage("필터", filter_stage, workers=PIPELINE_WORKERS["filter"], batch_size=DEDUPE_CHUNK_SIZE, blocking=True),
+        Stage("NER", ner_stage, workers=PIPELINE_WORKERS["ner"], batch_size=20, blocking=True),
+        Stage("AI", ai_stage, workers=PIPELINE_WORKERS["ai"], batch_size=AI_PIPELINE_BATCH_SIZE),
+        Stage("저장", persist_stage, workers=PIPELINE_WORKERS["persist"], batch_size=INSERT_CHUNK_SIZE, blocking=True),
+        Stage("알림", alert_stage, workers=PIPELINE_WORKERS["alert"]),
+    ])
 
-def crawl_news_sync():
-    """동기 wrapper 함수 - 스케줄러에서 호출"""
-    # 새 이벤트 루프 생성 및 실행
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    crawl_started = time.monotonic()
     try:
-        loop.run_until_complete(crawl_news())
+        await pipeline.run(fetch_sources)
     finally:
-        loop.close()
+        # 🔥 저장되지 않은 대표 기사는 인덱스에서 제거 (남겨두면 다음 사이클 재수집 시 자기 자신/연결 URL이 중복으로 걸러져 유실)
+        unsaved = new_representatives - persisted_urls
+        if unsaved:
+            near_duplicate_index.remove(unsaved)
+            for url in unsaved:
+                cluster_links.pop(url, None)
+            print(f"🧬 미저장 대표 기사 {len(unsaved)}개 유사 뉴스 인덱스에서 제거")
+
+    global last_pipeline_stats
+    last_pipeline_stats = pipeline.get_stats()
+
+    # 🔥 증분 크롤링 상태는 수집 기사가 모두 저장 단계까지 처리된 경우에만 저장
+    #    (저장 실패/단계 오류/사이클 중단 시 미저장 → 다음 사이클에 같은 기사 재수집, DB 중복 체크로 걸러짐)
+    stage_failures = sum(stats["failed"] for stats in last_pipeline_stats if stats["stage"] != "알림")
+    if counts["save_failed"] or stage_failures:
+        print(f"⚠️ 저장 실패 {counts['save_failed']}개 / 단계 오류 {stage_failures}개 - 크롤링 상태 미저장 (다음 사이클 재수집)")
+    else:
+        for source, states in source_states.items():
+            await asyncio.to_thread(crawl_state_store.save, source, states)
+
+    # 알림 일괄 저장
+    if alerts:
+        saved_alerts, calls = await asyncio.to_thread(bulk_insert_alerts, supabase, alerts)
+        db_calls[0] += calls
+        print(f"🔔 알림 생성 완료: {saved_alerts}개 (DB 호출 {calls}회)")
+
+    # 이전 사이클 대표 기사 + 저장 이후 발견된 유사 뉴스 연결
+    await asyncio.to_thread(link_duplicates_to_existing, cluster_links)
+
+    # 9. 종목별 뉴스 집계 일괄 갱신
+    await asyncio.to_thread(news_feature_store.flush)
+
+    print(f"\n[{datetime.now()}] 멀티 소스 뉴스 크롤링 완료 (Naver + Google News)")
+    print(f"📈 통계: 수집 {counts['collected']}개, 신규 {counts['saved']}개, 중복 {counts['duplicate']}개, "
+          f"유사 뉴스 {counts['near_duplicate']}개, 3일 이전 {counts['old']}개")
+    pipeline.print_stats()
+    print(f"⏱️ 총 {time.monotonic() - crawl_started:.1f}초 (중복확인/저장 DB 호출 {db_calls[0]}회)\n")
+
+
+def save_snapshot(kind: str, symbol: str, data: dict, ttl_minutes: int):
+    """종목별 스냅샷 Redis 저장 (다음 주기 + 여유분까지 유지)"""
+    key = f"{SNAPSHOT_KEY_PREFIX}{kind}:{symbol}"
+    payload = {**data, "symbol": symbol, "updated_at": datetime.now(timezone.utc).isoformat()}
+    scheduler.redis_client.setex(key, ttl_minutes * 60 * 2, json.dumps(payload, ensure_ascii=False))
+
+
+async def crawl_discussions():
+    """🔥 Phase 2.2: 추적 종목 토론방 투자 심리 수집 → Redis 스냅샷"""
+    tracked_stocks = await get_user_tracked_stocks()
+    print(f"[{datetime.now()}] 토론방 크롤링 시작 ({len(tracked_stocks)}개 종목)")
+
+    # 공유 세션으로 전체 종목 동시 크롤링 (종목별 마지막 게시글 이후만 조회)
+    discussions_by_symbol = await naver_discussion.crawl_many([stock["symbol"] for stock in tracked_stocks], days=1, limit=40)
+
+    saved = 0
+    for symbol, discussions in discussions_by_symbol.items():
+        try:
+            sentiment = await naver_discussion.analyze_sentiment_from_discussions(discussions)
+            await asyncio.to_thread(save_snapshot, "discussion", symbol, sentiment, DISCUSSION_OFF_HOURS_INTERVAL_MINUTES)
+            saved += 1
+        except Exception as e:
+            print(f"⚠️ 토론방 스냅샷 저장 실패 ({symbol}): {str(e)}")
+    print(f"✅ 토론방 심리 스냅샷 저장: {saved}/{len(tracked_stocks)}개 종목")
+
+
+async def crawl_disclosures():
+    """🔥 Phase 2.3: 추적 종목 DART 공시 영향도 수집 → Redis 스냅샷"""
+    tracked_stocks = await get_user_tracked_stocks()
+    semaphore = asyncio.Semaphore(SNAPSHOT_CONCURRENCY)
+    print(f"[{datetime.now()}] DART 공시 크롤링 시작 ({len(tracked_stocks)}개 종목)")
+
+    async def crawl_one(stock: dict) -> bool:
+        async with semaphore:
+            corp_code = await dart_crawler.get_corp_code(stock["symbol"])
+            if not corp_code:
+                return False
+            disclosures = await dart_crawler.crawl_disclosures(corp_code, days=7, limit=20)
+            impact = await dart_crawler.analyze_disclosure_impact(disclosures)
+        await asyncio.to_thread(save_snapshot, "dart", stock["symbol"], impact, DART_OFF_HOURS_INTERVAL_MINUTES)
+        return True
+
+    results = await asyncio.gather(*[crawl_one(stock) for stock in tracked_stocks], return_exceptions=True)
+    print(f"✅ DART 공시 스냅샷 저장: {sum(1 for r in results if r is True)}/{len(tracked_stocks)}개 종목")
 
 
 @app.on_event("startup")
 async def startup_event():
-    """앱 시작 시 스케줄러 실행"""
+    """앱 시작 시 스케줄러 실행 (앱 이벤트 루프에서 동작, 시작 직후 1회 실행)"""
     global scheduler
-    scheduler = BackgroundScheduler()
-    # 5분마다 뉴스 크롤링
-    scheduler.add_job(crawl_news_sync, 'interval', minutes=5)
+    scheduler = AsyncCrawlScheduler()
+
+    scheduler.add_job(
+        "news", "멀티 소스 뉴스 크롤링", crawl_news,
+        AdaptiveSchedule(CRAWL_INTERVAL_MINUTES, CRAWL_OFF_HOURS_INTERVAL_MINUTES)
+    )
+
+    # 토론방 / DART 스냅샷은 Redis에 저장 → Redis 없으면 등록 생략
+    if scheduler.redis_client is not None:
+        scheduler.add_job(
+            "discussions", "토론방 투자 심리", crawl_discussions,
+            AdaptiveSchedule(DISCUSSION_INTERVAL_MINUTES, DISCUSSION_OFF_HOURS_INTERVAL_MINUTES)
+        )
+        scheduler.add_job(
+            "dart", "DART 공시", crawl_disclosures,
+            AdaptiveSchedule(DART_INTERVAL_MINUTES, DART_OFF_HOURS_INTERVAL_MINUTES)
+        )
+    else:
+        print("ℹ️ Redis 미연결 - 토론방/DART 스냅샷 작업 비활성화")
+
+    # DART 기업 코드 인덱스는 레플리카별 로컬 파일 → 리스 없이 레플리카마다 갱신
+    scheduler.add_job(
+        "dart_corp_codes", "DART 기업 코드 인덱스", dart_crawler.refresh_corp_codes,
+        AdaptiveSchedule(24 * 60, 24 * 60), exclusive=False
+    )
+
     scheduler.start()
-    print("📰 News Crawler Scheduler started (every 5 minutes)")
+    for job in scheduler.get_jobs():
+        print(f"📰 스케줄 등록: {job.name} ({job.schedule.describe()})")
+    print(f"🕘 현재 {'장중' if is_market_hours() else '장 외'} 주기 적용")
     print(f"🤖 AI 분석: {'✅ 활성화' if AI_ANALYSIS_ENABLED else '⏸️ 비활성화'}")
 
-    # 시작 시 즉시 한 번 실행
-    print("🚀 초기 크롤링 실행...")
-    asyncio.create_task(crawl_news())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """앱 종료 시 스케줄러 정리 (실행 중인 작업 취소 + 리스 해제)"""
+    if scheduler is not None:
+        await scheduler.shutdown()
 
 
 @app.get("/health")
@@ -385,8 +662,12 @@ async def health():
 
 @app.post("/crawl")
 async def trigger_crawl():
-    """수동 크롤링 트리거"""
-    await crawl_news()
+    """수동 크롤링 트리거 (실행 중이면 409)"""
+    if scheduler is None:
+        raise HTTPException(status_code=500, detail="Scheduler not initialized")
+
+    if not await scheduler.run_now("news"):
+        raise HTTPException(status_code=409, detail="Crawling already in progress")
     return {"message": "Crawling triggered"}
 
 
@@ -436,7 +717,7 @@ async def get_scheduler_status():
             "jobs": []
         }
 
-    # APScheduler 상태: 0=stopped, 1=running, 2=paused
+    # 스케줄러 상태: 0=stopped, 1=running, 2=paused
     state_map = {0: "stopped", 1: "running", 2: "paused"}
     state_code = scheduler.state
     status = state_map.get(state_code, "unknown")
@@ -444,17 +725,16 @@ async def get_scheduler_status():
     # 등록된 job 목록
     jobs = []
     for job in scheduler.get_jobs():
-        jobs.append({
-            "id": job.id,
-            "name": job.name,
-            "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None
-        })
+        jobs.append(job.get_status())
 
     return {
         "status": status,
         "state": state_code,
         "jobs": jobs,
-        "ai_analysis_enabled": AI_ANALYSIS_ENABLED
+        "market_hours": is_market_hours(),
+        "distributed_lease": scheduler.redis_client is not None,
+        "ai_analysis_enabled": AI_ANALYSIS_ENABLED,
+        "last_pipeline_stats": last_pipeline_stats
     }
 
 
@@ -2,14 +2,25 @@
 네이버 뉴스 검색 API 클라이언트
 """
 import os
+import asyncio
 import httpx
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
+from rate_limiter import TokenBucket, DailyQuota
+from crawl_state import SourceState, CrawlStateStore
+
+# 🔥 동시 검색 설정 (환경 변수로 조정)
+NAVER_MAX_CONCURRENCY = int(os.getenv("NAVER_MAX_CONCURRENCY", "10"))
+NAVER_REQUESTS_PER_SECOND = float(os.getenv("NAVER_REQUESTS_PER_SECOND", "10"))
+NAVER_DAILY_QUOTA = int(os.getenv("NAVER_DAILY_QUOTA", "25000"))  # 검색 API 일일 한도
+NAVER_MAX_PAGES = int(os.getenv("NAVER_MAX_PAGES", "3"))  # 증분 크롤링 시 종목당 최대 페이지 수
 
 
 class NaverNewsAPI:
     """네이버 뉴스 검색 API 클래스"""
 
+    SOURCE = "naver"
+
     def __init__(self):
         self.client_id = os.getenv("NAVER_CLIENT_ID")
         self.client_secret = os.getenv("NAVER_CLIENT_SECRET")
@@ -18,12 +29,20 @@ class NaverNewsAPI:
         if not self.client_id or not self.client_secret:
             raise ValueError("네이버 API 키가 설정되지 않았습니다. .env 파일을 확인하세요.")
 
+        # 일일 한도 (사이클 간 유지) + 한도 초과 시 종목 순환 위치
+        self.quota = DailyQuota(NAVER_DAILY_QUOTA)
+        self._rotation_offset = 0
+        self.last_call_count = 0  # 직전 다중 검색 API 호출 수
+        self._extra_page_calls = 0  # 증분 크롤링 추가 페이지 호출 수
+        self.stats = {"known": 0, "stopped_early": 0}  # 직전 다중 검색 증분 통계
+
     async def search_news(
         self,
         query: str,
         display: int = 10,
         start: int = 1,
-        sort: str = "date"
+        sort: str = "date",
+        client: Optional[httpx.AsyncClient] = None
     ) -> Optional[List[Dict]]:
         """
         네이버 뉴스 검색
@@ -33,6 +52,7 @@ class NaverNewsAPI:
             display: 검색 결과 출력 건수 (최대 100)
             start: 검색 시작 위치 (최대 1000)
             sort: 정렬 옵션 (date: 날짜순, sim: 정확도순)
+            client: 공유 HTTP 클라이언트 (없으면 요청마다 생성)
 
         Returns:
             뉴스 아이템 리스트
@@ -50,20 +70,19 @@ class NaverNewsAPI:
                 "sort": sort,
             }
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    self.base_url,
-                    headers=headers,
-                    params=params
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("items", [])
-                else:
-                    print(f"⚠️ 네이버 API 오류: {response.status_code}")
-                    print(f"   응답: {response.text}")
-                    return None
+            if client is None:
+                async with httpx.AsyncClient(timeout=10.0) as own_client:
+                    response = await own_client.get(self.base_url, headers=headers, params=params)
+            else:
+                response = await client.get(self.base_url, headers=headers, params=params)
+
+            if response.status_code == 200:
+                data = response.json()
+                return data.get("items", [])
+            else:
+                print(f"⚠️ 네이버 API 오류: {response.status_code}")
+                print(f"   응답: {response.text}")
+                return None
 
         except Exception as e:
             print(f"❌ 네이버 API 호출 오류: {str(e)}")
@@ -122,14 +141,23 @@ class NaverNewsAPI:
     async def search_stock_news(
         self,
         stock_name: str,
-        max_results: int = 10
+        max_results: int = 10,
+        client: Optional[httpx.AsyncClient] = None,
+        state: Optional[SourceState] = None,
+        bucket: Optional[TokenBucket] = None
     ) -> List[Dict]:
         """
         특정 종목 관련 뉴스 검색
 
+        🔥 state가 있으면 증분 크롤링: 날짜순 결과에서 이미 본 기사에 도달하면 중단,
+           한 페이지가 모두 새 기사면 다음 페이지 조회 (최대 NAVER_MAX_PAGES, 일일 한도 차감)
+
         Args:
             stock_name: 종목명 (예: "삼성전자", "SK하이닉스")
-            max_results: 최대 결과 수 (기본값 10개)
+            max_results: 최대 결과 수 (기본값 10개, 증분 크롤링 시 페이지 크기)
+            client: 공유 HTTP 클라이언트
+            state: 증분 크롤링 상태
+            bucket: 초당 요청 제한 (있으면 페이지 요청마다 토큰 1개 소비)
 
         Returns:
             파싱된 뉴스 리스트
@@ -137,51 +165,123 @@ class NaverNewsAPI:
         # 검색어 최적화 - 최신 뉴스 위주
         query = f"{stock_name}"
 
-        items = await self.search_news(query=query, display=max_results, sort="date")
-
-        if not items:
-            return []
-
-        # 파싱
         parsed_news = []
-        for item in items:
-            parsed = self.parse_news_item(item)
-            parsed_news.append(parsed)
+        max_pages = NAVER_MAX_PAGES if state is not None and not state.is_initial else 1
+
+        for page in range(max_pages):
+            # 첫 페이지 호출은 search_multiple_stocks에서 한도 차감
+            if page > 0:
+                if not self.quota.try_consume():
+                    break
+                self._extra_page_calls += 1
+
+            # 🔥 추가 페이지도 초당 요청 제한 적용 (여러 종목이 동시에 페이지를 넘길 수 있음)
+            if bucket is not None:
+                await bucket.acquire()
+
+            items = await self.search_news(query=query, display=max_results, start=page * max_results + 1, sort="date", client=client)
+            if not items:
+                break
+
+            # 파싱 (이미 본 기사에 도달하면 중단)
+            reached_known = False
+            for item in items:
+                parsed = self.parse_news_item(item)
+                if state is not None and state.is_known(parsed["url"], datetime.fromisoformat(parsed["published_at"])):
+                    self.stats["known"] += 1
+                    reached_known = True
+                    break
+                parsed_news.append(parsed)
+
+            if reached_known:
+                self.stats["stopped_early"] += 1
+                break
+            if len(items) < max_results:
+                break
+
+        if state is not None:
+            state.record(parsed_news)
 
         return parsed_news
 
+    def _select_stocks_within_budget(self, stock_names: List[str], budget: int) -> List[str]:
+        """
+        일일 한도 예산 내 검색 대상 선택 (예산 초과 시 사이클마다 순환하여 전체 종목 커버)
+        """
+        if budget >= len(stock_names):
+            return list(stock_names)
+
+        start = self._rotation_offset % len(stock_names)
+        rotated = stock_names[start:] + stock_names[:start]
+        self._rotation_offset = start + budget
+        return rotated[:budget]
+
     async def search_multiple_stocks(
         self,
         stock_names: List[str],
-        results_per_stock: int = 5
-    ) -> List[Dict]:
+        results_per_stock: int = 5,
+        client: Optional[httpx.AsyncClient] = None,
+        interval_minutes: float = 5,
+        state_store: Optional[CrawlStateStore] = None
+    ) -> Tuple[List[Dict], Dict[str, SourceState]]:
         """
         여러 종목 뉴스 동시 검색
 
+        🔥 동시 검색 (NAVER_MAX_CONCURRENCY) + 초당 요청 제한 (NAVER_REQUESTS_PER_SECOND)
+        🔥 일일 한도를 남은 사이클에 고르게 배분, 초과분은 다음 사이클로 순환
+
         Args:
             stock_names: 종목명 리스트
             results_per_stock: 종목당 결과 수
+            client: 공유 HTTP 클라이언트 (없으면 이번 호출 동안 생성)
+            interval_minutes: 크롤링 주기 (분, 사이클 예산 계산용)
+            state_store: 증분 크롤링 상태 저장소 (있으면 새 기사만 반환)
 
         Returns:
-            모든 뉴스 리스트 (중복 제거됨)
+            Tuple[List[Dict], Dict[str, SourceState]]: (중복 제거된 뉴스 리스트, 갱신된 종목별 상태)
+            ⚠️ 상태는 저장하지 않음 - 호출자가 기사 저장 성공 후 state_store.save() 호출
         """
+        if client is None:
+            limits = httpx.Limits(max_connections=NAVER_MAX_CONCURRENCY, max_keepalive_connections=NAVER_MAX_CONCURRENCY)
+            async with httpx.AsyncClient(timeout=10.0, limits=limits) as own_client:
+                return await self.search_multiple_stocks(stock_names, results_per_stock, own_client, interval_minutes, state_store)
+
+        budget = self.quota.cycle_budget(interval_minutes)
+        targets = self._select_stocks_within_budget(stock_names, budget)
+        if len(targets) < len(stock_names):
+            print(f"📊 [Naver] 일일 한도 배분: 이번 사이클 {len(targets)}/{len(stock_names)}개 종목 검색 (남은 한도 {self.quota.remaining}건)")
+
+        semaphore = asyncio.Semaphore(NAVER_MAX_CONCURRENCY)
+        bucket = TokenBucket(capacity=NAVER_REQUESTS_PER_SECOND, refill_rate=NAVER_REQUESTS_PER_SECOND)
+        states = await asyncio.to_thread(state_store.load, self.SOURCE, targets) if state_store else {}
+        self.stats = {"known": 0, "stopped_early": 0}
+        self._extra_page_calls = 0
+
+        async def search_one(stock_name: str) -> List[Dict]:
+            async with semaphore:
+                if not self.quota.try_consume():
+                    return []
+                print(f"🔍 {stock_name} 뉴스 검색 중...")
+                return await self.search_stock_news(stock_name, results_per_stock, client, states.get(stock_name), bucket)
+
+        results = await asyncio.gather(*[search_one(name) for name in targets])
+
+        if state_store:
+            print(f"📊 [Naver] 증분 크롤링: 이미 본 기사에서 중단 {self.stats['stopped_early']}개 종목, 추가 페이지 {self._extra_page_calls}회")
+
+        # 중복 제거 (종목 순서 유지)
         all_news = []
         seen_urls = set()
-
-        for stock_name in stock_names:
-            print(f"🔍 {stock_name} 뉴스 검색 중...")
-
-            news_items = await self.search_stock_news(stock_name, results_per_stock)
-
-            # 중복 제거
+        for news_items in results:
             for news in news_items:
                 url = news["url"]
                 if url not in seen_urls:
                     seen_urls.add(url)
                     all_news.append(news)
 
+        self.last_call_count = len(targets) + self._extra_page_calls
         print(f"✅ 총 {len(all_news)}개 뉴스 수집 (중복 제거 후)")
-        return all_news
+        return all_news, states
 
 
 # 테스트용
@@ -207,7 +307,7 @@ if __name__ == "__main__":
         # 다중 종목 검색 테스트
         print("\n\n=== 다중 종목 뉴스 검색 ===")
         stocks = ["삼성전자", "SK하이닉스", "NAVER"]
-        all_news = await api.search_multiple_stocks(stocks, results_per_stock=2)
+        all_news, _ = await api.search_multiple_stocks(stocks, results_per_stock=2)
 
         print(f"\n총 {len(all_news)}개 뉴스")
 
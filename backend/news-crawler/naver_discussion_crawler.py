@@ -7,12 +7,20 @@ import asyncio
 import aiohttp
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-from bs4 import BeautifulSoup
+from urllib.parse import urlparse, parse_qs
+from bs4 import BeautifulSoup, SoupStrainer
 from dotenv import load_dotenv
 import re
+from rate_limiter import TokenBucket
 
 load_dotenv()
 
+# 🔥 토론방 요청 제한 (finance.naver.com 호스트 기준)
+DISCUSSION_MAX_CONCURRENCY_PER_HOST = int(os.getenv("DISCUSSION_MAX_CONCURRENCY_PER_HOST", "4"))
+DISCUSSION_REQUESTS_PER_SECOND = float(os.getenv("DISCUSSION_REQUESTS_PER_SECOND", "5"))
+
+PAGE_SIZE = 20  # 토론방 페이지당 게시글 수
+
 
 class NaverDiscussionCrawler:
     """네이버 증권 토론방 크롤러"""
@@ -26,136 +34,259 @@ class NaverDiscussionCrawler:
             "Referer": "https://finance.naver.com/"
         }
 
+        # 종목별 최근 수집 게시글 (증분 크롤링용, 프로세스 메모리)
+        self._recent_posts: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _post_id(link: str) -> Optional[int]:
+        """게시글 링크에서 게시글 번호(nid) 추출"""
+        nid = parse_qs(urlparse(link).query).get("nid")
+        return int(nid[0]) if nid and nid[0].isdigit() else None
+
+    def _parse_board_page(self, html: str, symbol: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        토론방 목록 페이지 파싱 (lxml + 게시글 테이블만 파싱)
+
+        Returns:
+            List[Dict]: 게시글 목록 (최신순), 테이블이 없으면 None
+        """
+        soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer('table', class_='type2'))
+
+        # 게시글 테이블 찾기
+        table = soup.find('table', class_='type2')
+        if not table:
+            return None
+
+        posts = []
+        for row in table.find_all('tr'):
+            try:
+                # 공지사항 제외
+                if 'notice' in row.get('class', []):
+                    continue
+
+                # 제목 및 링크
+                title_elem = row.find('td', class_='title')
+                if not title_elem:
+                    continue
+
+                link_elem = title_elem.find('a')
+                if not link_elem:
+                    continue
+
+                title = link_elem.get('title') or link_elem.get_text(strip=True)
+                link = self.base_url + link_elem.get('href', '')
+
+                # 작성자
+                writer_elem = row.find('td', class_='p11')
+                writer = writer_elem.get_text(strip=True) if writer_elem else "Unknown"
+
+                # 조회수
+                view_elem = row.find('td', class_='p10')
+                view_count = 0
+                if view_elem:
+                    view_text = view_elem.get_text(strip=True)
+                    view_count = int(view_text) if view_text.isdigit() else 0
+
+                # 좋아요/공감수
+                like_elem = row.find('td', class_='p9')
+                like_count = 0
+                if like_elem:
+                    like_text = like_elem.get_text(strip=True)
+                    like_count = int(like_text) if like_text.isdigit() else 0
+
+                # 날짜
+                date_elem = row.find('td', class_='p11', attrs={'align': 'center'})
+                if not date_elem:
+                    date_elem = row.find_all('td', class_='p11')[-1] if row.find_all('td', class_='p11') else None
+
+                date_str = date_elem.get_text(strip=True) if date_elem else ""
+                published_at = self._parse_date(date_str)
+
+                posts.append({
+                    "post_id": self._post_id(link),
+                    "title": title,
+                    "link": link,
+                    "writer": writer,
+                    "view_count": view_count,
+                    "like_count": like_count,
+                    "published_at": published_at.isoformat() if published_at else None,
+                    "source": "naver_discussion",
+                    "symbol": symbol
+                })
+
+            except Exception as e:
+                print(f"  ⚠️ 게시글 파싱 오류: {str(e)}")
+                continue
+
+        return posts
+
+    async def _fetch_page(
+        self,
+        session: aiohttp.ClientSession,
+        bucket: TokenBucket,
+        symbol: str,
+        page: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """토론방 목록 1페이지 조회 + 파싱 (실패 시 None)"""
+        url = f"{self.base_url}/item/board.naver?code={symbol}&page={page}"
+        await bucket.acquire()
+
+        try:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status != 200:
+                    print(f"⚠️ HTTP {response.status}: {url}")
+                    return None
+                html = await response.text()
+        except Exception as e:
+            print(f"⚠️ 토론방 페이지 조회 실패 ({symbol} page {page}): {str(e)}")
+            return None
+
+        posts = self._parse_board_page(html, symbol)
+        if posts is None:
+            print(f"⚠️ 토론방 테이블을 찾을 수 없습니다 ({symbol} page {page})")
+        return posts
+
+    def _new_session(self) -> aiohttp.ClientSession:
+        """공유 세션 (호스트당 동시 연결 수 제한)"""
+        connector = aiohttp.TCPConnector(limit_per_host=DISCUSSION_MAX_CONCURRENCY_PER_HOST)
+        return aiohttp.ClientSession(headers=self.headers, connector=connector)
+
+    async def _crawl_symbol(
+        self,
+        session: aiohttp.ClientSession,
+        bucket: TokenBucket,
+        symbol: str,
+        days: int,
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        cutoff_date = datetime.now() - timedelta(days=days)
+        max_pages = (limit // PAGE_SIZE) + 1
+
+        # 🔥 증분 크롤링: 직전 수집 기간이 이번 요청을 포함하면 마지막으로 본 게시글 번호까지만 조회
+        cached = self._recent_posts.get(symbol)
+        if cached and cached["days"] >= days:
+            last_seen_id = cached["last_seen_id"]
+            previous_posts = cached["posts"]
+        else:
+            last_seen_id = None
+            previous_posts = []
+
+        new_posts = []
+        stopped = False
+
+        def collect(posts: List[Dict[str, Any]]) -> bool:
+            """페이지 게시글 추가, 이미 본 게시글/기간 초과에 도달하면 True"""
+            for post in posts:
+                if last_seen_id is not None and post["post_id"] is not None and post["post_id"] <= last_seen_id:
+                    return True
+                if post["published_at"] and datetime.fromisoformat(post["published_at"]) < cutoff_date:
+                    return True
+                new_posts.append(post)
+                if len(new_posts) >= limit:
+                    return True
+            return len(posts) < PAGE_SIZE
+
+        # 1페이지 조회 후, 이미 본 게시글에 도달하지 않았으면 나머지 페이지 동시 조회
+        first_page = await self._fetch_page(session, bucket, symbol, 1)
+        if first_page is None:
+            return [post for post in previous_posts if post["published_at"] is None or datetime.fromisoformat(post["published_at"]) >= cutoff_date][:limit]
+        stopped = collect(first_page)
+
+        if not stopped and max_pages > 1:
+            pages = await asyncio.gather(*[
+                self._fetch_page(session, bucket, symbol, page) for page in range(2, max_pages + 1)
+            ])
+            for posts in pages:
+                if posts is None or collect(posts):
+                    break
+
+        # 새 게시글 + 이전 수집분 병합 (기간 내, 게시글 번호 중복 제거)
+        merged = []
+        seen_ids = set()
+        for post in new_posts + previous_posts:
+            if post["published_at"] and datetime.fromisoformat(post["published_at"]) < cutoff_date:
+                continue
+            if post["post_id"] is not None:
+                if post["post_id"] in seen_ids:
+                    continue
+                seen_ids.add(post["post_id"])
+            merged.append(post)
+        merged = merged[:limit]
+
+        ids = [post["post_id"] for post in merged if post["post_id"] is not None]
+        self._recent_posts[symbol] = {
+            "days": days,
+            "last_seen_id": max(ids) if ids else last_seen_id,
+            "posts": merged,
+        }
+
+        print(f"✅ 네이버 토론방 크롤링 완료 ({symbol}): 새 게시글 {len(new_posts)}개, 전체 {len(merged)}개")
+        return merged
+
     async def crawl_discussions(
         self,
         symbol: str,
         days: int = 7,
-        limit: int = 50
+        limit: int = 50,
+        session: Optional[aiohttp.ClientSession] = None
     ) -> List[Dict[str, Any]]:
         """
         특정 종목의 토론방 게시글 크롤링
 
+        🔥 1페이지 이후 페이지는 동시 조회, 마지막으로 본 게시글 번호에서 중단 (증분)
+
         Args:
             symbol: 종목 코드 (예: '005930')
             days: 수집 기간 (일)
             limit: 최대 게시글 수
+            session: 공유 세션 (없으면 이번 호출 동안 생성)
 
         Returns:
-            List[Dict]: 토론방 게시글 목록
+            List[Dict]: 토론방 게시글 목록 (최신순)
         """
-        discussions = []
-        cutoff_date = datetime.now() - timedelta(days=days)
-
         try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                # 페이지별로 크롤링 (한 페이지당 20개 게시글)
-                page = 1
-                max_pages = (limit // 20) + 1
-
-                while len(discussions) < limit and page <= max_pages:
-                    url = f"{self.base_url}/item/board.naver?code={symbol}&page={page}"
-
-                    async with session.get(url, timeout=10) as response:
-                        if response.status != 200:
-                            print(f"⚠️ HTTP {response.status}: {url}")
-                            break
-
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-
-                        # 게시글 테이블 찾기
-                        table = soup.find('table', class_='type2')
-                        if not table:
-                            print(f"⚠️ 토론방 테이블을 찾을 수 없습니다 (page {page})")
-                            break
-
-                        rows = table.find('tbody').find_all('tr')
-
-                        for row in rows:
-                            try:
-                                # 공지사항 제외
-                                if 'notice' in row.get('class', []):
-                                    continue
-
-                                # 제목 및 링크
-                                title_elem = row.find('td', class_='title')
-                                if not title_elem:
-                                    continue
-
-                                link_elem = title_elem.find('a')
-                                if not link_elem:
-                                    continue
-
-                                title = link_elem.get_text(strip=True)
-                                link = self.base_url + link_elem.get('href', '')
-
-                                # 작성자
-                                writer_elem = row.find('td', class_='p11')
-                                writer = writer_elem.get_text(strip=True) if writer_elem else "Unknown"
-
-                                # 조회수
-                                view_elem = row.find('td', class_='p10')
-                                view_count = 0
-                                if view_elem:
-                                    view_text = view_elem.get_text(strip=True)
-                                    view_count = int(view_text) if view_text.isdigit() else 0
-
-                                # 좋아요/공감수
-                                like_elem = row.find('td', class_='p9')
-                                like_count = 0
-                                if like_elem:
-                                    like_text = like_elem.get_text(strip=True)
-                                    like_count = int(like_text) if like_text.isdigit() else 0
-
-                                # 날짜
-                                date_elem = row.find('td', class_='p11', attrs={'align': 'center'})
-                                if not date_elem:
-                                    date_elem = row.find_all('td', class_='p11')[-1] if row.find_all('td', class_='p11') else None
-
-                                date_str = date_elem.get_text(strip=True) if date_elem else ""
-                                published_at = self._parse_date(date_str)
-
-                                # 기간 필터링
-                                if published_at and published_at < cutoff_date:
-                                    print(f"  ℹ️ 기간 초과 게시글 발견 (page {page}), 크롤링 중단")
-                                    break
-
-                                discussion = {
-                                    "title": title,
-                                    "link": link,
-                                    "writer": writer,
-                                    "view_count": view_count,
-                                    "like_count": like_count,
-                                    "published_at": published_at.isoformat() if published_at else None,
-                                    "source": "naver_discussion",
-                                    "symbol": symbol
-                                }
-
-                                discussions.append(discussion)
-
-                                if len(discussions) >= limit:
-                                    break
-
-                            except Exception as e:
-                                print(f"  ⚠️ 게시글 파싱 오류: {str(e)}")
-                                continue
-
-                        # 기간 초과 시 중단
-                        if len(discussions) > 0 and discussions[-1].get("published_at"):
-                            last_date = datetime.fromisoformat(discussions[-1]["published_at"])
-                            if last_date < cutoff_date:
-                                break
-
-                    page += 1
-                    await asyncio.sleep(0.5)  # Rate limiting
-
-            print(f"✅ 네이버 토론방 크롤링 완료: {len(discussions)}개")
-            return discussions[:limit]
+            if session is None:
+                async with self._new_session() as own_session:
+                    return await self.crawl_discussions(symbol, days, limit, own_session)
+
+            bucket = TokenBucket(capacity=DISCUSSION_REQUESTS_PER_SECOND, refill_rate=DISCUSSION_REQUESTS_PER_SECOND)
+            return await self._crawl_symbol(session, bucket, symbol, days, limit)
 
         except Exception as e:
             print(f"❌ 토론방 크롤링 실패: {str(e)}")
             return []
 
+    async def crawl_many(
+        self,
+        symbols: List[str],
+        days: int = 1,
+        limit: int = 40
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        여러 종목 토론방 동시 크롤링 (공유 세션 + 호스트당 동시 연결 / 초당 요청 제한)
+
+        Args:
+            symbols: 종목 코드 리스트
+            days: 수집 기간 (일)
+            limit: 종목당 최대 게시글 수
+
+        Returns:
+            Dict[str, List[Dict]]: {종목 코드: 게시글 목록}
+        """
+        bucket = TokenBucket(capacity=DISCUSSION_REQUESTS_PER_SECOND, refill_rate=DISCUSSION_REQUESTS_PER_SECOND)
+
+        async with self._new_session() as session:
+            async def crawl_one(symbol: str) -> List[Dict[str, Any]]:
+                try:
+                    return await self._crawl_symbol(session, bucket, symbol, days, limit)
+                except Exception as e:
+                    print(f"❌ 토론방 크롤링 실패 ({symbol}): {str(e)}")
+                    return []
+
+            results = await asyncio.gather(*[crawl_one(symbol) for symbol in symbols])
+
+        return dict(zip(symbols, results))
+
     async def get_discussion_content(
         self,
         discussion_url: str
@@ -176,7 +307,7 @@ class NaverDiscussionCrawler:
                         return None
 
                     html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
+                    soup = BeautifulSoup(html, 'lxml')
 
                     # 본문 찾기
                     content_elem = soup.find('div', class_='board_txt')
@@ -0,0 +1,235 @@
+"""
+🔥 유사 뉴스(전재/통신사 기사) 클러스터링
+제목 + 본문 문자 Shingle 기반 MinHash로 여러 언론사의 같은 기사를 하나로 묶음
+
+- 64개 해시 MinHash 서명, 추정 Jaccard 유사도 0.7 이상 + NER 종목 집합 동일 → 같은 기사
+  (종목명만 다른 정형화된 시황 기사는 텍스트 유사도가 높아도 서로 다른 기사)
+- LSH 밴드 인덱스 (16밴드 × 4행) → 후보만 비교
+- 최근 N일 대표 기사만 메모리에 보관
+- 대표 기사 1건만 AI 분석/저장, 나머지 URL은 대표 기사에 연결
+
+SimHash는 짧은 기사(API 요약문)에서 단어 한두 개 차이에도 거리가 크게 벌어져 MinHash 사용
+"""
+import re
+import random
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+NUM_PERMUTATIONS = 64
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // NUM_BANDS
+
+# 같은 기사로 판단할 추정 Jaccard 유사도
+JACCARD_THRESHOLD = 0.7
+
+# 문자 Shingle 크기 / 최소 개수 (짧은 텍스트는 오탐 가능성이 높아 제외)
+SHINGLE_SIZE = 3
+MIN_SHINGLES = 20
+
+# 인덱스 보관 기간 (크롤링 대상 기간과 동일)
+RETENTION_DAYS = 3
+
+# Google News 제목 끝 언론사 표기 (" - 한국경제")
+SOURCE_SUFFIX_PATTERN = re.compile(r"\s+[-|]\s+[^-|]{1,20}$")
+NON_WORD_PATTERN = re.compile(r"[^0-9a-z가-힣]+")
+
+# 해시 순열 (프로세스 간 동일하도록 고정 시드)
+_MASK64 = (1 << 64) - 1
+_rng = random.Random(20261018)
+_PERMUTATIONS = [(_rng.getrandbits(64), _rng.getrandbits(64) | 1) for _ in range(NUM_PERMUTATIONS)]
+
+
+def normalize_text(title: str, content: str) -> str:
+    """MinHash용 텍스트 정규화 (언론사 표기/공백/특수문자 제거, 소문자)"""
+    title = SOURCE_SUFFIX_PATTERN.sub("", title or "")
+    return NON_WORD_PATTERN.sub("", f"{title} {content or ''}".lower())
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """문자 n-gram Shingle 집합"""
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash_signature(features: Set[str]) -> Tuple[int, ...]:
+    """
+    MinHash 서명 계산
+
+    Args:
+        features: Shingle 집합
+
+    Returns:
+        Tuple[int, ...]: 순열별 최솟값 (NUM_PERMUTATIONS개)
+    """
+    hashes = [
+        int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        for feature in features
+    ]
+    return tuple(
+        min(((h ^ mask) * multiplier) & _MASK64 for h in hashes)
+        for mask, multiplier in _PERMUTATIONS
+    )
+
+
+def news_fingerprint(title: str, content: str) -> Optional[Tuple[int, ...]]:
+    """
+    기사 MinHash 서명 (텍스트가 너무 짧으면 None)
+    """
+    features = shingles(normalize_text(title, content))
+    if len(features) < MIN_SHINGLES:
+        return None
+    return minhash_signature(features)
+
+
+def estimate_jaccard(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """두 서명의 추정 Jaccard 유사도"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def _bands(signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+    return [signature[i * ROWS_PER_BAND:(i + 1) * ROWS_PER_BAND] for i in range(NUM_BANDS)]
+
+
+class NearDuplicateIndex:
+    """최근 대표 기사 MinHash LSH 인덱스"""
+
+    def __init__(self, threshold: float = JACCARD_THRESHOLD, retention_days: int = RETENTION_DAYS):
+        """
+        Args:
+            threshold: 같은 기사로 판단할 최소 추정 Jaccard 유사도
+            retention_days: 인덱스 보관 기간 (일)
+        """
+        self.threshold = threshold
+        self.retention_days = retention_days
+        self.warmed = False
+
+        self._entries: Dict[str, Tuple[Tuple[int, ...], datetime, FrozenSet[str]]] = {}  # 대표 URL → (서명, 발행 시각, 종목)
+        self._bands: List[Dict[Tuple[int, ...], Set[str]]] = [{} for _ in range(NUM_BANDS)]  # 밴드 값 → 대표 URL
+        self._linked: Dict[str, str] = {}                            # 중복 URL → 대표 URL
+        self._lock = threading.Lock()  # 스케줄러 스레드 / 수동 트리거 동시 접근 방지
+
+    def find(
+        self,
+        fingerprint: Tuple[int, ...],
+        symbols: Iterable[str] = (),
+        url: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        유사 대표 기사 조회
+
+        Args:
+            fingerprint: MinHash 서명
+            symbols: 기사 NER 종목 (대표 기사와 종목 집합이 같아야 연결)
+            url: 조회 대상 기사 URL (자기 자신은 대표 기사 후보에서 제외)
+
+        Returns:
+            Optional[str]: 대표 기사 URL (없으면 None)
+        """
+        symbols = frozenset(symbols)
+
+        with self._lock:
+            candidates = set()
+            for band_index, band in enumerate(_bands(fingerprint)):
+                candidates |= self._bands[band_index].get(band, set())
+
+            candidates.discard(url)
+
+            best_url, best_similarity = None, self.threshold
+            for candidate_url in candidates:
+                entry_fingerprint, _, entry_symbols = self._entries[candidate_url]
+                if entry_symbols != symbols:
+                    continue
+                similarity = estimate_jaccard(fingerprint, entry_fingerprint)
+                if similarity >= best_similarity:
+                    best_url, best_similarity = candidate_url, similarity
+            return best_url
+
+    def add(
+        self,
+        fingerprint: Tuple[int, ...],
+        url: str,
+        published_at: datetime = None,
+        symbols: Iterable[str] = ()
+    ):
+        """대표 기사 등록"""
+        with self._lock:
+            if url in self._entries:
+                return
+            self._entries[url] = (fingerprint, published_at or datetime.now(timezone.utc), frozenset(symbols))
+            for band_index, band in enumerate(_bands(fingerprint)):
+                self._bands[band_index].setdefault(band, set()).add(url)
+
+    def link(self, url: str, representative_url: str):
+        """중복 URL을 대표 기사에 연결"""
+        with self._lock:
+            self._linked[url] = representative_url
+
+    def representative_of(self, url: str) -> Optional[str]:
+        """이미 연결된 중복 URL이면 대표 기사 URL 반환"""
+        return self._linked.get(url)
+
+    def remove(self, urls: Iterable[str]) -> int:
+        """
+        대표 기사 및 연결 제거 (저장에 실패한 대표 기사 - 다음 사이클 재수집 시 다시 대표가 되도록)
+
+        Returns:
+            int: 제거된 대표 기사 수
+        """
+        with self._lock:
+            return self._drop_entries([url for url in urls if url in self._entries])
+
+    def _drop_entries(self, urls: List[str]) -> int:
+        """대표 기사 + 밴드 + 해당 대표로의 연결 제거 (호출 측에서 _lock 보유)"""
+        for url in urls:
+            fingerprint, _, _ = self._entries.pop(url)
+            for band_index, band in enumerate(_bands(fingerprint)):
+                band_urls = self._bands[band_index].get(band)
+                if band_urls:
+                    band_urls.discard(url)
+                    if not band_urls:
+                        del self._bands[band_index][band]
+
+        dropped = set(urls)
+        if dropped:
+            self._linked = {url: rep for url, rep in self._linked.items() if rep not in dropped}
+        return len(urls)
+
+    def prune(self, now: datetime = None) -> int:
+        """
+        보관 기간 지난 대표 기사 및 연결 제거
+
+        Returns:
+            int: 제거된 대표 기사 수
+        """
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=self.retention_days)
+
+        with self._lock:
+            expired = [url for url, (_, published_at, _) in self._entries.items() if published_at < cutoff]
+            return self._drop_entries(expired)
+
+    def warm_up(self, rows: List[Dict]):
+        """
+        DB 최근 뉴스로 인덱스 초기화 (재시작 후 중복 저장 방지)
+
+        Args:
+            rows: news 행 (url, title, content, published_at, related_symbols, duplicate_urls)
+        """
+        for row in rows:
+            fingerprint = news_fingerprint(row.get("title", ""), row.get("content", ""))
+            if fingerprint is None:
+                continue
+
+            try:
+                published_at = datetime.fromisoformat(row["published_at"].replace('Z', '+00:00'))
+            except (KeyError, ValueError, AttributeError):
+                published_at = None
+
+            self.add(fingerprint, row["url"], published_at, row.get("related_symbols") or [])
+            for duplicate_url in row.get("duplicate_urls") or []:
+                self.link(duplicate_url, row["url"])
+
+        self.warmed = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,101 @@
+"""
+🔥 뉴스 일괄 저장 모듈
+크롤링 사이클당 DB 왕복을 기사 수(2N)가 아닌 청크 수(N/청크)로 줄임
+
+- SeenUrlCache: 최근 처리한 URL LRU → DB 중복 조회 자체를 생략
+- find_existing_urls(): in_ 쿼리를 청크 단위로 실행 (URL 길이로 인한 요청 URL 길이 제한 고려)
+- bulk_insert_news(): url 기준 upsert(중복 무시)로 청크 단위 저장
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Set, Tuple
+from supabase import Client
+
+DEDUPE_CHUNK_SIZE = int(os.getenv("NEWS_DEDUPE_CHUNK_SIZE", "50"))    # in_ 쿼리당 URL 수
+INSERT_CHUNK_SIZE = int(os.getenv("NEWS_INSERT_CHUNK_SIZE", "200"))   # upsert당 행 수
+SEEN_URL_CACHE_SIZE = int(os.getenv("NEWS_SEEN_URL_CACHE_SIZE", "50000"))
+
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class SeenUrlCache:
+    """최근 DB에 존재가 확인된 URL LRU"""
+
+    def __init__(self, maxsize: int = SEEN_URL_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._urls: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            if url in self._urls:
+                self._urls.move_to_end(url)
+                return True
+            return False
+
+    def add_many(self, urls: Iterable[str]):
+        with self._lock:
+            for url in urls:
+                self._urls[url] = None
+                self._urls.move_to_end(url)
+            while len(self._urls) > self.maxsize:
+                self._urls.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+
+def find_existing_urls(supabase: Client, urls: List[str]) -> Tuple[Set[str], int]:
+    """
+    news 테이블에 이미 있는 URL 조회 (청크 단위 in_ 쿼리)
+
+    Args:
+        supabase: Supabase 클라이언트
+        urls: 확인할 URL 리스트
+
+    Returns:
+        Tuple[Set[str], int]: (존재하는 URL 집합, DB 호출 수)
+    """
+    existing = set()
+    calls = 0
+
+    for chunk in _chunks(list(dict.fromkeys(urls)), DEDUPE_CHUNK_SIZE):
+        result = supabase.table("news").select("url").in_("url", chunk).execute()
+        calls += 1
+        existing.update(row["url"] for row in (result.data or []))
+
+    return existing, calls
+
+
+def bulk_insert_news(supabase: Client, rows: List[Dict]) -> Tuple[List[Dict], int, int]:
+    """
+    뉴스 일괄 저장 (url 기준 upsert, 이미 있는 URL은 무시)
+
+    Args:
+        supabase: Supabase 클라이언트
+        rows: 저장할 news 행 리스트
+
+    Returns:
+        Tuple[List[Dict], int, int]: (실제로 저장된 행, DB 호출 수, 저장 실패 행 수)
+    """
+    saved = []
+    calls = 0
+    failed = 0
+
+    for chunk in _chunks(rows, INSERT_CHUNK_SIZE):
+        try:
+            result = supabase.table("news") \
+                .upsert(chunk, on_conflict="url", ignore_duplicates=True) \
+                .execute()
+            calls += 1
+            saved.extend(result.data or [])
+        except Exception as e:
+            calls += 1
+            failed += len(chunk)
+            print(f"❌ 뉴스 일괄 저장 실패 ({len(chunk)}개): {str(e)}")
+
+    return saved, calls, failed
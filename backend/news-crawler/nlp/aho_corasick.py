@@ -0,0 +1,99 @@
+"""
+Aho-Corasick 다중 문자열 매칭
+종목명 사전을 로드 시점에 오토마톤으로 컴파일 → 기사당 O(텍스트 길이 + 매칭 수)
+"""
+from collections import deque
+from typing import Dict, Generic, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class AhoCorasick(Generic[T]):
+    """Aho-Corasick 오토마톤 (패턴 → 값)"""
+
+    def __init__(self, patterns: Dict[str, T]):
+        """
+        Args:
+            patterns: {패턴 문자열: 값}
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, T]]] = [[]]  # 노드별 (패턴 길이, 값)
+
+        for pattern, value in patterns.items():
+            if pattern:
+                self._add(pattern, value)
+        self._build_failure_links()
+
+    def _add(self, pattern: str, value: T):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        self._outputs[node].append((len(pattern), value))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+
+                # 실패 링크 노드의 출력도 포함 (접미사 패턴)
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def iter_matches(self, text: str) -> List[Tuple[int, int, T]]:
+        """
+        모든 매칭 (겹침 포함)
+
+        Returns:
+            List[Tuple[int, int, T]]: (시작 위치, 끝 위치(미포함), 값)
+        """
+        matches = []
+        node = 0
+
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+
+            for length, value in self._outputs[node]:
+                matches.append((index - length + 1, index + 1, value))
+
+        return matches
+
+    def find_longest(self, text: str) -> List[Tuple[int, int, T]]:
+        """
+        겹치지 않는 최장 매칭 (긴 패턴 우선, 같은 길이면 앞쪽 우선)
+        예: "삼성전자우" → "삼성전자우"만 매칭 ("삼성전자", "삼성" 제외)
+
+        Returns:
+            List[Tuple[int, int, T]]: 시작 위치 순 (시작, 끝, 값)
+        """
+        selected = []
+        occupied = [False] * len(text)
+
+        for start, end, value in sorted(self.iter_matches(text), key=lambda m: (m[0] - m[1], m[0])):
+            if any(occupied[start:end]):
+                continue
+            for i in range(start, end):
+                occupied[i] = True
+            selected.append((start, end, value))
+
+        selected.sort(key=lambda m: m[0])
+        return selected
+
+    def __len__(self) -> int:
+        return len(self._goto)
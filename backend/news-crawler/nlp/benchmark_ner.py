@@ -0,0 +1,154 @@
+"""
+StockNER 벤치마크 (기존 부분 문자열 순회 vs Aho-Corasick)
+
+실행: news-crawler 디렉토리에서
+    python -m nlp.benchmark_ner
+
+- SUPABASE_URL / SUPABASE_SERVICE_KEY가 있으면 stock_master 전체 사용
+- 없으면 주요 종목 + 합성 종목명으로 약 2,500개 사전 구성
+"""
+import os
+import re
+import time
+import random
+from typing import Dict, List
+from dotenv import load_dotenv
+from nlp.ner import StockNER
+
+# 실제 뉴스 헤드라인 (네이버/Google News 수집분 발췌)
+HEADLINES = [
+    "삼성전자, 3분기 영업이익 9.1조…반도체 회복에 '어닝 서프라이즈'",
+    "SK하이닉스, HBM3E 12단 양산 돌입…엔비디아 공급 확대",
+    "삼성전자우 급등…외국인 순매수 1위",
+    "LG에너지솔루션, 北美 배터리 공장 가동률 하락에 목표가 하향",
+    "현대차·기아, 미국 IRA 보조금 대상 확대 수혜 기대",
+    "NAVER(035420), 하이퍼클로바X 기업용 출시…AI 매출 본격화",
+    "카카오 주가 52주 신저가…카카오뱅크·카카오페이 동반 약세",
+    "셀트리온, 짐펜트라 美 처방 확대…2분기 실적 개선 전망",
+    "POSCO홀딩스, 리튬 가격 하락에 2차전지 소재 투자 속도 조절",
+    "KB금융·신한지주, 밸류업 공시 후 배당 확대 기대감",
+    "에코프로비엠 공매도 재개 앞두고 변동성 확대",
+    "한화에어로스페이스, 폴란드 K9 2차 수출 계약 체결",
+    "HD현대중공업, LNG선 수주 잔고 4년치 확보",
+    "삼성바이오로직스(207940) 5공장 착공…CDMO 수주 확대",
+    "LG화학, 석유화학 부진 지속…첨단소재 부문은 선방",
+    "기아, 1분기 역대 최대 매출…EV9 판매 호조",
+    "SK이노베이션·SK E&S 합병 승인…에너지 공룡 출범",
+    "크래프톤, 배틀그라운드 매출 반등에 영업이익 컨센서스 상회",
+    "엔씨소프트 구조조정 단행…신작 부진 여파",
+    "하이브, 뉴진스 분쟁 장기화에 주가 약세",
+    "삼성SDI, 전고체 배터리 2027년 양산 목표 재확인",
+    "현대모비스, 자율주행 센서 사업 분사 검토",
+    "LG전자 가전 구독 매출 1조 돌파…HVAC 사업 확대",
+    "두산에너빌리티, 체코 원전 우선협상대상자 선정 수혜",
+    "한미반도체, TC본더 SK하이닉스 추가 수주",
+    "알테오젠, 키트루다 SC 제형 기술이전 로열티 기대",
+    "HLB 간암 신약 FDA 재심사 결과 발표 임박",
+    "삼성물산, 자사주 소각 및 주주환원 정책 발표",
+    "우리금융지주, 동양생명·ABL생명 인수 추진",
+    "코스피 2,600선 회복…외국인 반도체 순매수 지속",
+    "삼성전자, 005930 종목 외국인 보유율 55% 돌파",
+    "SK텔레콤, AI 데이터센터 투자 확대…엔비디아와 협력",
+    "KT, 마이크로소프트와 5년간 2.4조 AI 협력",
+    "대한항공·아시아나항공 합병 최종 승인",
+    "CJ제일제당, 바이오 사업부 매각 재추진",
+    "아모레퍼시픽, 중국 매출 감소에도 북미 성장",
+    "오리온, 초코파이 가격 인상…원재료 부담",
+    "한국전력, 전기요금 인상 효과로 3분기 흑자 전환",
+    "포스코퓨처엠, 양극재 판가 하락에 적자 지속",
+    "삼성중공업, 해양플랜트 수주로 실적 턴어라운드",
+]
+
+# 주요 종목 (사전 미연결 시 사용)
+SAMPLE_STOCKS = [
+    ("005930", "삼성전자"), ("005935", "삼성전자우"), ("000660", "SK하이닉스"), ("373220", "LG에너지솔루션"),
+    ("005380", "현대차"), ("000270", "기아"), ("035420", "NAVER"), ("035720", "카카오"),
+    ("323410", "카카오뱅크"), ("377300", "카카오페이"), ("068270", "셀트리온"), ("005490", "POSCO홀딩스"),
+    ("105560", "KB금융"), ("055550", "신한지주"), ("247540", "에코프로비엠"), ("012450", "한화에어로스페이스"),
+    ("329180", "HD현대중공업"), ("207940", "삼성바이오로직스"), ("051910", "LG화학"), ("096770", "SK이노베이션"),
+    ("259960", "크래프톤"), ("036570", "엔씨소프트"), ("352820", "하이브"), ("006400", "삼성SDI"),
+    ("012330", "현대모비스"), ("066570", "LG전자"), ("034020", "두산에너빌리티"), ("042700", "한미반도체"),
+    ("196170", "알테오젠"), ("028300", "HLB"), ("028260", "삼성물산"), ("316140", "우리금융지주"),
+    ("017670", "SK텔레콤"), ("030200", "KT"), ("003490", "대한항공"), ("020560", "아시아나항공"),
+    ("097950", "CJ제일제당"), ("090430", "아모레퍼시픽"), ("271560", "오리온"), ("015760", "한국전력"),
+    ("003670", "포스코퓨처엠"), ("010140", "삼성중공업"),
+]
+
+SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초코토포호"
+
+
+def build_sample_stocks(target: int = 2500) -> List[Dict[str, str]]:
+    """주요 종목 + 합성 종목명 (고정 시드)"""
+    rng = random.Random(42)
+    stocks = [{"symbol": symbol, "name": name} for symbol, name in SAMPLE_STOCKS]
+    names = {name for _, name in SAMPLE_STOCKS}
+
+    while len(stocks) < target:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(3, 6)))
+        if name in names:
+            continue
+        names.add(name)
+        stocks.append({"symbol": f"{900000 + len(stocks):06d}", "name": name})
+    return stocks
+
+
+def legacy_extract_symbols(stocks: Dict[str, str], text: str) -> List[str]:
+    """기존 구현 (종목마다 부분 문자열 검사 + 코드마다 전체 값 리스트 생성)"""
+    found_symbols = set()
+    for code in re.findall(r'\b(\d{6})\b', text):
+        if code in [v for v in stocks.values()]:
+            found_symbols.add(code)
+    for stock_name, stock_code in stocks.items():
+        if stock_name in text:
+            found_symbols.add(stock_code)
+    return list(found_symbols)
+
+
+def load_ner() -> StockNER:
+    load_dotenv()
+    if os.getenv("SUPABASE_URL") and os.getenv("SUPABASE_SERVICE_KEY"):
+        from supabase import create_client
+        return StockNER(create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_SERVICE_KEY")))
+
+    ner = StockNER.__new__(StockNER)
+    ner.supabase = None
+    ner.load_stocks(build_sample_stocks())
+    print(f"ℹ️ Supabase 미설정 - 샘플 사전 사용 ({len(ner.stocks)}개 항목)")
+    return ner
+
+
+def benchmark(rounds: int = 50):
+    started = time.perf_counter()
+    ner = load_ner()
+    build_seconds = time.perf_counter() - started
+
+    corpus = HEADLINES * rounds
+    print(f"📚 코퍼스: 헤드라인 {len(HEADLINES)}개 × {rounds}회 = {len(corpus)}건, 사전 {len(ner.stocks)}개 항목")
+    print(f"🔧 오토마톤 구성: {build_seconds * 1000:.1f}ms ({len(ner.matcher)}개 노드)")
+
+    started = time.perf_counter()
+    for text in corpus:
+        legacy_extract_symbols(ner.stocks, text)
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for text in corpus:
+        ner.extract_symbols(text)
+    automaton_seconds = time.perf_counter() - started
+
+    print(f"⏱️ 기존 방식:   {legacy_seconds / len(corpus) * 1e6:8.1f}µs/건 (총 {legacy_seconds:.2f}초)")
+    print(f"⏱️ Aho-Corasick: {automaton_seconds / len(corpus) * 1e6:8.1f}µs/건 (총 {automaton_seconds:.2f}초)")
+    print(f"🚀 {legacy_seconds / automaton_seconds:.1f}배 빠름")
+
+    # 결과 차이 (최장 일치로 제거된 중복 태깅)
+    print("\n🔍 결과가 달라진 헤드라인:")
+    for text in HEADLINES:
+        legacy = set(legacy_extract_symbols(ner.stocks, text))
+        current = set(ner.extract_symbols(text))
+        if legacy != current:
+            print(f"  - {text[:40]}")
+            print(f"    기존 {sorted(legacy)} → 현재 {sorted(current)}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -3,21 +3,34 @@
 뉴스 텍스트에서 종목명/종목코드를 추출
 """
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
 from supabase import Client
+from nlp.aho_corasick import AhoCorasick
+
+# 6자리 종목 코드 패턴
+CODE_PATTERN = re.compile(r'\b(\d{6})\b')
 
 
 class StockNER:
     """종목명 추출기"""
 
-    def __init__(self, supabase_client: Client):
+    def __init__(self, supabase_client: Client, stock_index=None):
         """
         Args:
             supabase_client: Supabase 클라이언트
+            stock_index: 종목 마스터 인덱스 (StockMasterIndex, 선택) - 있으면 인덱스 재로드 시 사전도 재구성
         """
         self.supabase = supabase_client
         self.stocks: Dict[str, str] = {}  # {종목명: 종목코드}
-        self.load_stock_master()
+        self.valid_codes: set = set()      # 종목 코드 검증용
+        self.matcher: Optional[AhoCorasick] = None  # 종목명 오토마톤 (로드 시 1회 컴파일)
+
+        if stock_index is not None:
+            stock_index.add_listener(self.load_stocks)
+            if stock_index.refresh_if_stale() is False and len(stock_index):
+                self.load_stocks(stock_index.all())
+        else:
+            self.load_stock_master()
 
     def load_stock_master(self):
         """stock_master 테이블에서 전체 종목 로드"""
@@ -25,18 +38,7 @@ class StockNER:
             response = self.supabase.table("stock_master").select("symbol, name").execute()
 
             if response.data:
-                # 종목명 -> 종목코드 매핑
-                for stock in response.data:
-                    name = stock["name"]
-                    symbol = stock["symbol"]
-                    self.stocks[name] = symbol
-
-                    # 약칭도 추가 (예: 삼성전자 -> 삼성)
-                    if len(name) > 2:
-                        short_name = name[:2]
-                        if short_name not in self.stocks:
-                            self.stocks[short_name] = symbol
-
+                self.load_stocks(response.data)
                 print(f"✅ {len(response.data)}개 종목 로드 완료")
             else:
                 print("⚠️ stock_master 테이블이 비어있습니다.")
@@ -44,6 +46,42 @@ class StockNER:
         except Exception as e:
             print(f"❌ stock_master 로드 실패: {str(e)}")
 
+    def load_stocks(self, stocks: List[Dict[str, str]]):
+        """
+        종목 사전 구성 + Aho-Corasick 오토마톤 컴파일
+
+        Args:
+            stocks: [{"symbol": 종목코드, "name": 종목명}]
+        """
+        self.stocks = {}
+        stocks = [stock for stock in stocks if stock.get("name") and stock.get("symbol")]
+
+        # 종목명 -> 종목코드 매핑
+        for stock in stocks:
+            self.stocks[stock["name"]] = stock["symbol"]
+
+        # 약칭도 추가 (예: 삼성전자 -> 삼성), 정식 종목명과 겹치면 정식 종목명 우선
+        for stock in stocks:
+            name = stock["name"]
+            if len(name) > 2:
+                short_name = name[:2]
+                if short_name not in self.stocks:
+                    self.stocks[short_name] = stock["symbol"]
+
+        self.valid_codes = set(self.stocks.values())
+        self.matcher = AhoCorasick(self.stocks)
+
+    def match_names(self, text: str) -> List[tuple]:
+        """
+        종목명 최장 일치 매칭 ("삼성전자우"는 "삼성전자"/"삼성"으로 중복 태깅하지 않음)
+
+        Returns:
+            List[tuple]: [(종목명, 종목코드)] 텍스트 등장 순
+        """
+        if not text or self.matcher is None:
+            return []
+        return [(text[start:end], code) for start, end, code in self.matcher.find_longest(text)]
+
     def extract_symbols(self, text: str) -> List[str]:
         """
         텍스트에서 종목 코드 추출
@@ -60,18 +98,14 @@ class StockNER:
         found_symbols = set()
 
         # 1. 종목 코드 패턴 매칭 (6자리 숫자)
-        code_pattern = r'\b(\d{6})\b'
-        code_matches = re.findall(code_pattern, text)
-        for code in code_matches:
+        for code in CODE_PATTERN.findall(text):
             # 유효한 종목 코드인지 확인 (stock_master에 존재)
-            if code in [v for v in self.stocks.values()]:
+            if code in self.valid_codes:
                 found_symbols.add(code)
 
-        # 2. 종목명 매칭
-        for stock_name, stock_code in self.stocks.items():
-            # 정확한 종목명 매칭
-            if stock_name in text:
-                found_symbols.add(stock_code)
+        # 2. 종목명 매칭 (오토마톤, 최장 일치)
+        for _, stock_code in self.match_names(text):
+            found_symbols.add(stock_code)
 
         return list(found_symbols)
 
@@ -91,22 +125,20 @@ class StockNER:
         results = []
         found = set()
 
-        # 종목명으로 매칭
-        for stock_name, stock_code in self.stocks.items():
+        # 종목명으로 매칭 (오토마톤, 최장 일치)
+        for stock_name, stock_code in self.match_names(text):
             if stock_code in found:
                 continue
 
-            # 종목명이 텍스트에 포함되어 있는지
-            if stock_name in text:
-                # 신뢰도 계산 (단어 길이가 길수록 신뢰도 높음)
-                confidence = min(1.0, len(stock_name) / 5.0)
-
-                results.append({
-                    "symbol": stock_code,
-                    "name": stock_name,
-                    "confidence": confidence
-                })
-                found.add(stock_code)
+            # 신뢰도 계산 (단어 길이가 길수록 신뢰도 높음)
+            confidence = min(1.0, len(stock_name) / 5.0)
+
+            results.append({
+                "symbol": stock_code,
+                "name": stock_name,
+                "confidence": confidence
+            })
+            found.add(stock_code)
 
         # 신뢰도 순으로 정렬
         results.sort(key=lambda x: x["confidence"], reverse=True)
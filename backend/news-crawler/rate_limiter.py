@@ -0,0 +1,115 @@
+"""
+🔥 뉴스 소스 요청 제어
+- Token Bucket: 초당 요청 수 제한
+- DailyQuota: 일일 호출 한도 (네이버 검색 API 25,000건/일) 및 크롤링 사이클별 예산 계산
+
+※ TokenBucket은 asyncio 객체(Lock/Semaphore)를 포함하므로 크롤링 호출 시점에
+  실행 중인 이벤트 루프에서 생성 (모듈 로드 시 생성하지 않음)
+"""
+import math
+import time
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+
+
+class TokenBucket:
+    """
+    Token Bucket 알고리즘 구현
+    - 일정 속도로 토큰이 채워짐
+    - 요청 시 토큰 소비
+    - 토큰 부족 시 대기
+    """
+
+    def __init__(self, capacity: float, refill_rate: float):
+        """
+        Args:
+            capacity: 버킷 용량 (최대 토큰 수)
+            refill_rate: 토큰 재충전 속도 (초당 토큰 수)
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 1) -> float:
+        """
+        토큰 획득 (대기 시간 반환)
+
+        Args:
+            tokens: 필요한 토큰 수 (기본: 1)
+
+        Returns:
+            float: 대기 시간 (초)
+        """
+        async with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+
+            wait_time = 0.0
+            if self.tokens < tokens:
+                wait_time = (tokens - self.tokens) / self.refill_rate
+                await asyncio.sleep(wait_time)
+                self.tokens = min(self.capacity, self.tokens + wait_time * self.refill_rate)
+                self.last_refill = time.monotonic()
+
+            self.tokens -= tokens
+            return wait_time
+
+
+class DailyQuota:
+    """
+    일일 호출 한도 관리 (KST 자정 초기화)
+    - 사이클별 예산 = 남은 한도 / 남은 사이클 수 → 하루 종일 고르게 사용
+    """
+
+    def __init__(self, daily_limit: int):
+        """
+        Args:
+            daily_limit: 일일 최대 호출 수
+        """
+        self.daily_limit = daily_limit
+        self.used = 0
+        self._day = datetime.now(KST).date()
+        self._lock = threading.Lock()
+
+    def _roll_over(self):
+        today = datetime.now(KST).date()
+        if today != self._day:
+            self._day = today
+            self.used = 0
+
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            self._roll_over()
+            return max(0, self.daily_limit - self.used)
+
+    def cycle_budget(self, interval_minutes: float) -> int:
+        """
+        이번 크롤링 사이클에서 사용할 수 있는 호출 수
+
+        Args:
+            interval_minutes: 크롤링 주기 (분)
+
+        Returns:
+            int: 호출 예산
+        """
+        now = datetime.now(KST)
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=KST)
+        cycles_left = max(1, math.ceil((midnight - now).total_seconds() / 60 / interval_minutes))
+        remaining = self.remaining
+        return max(1, remaining // cycles_left) if remaining else 0
+
+    def try_consume(self, count: int = 1) -> bool:
+        """한도 내이면 호출 수 차감 후 True"""
+        with self._lock:
+            self._roll_over()
+            if self.used + count > self.daily_limit:
+                return False
+            self.used += count
+            return True
@@ -0,0 +1,142 @@
+"""
+🔥 종목 → 구독 사용자 역인덱스
+portfolios / watchlist를 사이클당 1회 전체 로드 → 추적 종목 목록 + 알림 대상 조회에 공용 사용
+
+- 기사별 portfolios/watchlist in_ 쿼리 제거 (알림 대상은 메모리 조회)
+- 사이클에서 생성된 알림은 모아서 일괄 저장
+"""
+import threading
+from typing import Dict, Iterable, List, Set, Tuple
+from supabase import Client
+
+PAGE_SIZE = 1000
+ALERT_INSERT_CHUNK_SIZE = 500
+
+# 권고에 따른 액션 텍스트
+ACTION_TEXT = {
+    "buy": "매수 검토",
+    "sell": "매도 검토",
+    "hold": "관망 권장"
+}
+
+
+class SubscriptionIndex:
+    """종목코드 → 보유/관심 사용자 ID 집합"""
+
+    def __init__(self, supabase: Client):
+        self.supabase = supabase
+        self._users_by_symbol: Dict[str, Set[str]] = {}
+        self.portfolio_symbols: Set[str] = set()
+        self.watchlist_symbols: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def _fetch_all(self, table: str) -> List[Dict]:
+        rows = []
+        start = 0
+        while True:
+            # 🔥 페이지 경계가 고정되도록 id 순 정렬 (정렬 없는 offset 페이징은 행 누락/중복 가능)
+            result = self.supabase.table(table) \
+                .select("symbol, user_id") \
+                .order("id") \
+                .range(start, start + PAGE_SIZE - 1) \
+                .execute()
+
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+            start += PAGE_SIZE
+
+    def refresh(self) -> int:
+        """
+        portfolios + watchlist 전체 로드 후 역인덱스 재구성
+
+        Returns:
+            int: 구독 종목 수
+        """
+        portfolio_rows = self._fetch_all("portfolios")
+        watchlist_rows = self._fetch_all("watchlist")
+
+        users_by_symbol: Dict[str, Set[str]] = {}
+        for row in portfolio_rows + watchlist_rows:
+            if row.get("symbol") and row.get("user_id"):
+                users_by_symbol.setdefault(row["symbol"], set()).add(row["user_id"])
+
+        with self._lock:
+            self._users_by_symbol = users_by_symbol
+            self.portfolio_symbols = {row["symbol"] for row in portfolio_rows if row.get("symbol")}
+            self.watchlist_symbols = {row["symbol"] for row in watchlist_rows if row.get("symbol")}
+
+        return len(users_by_symbol)
+
+    @property
+    def symbols(self) -> Set[str]:
+        """보유 + 관심 종목 (중복 제거)"""
+        return set(self._users_by_symbol.keys())
+
+    def users_for(self, symbols: Iterable[str]) -> Set[str]:
+        """종목들을 보유/관심 중인 사용자 ID (중복 제거)"""
+        users = set()
+        for symbol in symbols:
+            users |= self._users_by_symbol.get(symbol, set())
+        return users
+
+
+def build_news_alerts(user_ids: Iterable[str], news_data: Dict, ai_result: Dict) -> List[Dict]:
+    """
+    영향도가 높은 뉴스 알림 행 생성 (DB 호출 없음)
+
+    Args:
+        user_ids: 알림 대상 사용자 ID
+        news_data: 뉴스 데이터
+        ai_result: AI 분석 결과
+
+    Returns:
+        List[Dict]: alerts 테이블 행
+    """
+    related_symbols = news_data.get("related_symbols", [])
+    impact_score = ai_result.get("impact_score", 0)
+    sentiment_score = ai_result.get("sentiment_score", 0)
+    recommended_action = ai_result.get("recommended_action", "hold")
+
+    # 감성에 따른 이모지
+    emoji = "📈" if sentiment_score > 0 else "📉" if sentiment_score < 0 else "📊"
+    action_text = ACTION_TEXT.get(recommended_action, "정보 확인")
+
+    return [
+        {
+            "user_id": user_id,
+            "type": "news",
+            "title": f"{emoji} 중요 뉴스 ({', '.join(related_symbols[:3])})",
+            "message": f"{news_data['title'][:100]}... [{action_text}]",
+            "params": {
+                "news_url": news_data.get("url"),
+                "impact_score": impact_score,
+                "sentiment_score": sentiment_score,
+                "recommended_action": recommended_action,
+                "related_symbols": related_symbols,
+            },
+            "status": "unread",
+        }
+        for user_id in user_ids
+    ]
+
+
+def bulk_insert_alerts(supabase: Client, alerts: List[Dict]) -> Tuple[int, int]:
+    """
+    알림 일괄 저장
+
+    Returns:
+        Tuple[int, int]: (저장된 알림 수, DB 호출 수)
+    """
+    saved = 0
+    calls = 0
+    for i in range(0, len(alerts), ALERT_INSERT_CHUNK_SIZE):
+        chunk = alerts[i:i + ALERT_INSERT_CHUNK_SIZE]
+        calls += 1
+        try:
+            supabase.table("alerts").insert(chunk).execute()
+            saved += len(chunk)
+        except Exception as e:
+            print(f"❌ 알림 일괄 저장 실패 ({len(chunk)}개): {str(e)}")
+    return saved, calls
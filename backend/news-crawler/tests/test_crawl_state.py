@@ -0,0 +1,50 @@
+"""
+crawl_state.py 단위 테스트
+
+총 3개 테스트:
+1. load() - 저장 전 기록은 다음 load()에 반영되지 않음 (저장 실패 시 재수집)
+2. save() - 저장한 상태는 다음 load()에서 이미 본 기사로 판단
+3. save() - 변경 없는 상태는 저장하지 않음
+"""
+import pytest
+from crawl_state import CrawlStateStore
+
+ARTICLE = {"url": "https://news.example.com/1", "published_at": "2026-10-18T09:00:00+00:00"}
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    return CrawlStateStore()
+
+
+@pytest.mark.unit
+class TestCrawlStateStore:
+    """증분 크롤링 상태 저장소 테스트"""
+
+    def test_unsaved_record_not_visible(self, store):
+        """1. 저장 전 기록은 다음 load()에 반영되지 않음 (저장 실패 시 재수집)"""
+        states = store.load("naver", ["삼성전자"])
+        states["삼성전자"].record([ARTICLE])
+
+        reloaded = store.load("naver", ["삼성전자"])["삼성전자"]
+
+        assert reloaded.is_initial
+        assert not reloaded.is_known(ARTICLE["url"])
+
+    def test_saved_record_visible(self, store):
+        """2. 저장한 상태는 다음 load()에서 이미 본 기사로 판단"""
+        states = store.load("naver", ["삼성전자"])
+        states["삼성전자"].record([ARTICLE])
+        store.save("naver", states)
+
+        reloaded = store.load("naver", ["삼성전자"])["삼성전자"]
+
+        assert reloaded.is_known(ARTICLE["url"])
+        assert store.load("google_news", ["삼성전자"])["삼성전자"].is_initial
+
+    def test_clean_state_not_saved(self, store):
+        """3. 변경 없는 상태는 저장하지 않음"""
+        store.save("naver", store.load("naver", ["삼성전자"]))
+
+        assert store._local == {}
@@ -0,0 +1,92 @@
+"""
+dart_disclosure_crawler.py 기업 코드 인덱스 단위 테스트
+
+총 2개 테스트:
+1. get_corp_code() - 다운로드 실패 후 재시도 대기 중에는 재다운로드하지 않음
+2. refresh_corp_codes() - ZIP 파싱 후 로컬 인덱스 저장 및 조회
+"""
+import io
+import zipfile
+import pytest
+from unittest.mock import patch
+import dart_disclosure_crawler as dart
+
+CORP_CODE_XML = (
+    "<result>"
+    "<list><corp_code>00126380</corp_code><corp_name>삼성전자</corp_name><stock_code>005930</stock_code></list>"
+    "<list><corp_code>00000001</corp_code><corp_name>비상장사</corp_name><stock_code> </stock_code></list>"
+    "</result>"
+)
+
+
+def _zip_bytes(xml: str) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as z:
+        z.writestr("CORPCODE.xml", xml)
+    return buffer.getvalue()
+
+
+class _FakeResponse:
+    def __init__(self, status: int, body: bytes = b""):
+        self.status = status
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class _FakeSession:
+    """aiohttp.ClientSession 대체 (요청 횟수 기록)"""
+    calls = 0
+    response = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def get(self, url, params=None, timeout=None):
+        type(self).calls += 1
+        return type(self).response
+
+
+@pytest.fixture
+def crawler(monkeypatch, tmp_path):
+    monkeypatch.setenv("DART_API_KEY", "test-key")
+    monkeypatch.setattr(dart, "DART_CORP_CODE_CACHE_PATH", str(tmp_path / "dart_corp_codes.json"))
+    _FakeSession.calls = 0
+    return dart.DartDisclosureCrawler()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestCorpCodeIndex:
+    """DART 기업 코드 인덱스 테스트"""
+
+    async def test_failure_backoff(self, crawler):
+        """1. 다운로드 실패 후 재시도 대기 중에는 재다운로드하지 않음"""
+        _FakeSession.response = _FakeResponse(500)
+
+        with patch.object(dart.aiohttp, "ClientSession", _FakeSession):
+            assert await crawler.get_corp_code("005930") is None
+            assert await crawler.get_corp_code("000660") is None
+
+        assert _FakeSession.calls == 1
+
+    async def test_refresh_builds_index(self, crawler):
+        """2. ZIP 파싱 후 로컬 인덱스 저장 및 조회"""
+        _FakeSession.response = _FakeResponse(200, _zip_bytes(CORP_CODE_XML))
+
+        with patch.object(dart.aiohttp, "ClientSession", _FakeSession):
+            assert await crawler.refresh_corp_codes() == 1
+            assert await crawler.get_corp_code("005930") == "00126380"
+
+        assert _FakeSession.calls == 1
+        assert dart.DartDisclosureCrawler()._corp_codes == {"005930": "00126380"}
@@ -0,0 +1,65 @@
+"""
+naver_api.py 단위 테스트
+
+총 1개 테스트:
+1. search_multiple_stocks() - 증분 크롤링 추가 페이지도 초당 요청 제한 토큰 소비
+"""
+import pytest
+import naver_api
+from naver_api import NaverNewsAPI
+from crawl_state import CrawlStateStore
+
+OLD_ARTICLE = {"url": "https://news.example.com/old", "published_at": "2026-10-01T09:00:00+00:00"}
+
+
+class CountingBucket:
+    """acquire 호출 수만 세는 TokenBucket 대역"""
+
+    instances = []
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.acquired = 0
+        CountingBucket.instances.append(self)
+
+    async def acquire(self, tokens: int = 1) -> float:
+        self.acquired += tokens
+        return 0.0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestNaverRateLimit:
+    """네이버 검색 초당 요청 제한 테스트"""
+
+    async def test_extra_pages_acquire_tokens(self, monkeypatch):
+        """1. 증분 크롤링 추가 페이지도 초당 요청 제한 토큰 소비"""
+        monkeypatch.setenv("NAVER_CLIENT_ID", "id")
+        monkeypatch.setenv("NAVER_CLIENT_SECRET", "secret")
+        monkeypatch.delenv("REDIS_URL", raising=False)
+        monkeypatch.setattr(naver_api, "TokenBucket", CountingBucket)
+        monkeypatch.setattr(naver_api, "NAVER_MAX_PAGES", 3)
+
+        # 이전 사이클 상태 (초기 크롤링 아님 → 페이지 넘김 허용)
+        store = CrawlStateStore()
+        states = store.load(NaverNewsAPI.SOURCE, ["삼성전자"])
+        states["삼성전자"].record([OLD_ARTICLE])
+        store.save(NaverNewsAPI.SOURCE, states)
+
+        api = NaverNewsAPI()
+        requests = []
+
+        async def search_news(query, display=10, start=1, sort="date", client=None):
+            requests.append(start)
+            return [
+                {"title": f"기사 {start + i}", "description": "", "link": f"https://news.example.com/{start + i}",
+                 "pubDate": "Sat, 18 Oct 2026 09:00:00 +0900"}
+                for i in range(display)
+            ]
+
+        monkeypatch.setattr(api, "search_news", search_news)
+
+        news, _ = await api.search_multiple_stocks(["삼성전자"], results_per_stock=2, client=object(), state_store=store)
+
+        assert requests == [1, 3, 5]
+        assert len(news) == 6
+        assert CountingBucket.instances[-1].acquired == len(requests)
@@ -0,0 +1,95 @@
+"""
+near_duplicate.py 단위 테스트
+
+총 6개 테스트:
+1. find() - 같은 종목의 전재 기사는 대표 기사에 연결
+2. find() - 종목명만 다른 정형화 시황 기사는 연결하지 않음
+3. warm_up() - DB 행의 related_symbols로 종목 집합 복원
+4. prune() - 보관 기간 지난 대표 기사 및 연결 제거
+5. find() - 조회 대상 자신의 URL은 대표 기사로 반환하지 않음
+6. remove() - 미저장 대표 기사 및 연결 제거 (재수집 시 다시 대표로 등록)
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from near_duplicate import NearDuplicateIndex, news_fingerprint, estimate_jaccard
+
+MARKET_WRAP = "18일 유가증권시장에서 외국인 투자자들이 대규모 순매수에 나서며 주가가 전 거래일 대비 2.5% 오른 채 장을 마감했다. 기관은 소폭 순매도했다."
+
+SAMSUNG_TITLE = "삼성전자, 외국인 순매수에 2.5% 상승 마감"
+SAMSUNG_CONTENT = f"삼성전자는 {MARKET_WRAP}"
+HYNIX_TITLE = "SK하이닉스, 외국인 순매수에 2.5% 상승 마감"
+HYNIX_CONTENT = f"SK하이닉스는 {MARKET_WRAP}"
+
+
+@pytest.mark.unit
+class TestNearDuplicateIndex:
+    """유사 뉴스 인덱스 테스트"""
+
+    def test_syndicated_article_linked(self):
+        """1. 같은 종목의 전재 기사는 대표 기사에 연결"""
+        index = NearDuplicateIndex()
+        index.add(news_fingerprint(SAMSUNG_TITLE, SAMSUNG_CONTENT), "https://a.example.com/1", symbols=["005930"])
+
+        fingerprint = news_fingerprint(f"{SAMSUNG_TITLE} - 한국경제", SAMSUNG_CONTENT)
+
+        assert index.find(fingerprint, ["005930"]) == "https://a.example.com/1"
+
+    def test_cross_stock_market_wrap_not_linked(self):
+        """2. 종목명만 다른 정형화 시황 기사는 연결하지 않음"""
+        samsung = news_fingerprint(SAMSUNG_TITLE, SAMSUNG_CONTENT)
+        hynix = news_fingerprint(HYNIX_TITLE, HYNIX_CONTENT)
+        assert estimate_jaccard(samsung, hynix) >= 0.7  # 텍스트만으로는 같은 기사로 판단되는 수준
+
+        index = NearDuplicateIndex()
+        index.add(samsung, "https://a.example.com/samsung", symbols=["005930"])
+
+        assert index.find(hynix, ["000660"]) is None
+        assert index.find(hynix, ["005930", "000660"]) is None
+
+    def test_warm_up_restores_symbols(self):
+        """3. warm_up() - DB 행의 related_symbols로 종목 집합 복원"""
+        index = NearDuplicateIndex()
+        index.warm_up([{
+            "url": "https://a.example.com/samsung",
+            "title": SAMSUNG_TITLE,
+            "content": SAMSUNG_CONTENT,
+            "published_at": datetime.now(timezone.utc).isoformat(),
+            "related_symbols": ["005930"],
+            "duplicate_urls": ["https://b.example.com/samsung"],
+        }])
+
+        assert index.find(news_fingerprint(HYNIX_TITLE, HYNIX_CONTENT), ["000660"]) is None
+        assert index.find(news_fingerprint(SAMSUNG_TITLE, SAMSUNG_CONTENT), ["005930"]) == "https://a.example.com/samsung"
+        assert index.representative_of("https://b.example.com/samsung") == "https://a.example.com/samsung"
+
+    def test_prune_expired(self):
+        """4. prune() - 보관 기간 지난 대표 기사 및 연결 제거"""
+        index = NearDuplicateIndex(retention_days=3)
+        old = datetime.now(timezone.utc) - timedelta(days=4)
+        index.add(news_fingerprint(SAMSUNG_TITLE, SAMSUNG_CONTENT), "https://a.example.com/old", old, ["005930"])
+        index.link("https://b.example.com/old", "https://a.example.com/old")
+
+        assert index.prune() == 1
+        assert len(index) == 0
+        assert index.representative_of("https://b.example.com/old") is None
+
+    def test_find_skips_own_url(self):
+        """5. find() - 조회 대상 자신의 URL은 대표 기사로 반환하지 않음"""
+        fingerprint = news_fingerprint(SAMSUNG_TITLE, SAMSUNG_CONTENT)
+        index = NearDuplicateIndex()
+        index.add(fingerprint, "https://a.example.com/1", symbols=["005930"])
+
+        assert index.find(fingerprint, ["005930"], "https://a.example.com/1") is None
+        assert index.find(fingerprint, ["005930"], "https://b.example.com/1") == "https://a.example.com/1"
+
+    def test_remove_unsaved_representative(self):
+        """6. remove() - 미저장 대표 기사 및 연결 제거 (재수집 시 다시 대표로 등록)"""
+        fingerprint = news_fingerprint(SAMSUNG_TITLE, SAMSUNG_CONTENT)
+        index = NearDuplicateIndex()
+        index.add(fingerprint, "https://a.example.com/1", symbols=["005930"])
+        index.link("https://b.example.com/1", "https://a.example.com/1")
+
+        assert index.remove(["https://a.example.com/1", "https://unknown.example.com"]) == 1
+        assert len(index) == 0
+        assert index.representative_of("https://b.example.com/1") is None
+        assert index.find(fingerprint, ["005930"]) is None
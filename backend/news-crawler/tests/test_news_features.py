@@ -0,0 +1,68 @@
+"""
+news_features.py 단위 테스트
+
+총 2개 테스트:
+1. flush() - 종목별 델타를 merge_news_symbol_features RPC 1회로 전달 + 대기 델타 비움
+2. flush() - RPC 실패 시 델타 복원 (flush 중 새로 record된 기사와 병합)
+"""
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from news_features import NewsFeatureStore
+
+PUBLISHED_AT = datetime(2026, 10, 18, 1, 0, tzinfo=timezone.utc).isoformat()
+
+
+def _news(url: str, impact: float = 0.5) -> dict:
+    return {
+        "title": "삼성전자 반도체 실적 개선",
+        "url": url,
+        "published_at": PUBLISHED_AT,
+        "sentiment_score": 0.6,
+        "impact_score": impact,
+        "related_symbols": ["005930"],
+    }
+
+
+@pytest.mark.unit
+class TestNewsFeatureStoreFlush:
+    """Feature Store flush 테스트"""
+
+    def test_flush_sends_deltas_via_rpc(self):
+        """1. 종목별 델타를 merge_news_symbol_features RPC 1회로 전달 + 대기 델타 비움"""
+        supabase = MagicMock()
+        store = NewsFeatureStore(supabase)
+        store.record(_news("https://a.example.com/1", impact=0.9))
+        store.record(_news("https://a.example.com/2"))
+
+        assert store.flush() == 1
+
+        supabase.rpc.assert_called_once()
+        name, params = supabase.rpc.call_args.args
+        assert name == "merge_news_symbol_features"
+        [row] = params["p_rows"]
+        assert row["symbol"] == "005930"
+        assert row["daily_buckets"]["2026-10-18"]["count"] == 2
+        assert [news["url"] for news in row["high_impact_news"]] == ["https://a.example.com/1"]
+        assert row["latest_published_at"] == PUBLISHED_AT
+        assert store.pending_symbols() == []
+        supabase.table.assert_not_called()  # 기존 행 조회 → upsert 없음
+
+    def test_flush_failure_restores_deltas(self):
+        """2. RPC 실패 시 델타 복원 (flush 중 새로 record된 기사와 병합)"""
+        supabase = MagicMock()
+        store = NewsFeatureStore(supabase)
+        store.record(_news("https://a.example.com/1"))
+
+        def fail(*args, **kwargs):
+            store.record(_news("https://a.example.com/2"))  # flush 도중 다른 요청이 기록
+            raise RuntimeError("db down")
+
+        supabase.rpc.return_value.execute.side_effect = fail
+
+        assert store.flush() == 0
+
+        supabase.rpc.return_value.execute.side_effect = None
+        assert store.flush() == 1
+        [row] = supabase.rpc.call_args.args[1]["p_rows"]
+        assert row["daily_buckets"]["2026-10-18"]["count"] == 2
@@ -171,7 +171,8 @@ async def analyze_with_gpt4(
     program_trading: List[Dict] = None,      # 🔥 Phase 1.3
     institutional_flow: Dict[str, Any] = None,  # 🔥 Phase 1.3
     sector_relative: Dict[str, Any] = None,  # 🔥 Phase 4.1: 업종 상대 평가
-    market_context: Dict[str, Any] = None    # 🔥 Phase 4.2: 시장 전체 맥락
+    market_context: Dict[str, Any] = None,   # 🔥 Phase 4.2: 시장 전체 맥락
+    news_trend: Dict[str, Any] = None        # 🔥 Feature Store 사전 집계 뉴스 트렌드
 ) -> Optional[Dict[str, Any]]:
     """
     🔥 Phase 1.3 개선: GPT-4 Turbo 기반 종목 분석 (뉴스 트렌드, 애널리스트 의견, 업종/시장 맥락 추가)
@@ -183,7 +184,8 @@ async def analyze_with_gpt4(
         Dict: AI 분석 결과 또는 None (실패 시)
     """
     # 🔥 Phase 1.3: 뉴스 트렌드 분석 (7일 50개 전체 분석)
-    news_trend = analyze_news_trend(news_data)
+    if news_trend is None:
+        news_trend = analyze_news_trend(news_data)
 
     # 🔥 Phase 3.2: 리스크 점수 계산 (0-100 정량화)
     stock_info = {
@@ -554,7 +556,8 @@ async def analyze_with_claude(
     program_trading: List[Dict] = None,      # 🔥 Phase 1.3
     institutional_flow: Dict[str, Any] = None,  # 🔥 Phase 1.3
     sector_relative: Dict[str, Any] = None,  # 🔥 Phase 4.1: 업종 상대 평가
-    market_context: Dict[str, Any] = None    # 🔥 Phase 4.2: 시장 전체 맥락
+    market_context: Dict[str, Any] = None,   # 🔥 Phase 4.2: 시장 전체 맥락
+    news_trend: Dict[str, Any] = None        # 🔥 Feature Store 사전 집계 뉴스 트렌드
 ) -> Optional[Dict[str, Any]]:
     """
     🔥 Phase 1.3 개선: Claude 3.5 Sonnet 기반 종목 분석 (리스크 분석 전문가, 뉴스 트렌드, 애널리스트 의견, 업종/시장 맥락 추가)
@@ -566,7 +569,8 @@ async def analyze_with_claude(
         Dict: AI 분석 결과 또는 None (실패 시)
     """
     # 🔥 Phase 1.3: 뉴스 트렌드 분석 (7일 50개 전체 분석)
-    news_trend = analyze_news_trend(news_data)
+    if news_trend is None:
+        news_trend = analyze_news_trend(news_data)
 
     # 🔥 Phase 3.2: 리스크 점수 계산 (0-100 정량화)
     stock_info = {
@@ -1096,7 +1100,8 @@ async def analyze_with_ensemble(
     program_trading: List[Dict] = None,      # 🔥 Phase 1.3
     institutional_flow: Dict[str, Any] = None,  # 🔥 Phase 1.3
     sector_relative: Dict[str, Any] = None,  # 🔥 Phase 4.1: 업종 상대 평가
-    market_context: Dict[str, Any] = None    # 🔥 Phase 4.2: 시장 전체 맥락
+    market_context: Dict[str, Any] = None,   # 🔥 Phase 4.2: 시장 전체 맥락
+    news_trend: Dict[str, Any] = None        # 🔥 Feature Store 사전 집계 뉴스 트렌드
 ) -> Dict[str, Any]:
     """
     🔥 Phase 1.3 개선: AI Ensemble 종목 분석 - GPT-4 + Claude 병렬 실행 후 투표 (확장 데이터 반영)
@@ -1117,6 +1122,7 @@ async def analyze_with_ensemble(
         sector_info: 업종 정보 (선택)
         sector_relative: 업종 상대 평가 (선택) - Phase 4.1
         market_context: 시장 전체 맥락 (선택) - Phase 4.2
+        news_trend: 사전 집계된 뉴스 트렌드 (선택) - 있으면 news_data 재집계 생략
         market_index: 시장 지수 (선택)
         credit_balance: 신용잔고 추이 (선택)
         short_selling: 공매도 추이 (선택)
@@ -1141,12 +1147,14 @@ async def analyze_with_ensemble(
         gpt4_task = analyze_with_gpt4(
             symbol, symbol_name, price_data, news_data, financial_data, investor_data,
             analyst_opinion, sector_info, market_index, credit_balance, short_selling,
-            program_trading, institutional_flow, sector_relative, market_context  # 🔥 Phase 4.1 & 4.2
+            program_trading, institutional_flow, sector_relative, market_context,  # 🔥 Phase 4.1 & 4.2
+            news_trend
         )
         claude_task = analyze_with_claude(
             symbol, symbol_name, price_data, news_data, financial_data, investor_data,
             analyst_opinion, sector_info, market_index, credit_balance, short_selling,
-            program_trading, institutional_flow, sector_relative, market_context  # 🔥 Phase 4.1 & 4.2
+            program_trading, institutional_flow, sector_relative, market_context,  # 🔥 Phase 4.1 & 4.2
+            news_trend
         )
 
         gpt4_result, claude_result = await asyncio.gather(gpt4_task, claude_task)
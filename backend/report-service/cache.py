@@ -2,12 +2,13 @@
 Redis 캐싱 모듈
 - 장 마감 시간 기준 동적 TTL 계산
 - 레포트 캐싱 및 조회
+- 종목별 보조 인덱스 (report-index:{symbol}) - KEYS/SCAN 없이 종목 단위 무효화
 """
 import os
 import json
 import redis
 from datetime import datetime, time, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 # Redis 클라이언트 (지연 초기화)
 redis_client = None
@@ -138,6 +139,19 @@ def get_cache_key(symbol: str, report_date: str) -> str:
     return f"report:{symbol}:{report_date}"
 
 
+def get_index_key(symbol: str) -> str:
+    """
+    종목별 보조 인덱스 키 (해당 종목의 캐시 키 Set)
+
+    Args:
+        symbol: 종목 코드
+
+    Returns:
+        str: Redis Set 키 (예: 'report-index:005930')
+    """
+    return f"report-index:{symbol}"
+
+
 def get_cached_report(symbol: str, report_date: str) -> Optional[Dict[str, Any]]:
     """
     캐시된 레포트 조회
@@ -195,8 +209,17 @@ def set_cached_report(symbol: str, report_date: str, report_data: Dict[str, Any]
         # JSON 직렬화 (datetime은 ISO format 문자열로 변환)
         serialized_data = json.dumps(report_data, ensure_ascii=False, default=str)
 
-        # Redis에 저장
-        client.setex(cache_key, ttl, serialized_data)
+        # 🔥 레포트 저장 + 종목 인덱스 등록 (파이프라인 1회 왕복)
+        index_key = get_index_key(symbol)
+        pipe = client.pipeline(transaction=False)
+        pipe.setex(cache_key, ttl, serialized_data)
+        pipe.sadd(index_key, cache_key)
+        pipe.ttl(index_key)
+        _, _, index_ttl = pipe.execute()
+
+        # 인덱스는 가장 늦게 만료되는 레포트보다 먼저 사라지지 않도록 TTL 연장만
+        if index_ttl < ttl:
+            client.expire(index_key, ttl)
 
         print(f"✅ 캐시 저장 성공: {cache_key} (TTL: {ttl // 60}분)")
         return True
@@ -224,7 +247,10 @@ def delete_cached_report(symbol: str, report_date: str) -> bool:
             return False
 
         cache_key = get_cache_key(symbol, report_date)
-        result = client.delete(cache_key)
+        pipe = client.pipeline(transaction=False)
+        pipe.delete(cache_key)
+        pipe.srem(get_index_key(symbol), cache_key)
+        result, _ = pipe.execute()
 
         if result > 0:
             print(f"✅ 캐시 삭제 성공: {cache_key}")
@@ -237,3 +263,119 @@ def delete_cached_report(symbol: str, report_date: str) -> bool:
         cache_stats["errors"] += 1
         print(f"⚠️ Redis 삭제 오류: {str(e)}")
         return False
+
+
+def delete_symbol_reports(symbol: str) -> int:
+    """
+    종목의 모든 캐시 레포트 삭제 (보조 인덱스 기반, 키스페이스 스캔 없음)
+
+    Args:
+        symbol: 종목 코드
+
+    Returns:
+        int: 삭제된 레포트 캐시 수
+    """
+    try:
+        client = get_redis_client()
+        if client is None:
+            return 0
+
+        index_key = get_index_key(symbol)
+        cache_keys = list(client.smembers(index_key))
+
+        pipe = client.pipeline(transaction=False)
+        if cache_keys:
+            pipe.delete(*cache_keys)
+        pipe.delete(index_key)
+        results = pipe.execute()
+
+        deleted = results[0] if cache_keys else 0
+        print(f"✅ 종목 캐시 삭제: {symbol} ({deleted}건)")
+        return deleted
+
+    except Exception as e:
+        cache_stats["errors"] += 1
+        print(f"⚠️ Redis 종목 캐시 삭제 오류: {str(e)}")
+        return 0
+
+
+def _describe_keys(client, cache_keys: List[str]) -> List[Dict[str, Any]]:
+    """캐시 키 목록의 TTL/크기를 파이프라인 1회로 조회 (만료된 키는 제외 + 종목 인덱스에서 정리)"""
+    pipe = client.pipeline(transaction=False)
+    for key in cache_keys:
+        pipe.ttl(key)
+        pipe.strlen(key)
+    results = pipe.execute()
+
+    reports = []
+    expired: Dict[str, List[str]] = {}
+    for i, key in enumerate(cache_keys):
+        ttl_seconds, size_bytes = results[2 * i], results[2 * i + 1]
+
+        # 키 파싱: report:{symbol}:{report_date}
+        parts = key.split(":")
+        if len(parts) != 3:
+            continue
+        if ttl_seconds == -2:
+            expired.setdefault(parts[1], []).append(key)
+            continue
+
+        reports.append({
+            "symbol": parts[1],
+            "report_date": parts[2],
+            "cache_key": key,
+            "ttl_seconds": ttl_seconds,
+            "ttl_minutes": ttl_seconds // 60 if ttl_seconds > 0 else 0,
+            "size_bytes": size_bytes
+        })
+
+    # 🔥 인덱스 TTL은 연장만 되므로 만료된 레포트 키가 멤버로 남음 - 조회 시점에 SREM으로 정리
+    if expired:
+        pipe = client.pipeline(transaction=False)
+        for symbol, keys in expired.items():
+            pipe.srem(get_index_key(symbol), *keys)
+        pipe.execute()
+    return reports
+
+
+def list_cached_reports(cursor: int = 0, count: int = 100, symbol: Optional[str] = None) -> Dict[str, Any]:
+    """
+    캐시된 레포트 목록 조회 (SCAN 커서 페이지네이션)
+
+    Args:
+        cursor: 이전 응답의 next_cursor (0이면 처음부터)
+        count: 페이지당 목표 개수 (SCAN 특성상 약간 초과 가능)
+        symbol: 지정 시 종목 인덱스에서 바로 조회 (커서 무시)
+
+    Returns:
+        Dict: cached_reports, total(이번 페이지 개수), next_cursor(0이면 마지막), has_more
+    """
+    client = get_redis_client()
+    if client is None:
+        return {"cached_reports": [], "total": 0, "next_cursor": 0, "has_more": False,
+                "message": "Redis not available"}
+
+    if symbol:
+        cache_keys = sorted(client.smembers(get_index_key(symbol)))
+        next_cursor = 0
+    else:
+        # 🔥 KEYS 대신 SCAN - 키스페이스 전체를 한 번에 막지 않음
+        cache_keys = []
+        next_cursor = cursor
+        while True:
+            next_cursor, batch = client.scan(cursor=next_cursor, match="report:*", count=count)
+            cache_keys.extend(batch)
+            if next_cursor == 0 or len(cache_keys) >= count:
+                break
+
+    cached_reports = _describe_keys(client, cache_keys) if cache_keys else []
+
+    # 종목코드 순으로 정렬 (페이지 내)
+    cached_reports.sort(key=lambda x: (x["symbol"], x["report_date"]))
+
+    return {
+        "cached_reports": cached_reports,
+        "total": len(cached_reports),
+        "next_cursor": next_cursor,
+        "has_more": next_cursor != 0
+    }
@@ -14,14 +14,16 @@ import asyncio
 from datetime import datetime, date, timedelta, timezone
 from typing import Optional, List, Dict, Any
 from urllib.parse import quote
-from fastapi import FastAPI, HTTPException, Header, Response
+from fastapi import FastAPI, HTTPException, Header, Response, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
 # 🔥 하이브리드 뉴스 크롤링 모듈 임포트
-from realtime_news_fetcher import get_news_hybrid, get_news_db_only
+from realtime_news_fetcher import get_news_hybrid, get_news_db_only, warm_up_stock_master_index
+from news_features import get_precomputed_news_trend
+from jwt_verifier import jwt_verifier, TokenVerificationError, VerifierNotConfigured
 
 print("=" * 60)
 print("🚀 Report Service 초기화 시작...")
@@ -250,7 +252,23 @@ def get_user_id_from_token(authorization: Optional[str]) -> str:
         )
 
     try:
-        # 3. Supabase Auth를 통한 토큰 검증
+        # 3. 로컬 JWT 검증 (서명/만료/audience, Auth 서버 왕복 없음)
+        claims = jwt_verifier.verify(token)
+        return claims["sub"]
+
+    except VerifierNotConfigured:
+        # SUPABASE_JWT_SECRET 미설정 시 Supabase Auth 검증으로 대체
+        pass
+
+    except TokenVerificationError as e:
+        print(f"⚠️ JWT 검증 실패: {str(e)}")
+        raise HTTPException(
+            status_code=401,
+            detail="유효하지 않은 토큰"
+        )
+
+    try:
+        # 4. Supabase Auth를 통한 토큰 검증
         user = supabase.auth.get_user(token)
 
         if not user or not user.user:
@@ -398,6 +416,12 @@ def prepare_chart_data(
 
 # ========== API 엔드포인트 ==========
 
+@app.on_event("startup")
+async def startup_event():
+    """종목 마스터 인덱스 미리 로드 (첫 뉴스 조회 요청에서 동기 전체 로드 방지)"""
+    await warm_up_stock_master_index()
+
+
 @app.get("/health")
 async def health():
     """헬스 체크"""
@@ -456,53 +480,52 @@ async def get_cache_statistics():
 
 # 🔥 캐시 관리 엔드포인트 (관리자 전용)
 @app.get("/api/cache/reports")
-async def list_cached_reports():
+async def list_cached_reports(
+    cursor: int = Query(0, ge=0, description="이전 응답의 next_cursor (0이면 처음부터)"),
+    count: int = Query(100, ge=1, le=1000, description="페이지당 목표 개수"),
+    symbol: Optional[str] = Query(None, description="종목 코드 (지정 시 종목 인덱스 조회)")
+):
     """
-    캐시된 레포트 목록 조회
+    캐시된 레포트 목록 조회 (SCAN 커서 페이지네이션)
 
     Returns:
-        List[Dict]: 캐시된 레포트 키 목록 (symbol, report_date, ttl)
+        Dict: cached_reports (symbol, report_date, ttl, size_bytes), next_cursor, has_more
     """
     try:
-        from cache import get_redis_client
+        from cache import list_cached_reports as scan_cached_reports
 
-        client = get_redis_client()
-        if client is None:
-            return {"cached_reports": [], "message": "Redis not available"}
+        return scan_cached_reports(cursor=cursor, count=count, symbol=symbol)
 
-        # report:* 패턴으로 캐시 키 조회
-        keys = client.keys("report:*")
+    except Exception as e:
+        print(f"❌ 캐시 목록 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"캐시 목록 조회 실패: {str(e)}")
 
-        cached_reports = []
-        for key in keys:
-            # 키 파싱: report:{symbol}:{report_date}
-            parts = key.split(":")
-            if len(parts) == 3:
-                symbol = parts[1]
-                report_date = parts[2]
 
-                # TTL 조회 (초 단위)
-                ttl_seconds = client.ttl(key)
+@app.delete("/api/cache/reports/{symbol}")
+async def delete_symbol_reports_endpoint(symbol: str):
+    """
+    종목의 모든 레포트 캐시 삭제 (종목 인덱스 기반)
+
+    Args:
+        symbol: 종목 코드 (예: 005930)
 
-                cached_reports.append({
-                    "symbol": symbol,
-                    "report_date": report_date,
-                    "cache_key": key,
-                    "ttl_seconds": ttl_seconds,
-                    "ttl_minutes": ttl_seconds // 60 if ttl_seconds > 0 else 0
-                })
+    Returns:
+        Dict: 삭제 결과
+    """
+    try:
+        from cache import delete_symbol_reports
 
-        # 종목코드 순으로 정렬
-        cached_reports.sort(key=lambda x: (x["symbol"], x["report_date"]))
+        deleted = delete_symbol_reports(symbol)
 
         return {
-            "cached_reports": cached_reports,
-            "total": len(cached_reports)
+            "message": f"종목 캐시 삭제: {symbol} ({deleted}건)",
+            "symbol": symbol,
+            "deleted": deleted
         }
 
     except Exception as e:
-        print(f"❌ 캐시 목록 조회 실패: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"캐시 목록 조회 실패: {str(e)}")
+        print(f"❌ 종목 캐시 삭제 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"종목 캐시 삭제 실패: {str(e)}")
 
 
 @app.delete("/api/cache/reports/{symbol}/{report_date}")
@@ -625,26 +648,39 @@ async def generate_report(
                 print(f"⚠️ 고급 데이터 조회 실패: {str(e)}")
                 return {}
 
+        use_ensemble = os.getenv("USE_AI_ENSEMBLE", "true").lower() == "true"
+
         async def safe_get_news():
+            """(뉴스 리스트, 사전 집계 뉴스 트렌드) 반환"""
+            threshold_hours = int(os.getenv("NEWS_FRESHNESS_THRESHOLD", "12"))
+
+            # 🔥 Feature Store 우선 (종목별 집계 1행 조회, 최신 뉴스가 임계값 이내일 때만)
+            #    뉴스 트렌드만 쓰는 앙상블 경로 전용 - 단일 모델(analyze_stock)은 뉴스 원문 리스트가 필요
+            if use_ensemble:
+                news_trend = await get_precomputed_news_trend(symbol, max_age_hours=threshold_hours)
+                if news_trend:
+                    return news_trend["high_impact_news"], news_trend
+
             try:
                 # 🔥 하이브리드 뉴스 조회 (DB 우선 → 12시간 이상 오래되었으면 실시간 크롤링)
-                threshold_hours = int(os.getenv("NEWS_FRESHNESS_THRESHOLD", "12"))
                 max_fresh_news = int(os.getenv("REALTIME_CRAWL_MAX_RESULTS", "10"))
+                stale_while_revalidate = os.getenv("NEWS_STALE_WHILE_REVALIDATE", "true").lower() == "true"
 
                 return await get_news_hybrid(
                     symbol=symbol,
-                    stock_name=None,  # 내부에서 stock_master 조회
+                    stock_name=None,  # 내부에서 종목 마스터 인덱스 조회
                     threshold_hours=threshold_hours,
-                    max_fresh_news=max_fresh_news
-                )
+                    max_fresh_news=max_fresh_news,
+                    stale_while_revalidate=stale_while_revalidate  # 🔥 오래된 뉴스면 백그라운드 갱신
+                ), None
             except Exception as e:
                 print(f"⚠️ 하이브리드 뉴스 조회 실패: {str(e)}")
                 # 폴백: DB 전용 조회
                 try:
-                    return await get_news_db_only(symbol)
+                    return await get_news_db_only(symbol), None
                 except Exception as fallback_error:
                     print(f"❌ DB 전용 뉴스 조회도 실패: {str(fallback_error)}")
-                    return []
+                    return [], None
 
         # 🔥 Phase 1.2: 신규 데이터 조회 함수 7개
         async def safe_get_analyst_opinion():
@@ -701,7 +737,7 @@ async def generate_report(
             financial_data,
             investor_data,
             advanced_data,
-            news_data,
+            (news_data, news_trend),
             analyst_opinion,
             sector_info,
             credit_balance,
@@ -766,8 +802,10 @@ async def generate_report(
                 "market_breadth_pct": 50
             }
 
+        news_count = news_trend["total_count"] if news_trend else len(news_data)
+
         print(f"✅ 데이터 조회 완료 (병렬 처리)")
-        print(f"   - 뉴스: {len(news_data)}개")
+        print(f"   - 뉴스: {news_count}개{' (Feature Store)' if news_trend else ''}")
         print(f"   - 고급 데이터: {'✅' if advanced_data else '❌'}")
 
         # 3. 기술적 지표 계산 (고급 지표 포함)
@@ -781,7 +819,6 @@ async def generate_report(
 
         # 4. AI 앙상블 분석 (GPT-4 + Claude)
         print(f"🤖 AI Ensemble 분석 시작...")
-        use_ensemble = os.getenv("USE_AI_ENSEMBLE", "true").lower() == "true"
 
         if use_ensemble:
             # 🔥 Phase 1.3: 확장된 데이터를 AI Ensemble에 전달
@@ -800,7 +837,8 @@ async def generate_report(
                 program_trading=program_trading,
                 institutional_flow=institutional_flow,
                 sector_relative=sector_relative,  # 🔥 Phase 4.1: 업종 상대 평가
-                market_context=market_context  # 🔥 Phase 4.2: 시장 전체 맥락
+                market_context=market_context,  # 🔥 Phase 4.2: 시장 전체 맥락
+                news_trend=news_trend  # 🔥 Feature Store 사전 집계 (없으면 news_data 재집계)
             )
         else:
             # 폴백: 단일 모델 (GPT-4)
@@ -969,7 +1007,7 @@ async def generate_report(
             },
 
             # 관련 뉴스
-            "related_news_count": len(news_data),
+            "related_news_count": news_count,
 
             # 🔥 Phase 1.2: 신규 데이터 7개
             "analyst_opinion": {
@@ -1328,7 +1366,18 @@ async def generate_report_internal(symbol: str, symbol_name: str) -> Dict[str, A
             print(f"⚠️ 고급 데이터 조회 실패: {str(e)}")
             return {}
 
+    use_ensemble = os.getenv("USE_AI_ENSEMBLE", "true").lower() == "true"
+
     async def safe_get_news():
+        """(뉴스 리스트, 사전 집계 뉴스 트렌드) 반환"""
+        threshold_hours = int(os.getenv("NEWS_FRESHNESS_THRESHOLD", "12"))
+
+        # 🔥 Feature Store는 앙상블 경로 전용 (단일 모델은 뉴스 원문 리스트로 프롬프트 구성)
+        if use_ensemble:
+            news_trend = await get_precomputed_news_trend(symbol, max_age_hours=threshold_hours)
+            if news_trend:
+                return news_trend["high_impact_news"], news_trend
+
         try:
             seven_days_ago = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
             result = supabase.from_("news") \
@@ -1338,10 +1387,10 @@ async def generate_report_internal(symbol: str, symbol_name: str) -> Dict[str, A
                 .order("published_at", desc=True) \
                 .limit(50) \
                 .execute()
-            return result.data or []
+            return result.data or [], None
         except Exception as e:
             print(f"⚠️ 뉴스 조회 실패: {str(e)}")
-            return []
+            return [], None
 
     async def safe_get_analyst_opinion():
         try:
@@ -1396,7 +1445,7 @@ async def generate_report_internal(symbol: str, symbol_name: str) -> Dict[str, A
         financial_data,
         investor_data,
         advanced_data,
-        news_data,
+        (news_data, news_trend),
         analyst_opinion,
         sector_info,
         credit_balance,
@@ -1462,8 +1511,6 @@ async def generate_report_internal(symbol: str, symbol_name: str) -> Dict[str, A
     chart_data = prepare_chart_data(ohlcv_data, indicators)
 
     # 4. AI 분석
-    use_ensemble = os.getenv("USE_AI_ENSEMBLE", "true").lower() == "true"
-
     if use_ensemble:
         ai_result = await analyze_with_ensemble(
             symbol,
@@ -1480,7 +1527,8 @@ async def generate_report_internal(symbol: str, symbol_name: str) -> Dict[str, A
             program_trading=program_trading,
             institutional_flow=institutional_flow,
             sector_relative=sector_relative,
-            market_context=market_context
+            market_context=market_context,
+            news_trend=news_trend
         )
     else:
         ai_result = await analyze_stock(symbol, symbol_name, indicators, news_data)
@@ -0,0 +1,254 @@
+"""
+🔥 종목별 뉴스 Feature Store
+기사 저장 시점에 종목별 롤링 집계(1/3/7일 감성, 영향도, 건수, 키워드)를 증분 갱신
+
+- 기사 저장 시 record()로 일자별 버킷에 델타 누적 (메모리)
+- 저장 단위 종료 시 flush()로 merge_news_symbol_features RPC 1회 호출
+  (news-crawler: 크롤링 사이클마다 / report-service: 실시간 크롤링 저장마다)
+  → 기존 버킷 + 델타 병합은 DB의 INSERT ... ON CONFLICT 안에서 (여러 writer 동시 flush 시 증분 유실 없음)
+- Report Service는 뉴스 50건 대신 news_symbol_features 1행만 조회 + compute_features()로 1/3/7일 윈도우 계산
+- news-crawler(news_features.py) / report-service(news_feature_store.py)에 동일 파일로 포함 (서비스별 독립 배포)
+"""
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional
+from supabase import Client
+
+FEATURE_TABLE = "news_symbol_features"
+
+# 롤링 윈도우 (일)
+FEATURE_WINDOWS = (1, 3, 7)
+BUCKET_RETENTION_DAYS = 7
+
+# 고영향도 뉴스 기준 (report-service analyze_news_trend와 동일)
+HIGH_IMPACT_THRESHOLD = 0.7
+MAX_HIGH_IMPACT_NEWS = 5
+
+# 버킷당 보관할 키워드 수 (행 크기 제한)
+MAX_BUCKET_KEYWORDS = 30
+TOP_KEYWORDS = 5
+
+# 불용어 (report-service analyze_news_trend와 동일)
+KEYWORD_STOPWORDS = {"있는", "있다", "하는", "그리고", "이번", "올해", "작년", "지난", "최근"}
+
+
+def extract_title_keywords(title: str) -> List[str]:
+    """제목에서 키워드 추출 (2글자 이상 한글/영문 단어, 불용어 제외)"""
+    words = [word.strip() for word in (title or "").split() if len(word) >= 2 and word.isalpha()]
+    return [w for w in words if w not in KEYWORD_STOPWORDS]
+
+
+def _empty_bucket() -> Dict[str, Any]:
+    return {
+        "count": 0,
+        "sentiment_sum": 0.0,
+        "impact_sum": 0.0,
+        "positive": 0,
+        "negative": 0,
+        "keywords": {}
+    }
+
+
+def _merge_bucket(target: Dict[str, Any], delta: Dict[str, Any]):
+    """일자별 버킷 병합 (delta → target)"""
+    for key in ("count", "sentiment_sum", "impact_sum", "positive", "negative"):
+        target[key] = target.get(key, 0) + delta.get(key, 0)
+
+    keywords = Counter(target.get("keywords", {}))
+    keywords.update(delta.get("keywords", {}))
+    target["keywords"] = dict(keywords.most_common(MAX_BUCKET_KEYWORDS))
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def compute_window_features(buckets: Dict[str, Dict[str, Any]], days: int, today) -> Dict[str, Any]:
+    """
+    최근 N일 버킷 합산
+
+    Args:
+        buckets: {YYYY-MM-DD: 버킷}
+        days: 윈도우 크기 (일)
+        today: 기준 날짜 (UTC date)
+
+    Returns:
+        Dict: 윈도우 집계 (count, avg_sentiment_score, avg_impact_score, ratio, top_keywords)
+    """
+    start = today - timedelta(days=days - 1)
+    total = _empty_bucket()
+
+    for day_str, bucket in buckets.items():
+        try:
+            day = datetime.strptime(day_str, "%Y-%m-%d").date()
+        except ValueError:
+            continue
+        if start <= day <= today:
+            _merge_bucket(total, bucket)
+
+    count = total["count"]
+    neutral = count - total["positive"] - total["negative"]
+
+    return {
+        "count": count,
+        "positive_count": total["positive"],
+        "negative_count": total["negative"],
+        "neutral_count": neutral,
+        "positive_ratio": round(total["positive"] / count * 100, 1) if count else 0.0,
+        "negative_ratio": round(total["negative"] / count * 100, 1) if count else 0.0,
+        "avg_sentiment_score": round(total["sentiment_sum"] / count, 2) if count else 0.0,
+        "avg_impact_score": round(total["impact_sum"] / count, 2) if count else 0.0,
+        "sentiment_sum": total["sentiment_sum"],
+        "top_keywords": [word for word, _ in Counter(total["keywords"]).most_common(TOP_KEYWORDS)]
+    }
+
+
+def compute_features(buckets: Dict[str, Dict[str, Any]], now: datetime = None) -> Dict[str, Any]:
+    """
+    버킷으로부터 1/3/7일 윈도우 Feature 계산
+
+    Returns:
+        Dict: {"1d": {...}, "3d": {...}, "7d": {...}, "recent_sentiment_change": 개선/악화/불변}
+    """
+    today = (now or datetime.now(timezone.utc)).date()
+    features = {f"{days}d": compute_window_features(buckets, days, today) for days in FEATURE_WINDOWS}
+
+    # 최근 감성 변화 (최근 3일 vs 이전 4일)
+    recent = features["3d"]
+    week = features["7d"]
+    older_count = week["count"] - recent["count"]
+
+    sentiment_change = "불변"
+    if recent["count"] and older_count > 0:
+        recent_avg = recent["sentiment_sum"] / recent["count"]
+        older_avg = (week["sentiment_sum"] - recent["sentiment_sum"]) / older_count
+
+        if recent_avg > older_avg + 0.1:
+            sentiment_change = "개선"
+        elif recent_avg < older_avg - 0.1:
+            sentiment_change = "악화"
+
+    features["recent_sentiment_change"] = sentiment_change
+    return features
+
+
+class NewsFeatureStore:
+    """종목별 뉴스 롤링 집계 저장소"""
+
+    def __init__(self, supabase_client: Client):
+        """
+        Args:
+            supabase_client: Supabase 클라이언트
+        """
+        self.supabase = supabase_client
+        self._bucket_deltas: Dict[str, Dict[str, Dict[str, Any]]] = {}  # {종목: {날짜: 버킷}}
+        self._high_impact: Dict[str, List[Dict[str, Any]]] = {}
+        self._latest: Dict[str, datetime] = {}
+        self._lock = threading.Lock()  # flush(스레드)와 record 동시 실행 시 델타 유실 방지
+
+    def record(self, news_data: Dict[str, Any]):
+        """
+        저장된 기사 1건을 관련 종목 버킷에 누적
+
+        Args:
+            news_data: news 테이블에 저장된 행 (related_symbols, sentiment_score, impact_score 등)
+        """
+        symbols = news_data.get("related_symbols") or []
+        if not symbols:
+            return
+
+        published_at = _parse_datetime(news_data.get("published_at")) or datetime.now(timezone.utc)
+        day_str = published_at.astimezone(timezone.utc).date().isoformat()
+
+        sentiment = news_data.get("sentiment_score") or 0
+        impact = news_data.get("impact_score") or 0
+        keywords = Counter(extract_title_keywords(news_data.get("title", "")))
+
+        with self._lock:
+            for symbol in symbols:
+                bucket = self._bucket_deltas.setdefault(symbol, {}).setdefault(day_str, _empty_bucket())
+                _merge_bucket(bucket, {
+                    "count": 1,
+                    "sentiment_sum": sentiment,
+                    "impact_sum": impact,
+                    "positive": 1 if sentiment > 0 else 0,
+                    "negative": 1 if sentiment < 0 else 0,
+                    "keywords": keywords
+                })
+
+                if impact >= HIGH_IMPACT_THRESHOLD:
+                    self._high_impact.setdefault(symbol, []).append({
+                        "title": news_data.get("title"),
+                        "summary": news_data.get("summary"),
+                        "url": news_data.get("url"),
+                        "sentiment_score": sentiment,
+                        "impact_score": impact,
+                        "published_at": published_at.isoformat()
+                    })
+
+                if symbol not in self._latest or published_at > self._latest[symbol]:
+                    self._latest[symbol] = published_at
+
+    def pending_symbols(self) -> List[str]:
+        """flush 대기 중인 종목 목록"""
+        with self._lock:
+            return list(self._bucket_deltas.keys())
+
+    def flush(self) -> int:
+        """
+        누적된 델타를 DB에서 기존 행과 원자적으로 병합 (RPC 1회)
+
+        Returns:
+            int: 갱신된 종목 수
+        """
+        # 🔥 대기 델타를 떼어낸 뒤 호출 (flush 중 record된 기사는 다음 flush로)
+        with self._lock:
+            bucket_deltas, high_impact, latest = self._bucket_deltas, self._high_impact, self._latest
+            self._bucket_deltas, self._high_impact, self._latest = {}, {}, {}
+
+        if not bucket_deltas:
+            return 0
+
+        rows = [
+            {
+                "symbol": symbol,
+                "daily_buckets": buckets,
+                "high_impact_news": high_impact.get(symbol, []),
+                "latest_published_at": latest[symbol].isoformat()
+            }
+            for symbol, buckets in bucket_deltas.items()
+        ]
+
+        try:
+            self.supabase.rpc("merge_news_symbol_features", {
+                "p_rows": rows,
+                "p_retention_days": BUCKET_RETENTION_DAYS,
+                "p_max_high_impact": MAX_HIGH_IMPACT_NEWS,
+                "p_max_keywords": MAX_BUCKET_KEYWORDS
+            }).execute()
+
+            print(f"📊 [Feature Store] {len(rows)}개 종목 뉴스 집계 갱신")
+            return len(rows)
+
+        except Exception as e:
+            # 실패 시 델타 복원 → 다음 flush에 재시도
+            with self._lock:
+                for symbol, buckets in bucket_deltas.items():
+                    pending = self._bucket_deltas.setdefault(symbol, {})
+                    for day_str, delta in buckets.items():
+                        _merge_bucket(pending.setdefault(day_str, _empty_bucket()), delta)
+                for symbol, news in high_impact.items():
+                    self._high_impact.setdefault(symbol, []).extend(news)
+                for symbol, published_at in latest.items():
+                    if symbol not in self._latest or published_at > self._latest[symbol]:
+                        self._latest[symbol] = published_at
+
+            print(f"❌ [Feature Store] 집계 갱신 실패: {str(e)}")
+            return 0
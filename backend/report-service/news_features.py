@@ -0,0 +1,92 @@
+"""
+🔥 종목별 뉴스 Feature Store 조회 모듈 (Report Service용)
+
+news-crawler(크롤링 사이클) / 실시간 크롤링 저장(realtime_news_fetcher)이 갱신하는 news_symbol_features 1행을 읽어
+analyze_news_trend()와 동일한 형식의 뉴스 트렌드로 변환
+- 뉴스 50건 조회 + 매 요청 재집계 → 종목당 1행 조회로 대체
+- 1/3/7일 윈도우는 조회 시 daily_buckets(최대 7개)로 계산 (writer 여러 개가 동시 병합해도 항상 최신 버킷 기준)
+- 행이 없거나 오래되었으면 None 반환 (기존 하이브리드 조회로 폴백)
+"""
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+from realtime_news_fetcher import get_supabase_client
+from news_feature_store import compute_features
+
+FEATURE_TABLE = "news_symbol_features"
+
+
+def news_features_to_trend(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    news_symbol_features 행 → 뉴스 트렌드 변환
+
+    Args:
+        row: news_symbol_features 행 (daily_buckets, high_impact_news, latest_published_at)
+
+    Returns:
+        Dict: analyze_news_trend() 반환값과 동일한 키 + windows (1d/3d/7d 집계)
+    """
+    features = compute_features(row.get("daily_buckets") or {})
+    week = features.get("7d") or {}
+
+    return {
+        "total_count": week.get("count", 0),
+        "positive_count": week.get("positive_count", 0),
+        "negative_count": week.get("negative_count", 0),
+        "neutral_count": week.get("neutral_count", 0),
+        "positive_ratio": week.get("positive_ratio", 0.0),
+        "negative_ratio": week.get("negative_ratio", 0.0),
+        "avg_sentiment_score": week.get("avg_sentiment_score", 0.0),
+        "avg_impact_score": week.get("avg_impact_score", 0.0),
+        "high_impact_news": row.get("high_impact_news") or [],
+        "trending_keywords": week.get("top_keywords", []),
+        "recent_sentiment_change": features.get("recent_sentiment_change", "불변"),
+        "windows": {key: features[key] for key in ("1d", "3d", "7d") if key in features},
+        "latest_published_at": row.get("latest_published_at"),
+        "source": "feature_store"
+    }
+
+
+async def get_precomputed_news_trend(
+    symbol: str,
+    max_age_hours: int = 12
+) -> Optional[Dict[str, Any]]:
+    """
+    Feature Store에서 종목 뉴스 트렌드 조회
+
+    Args:
+        symbol: 종목 코드
+        max_age_hours: 최신 뉴스 허용 경과 시간 (초과 시 None → 실시간 크롤링 경로 사용)
+
+    Returns:
+        Optional[Dict]: 뉴스 트렌드 또는 None
+    """
+    try:
+        result = get_supabase_client().table(FEATURE_TABLE) \
+            .select("daily_buckets, high_impact_news, latest_published_at") \
+            .eq("symbol", symbol) \
+            .limit(1) \
+            .execute()
+
+        if not result.data:
+            print(f"ℹ️ 뉴스 Feature 없음: {symbol} (하이브리드 조회 사용)")
+            return None
+
+        row = result.data[0]
+        latest_str = row.get("latest_published_at")
+        if not latest_str:
+            return None
+
+        latest = datetime.fromisoformat(latest_str.replace('Z', '+00:00'))
+        age_hours = (datetime.now(timezone.utc) - latest).total_seconds() / 3600
+
+        if age_hours >= max_age_hours:
+            print(f"⚠️ 뉴스 Feature 오래됨: {symbol} - 최신 뉴스 {age_hours:.1f}시간 전 (하이브리드 조회 사용)")
+            return None
+
+        trend = news_features_to_trend(row)
+        print(f"✅ 뉴스 Feature 사용: {symbol} - 7일 {trend['total_count']}개 (최신 {age_hours:.1f}시간 전)")
+        return trend
+
+    except Exception as e:
+        print(f"⚠️ 뉴스 Feature 조회 실패: {str(e)}")
+        return None
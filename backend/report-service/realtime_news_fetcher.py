@@ -4,10 +4,13 @@
 하이브리드 뉴스 fetching 전략:
 1. DB에서 최신 뉴스 조회
 2. 최신 뉴스가 12시간 이상 오래되었으면 실시간 크롤링 트리거
+   - 🔥 stale-while-revalidate: DB 뉴스로 즉시 응답, 크롤링은 백그라운드 실행 (다음 요청부터 반영)
 3. AI 분석 후 DB에 저장
 4. DB 뉴스 + 신규 뉴스 병합하여 반환
 """
 import os
+import json
+import asyncio
 import httpx
 import feedparser
 import re
@@ -15,6 +18,8 @@ from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Tuple, Any
 from urllib.parse import quote_plus
 from supabase import create_client, Client
+from stock_master_index import StockMasterIndex
+from news_feature_store import NewsFeatureStore
 
 # 환경 변수
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -23,6 +28,12 @@ AI_SERVICE_URL = os.getenv("AI_SERVICE_URL", "http://localhost:8002")
 NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
 NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET")
 
+# 🔥 실시간 분석 시 AI 서비스 동시 분석 수 (/analyze/batch max_concurrency)
+REALTIME_AI_MAX_CONCURRENCY = int(os.getenv("REALTIME_AI_MAX_CONCURRENCY", "4"))
+
+# 🔥 백그라운드 갱신 중인 종목 (종목당 1개 작업, 완료 시 제거)
+_refresh_tasks: Dict[str, asyncio.Task] = {}
+
 # Supabase 클라이언트 (Lazy Initialization)
 _supabase_client = None
 
@@ -36,6 +47,35 @@ def get_supabase_client() -> Client:
     return _supabase_client
 
 
+# 🔥 뉴스 Feature Store (실시간 경로로 저장한 기사도 news_symbol_features에 반영, Lazy 초기화)
+_news_feature_store: Optional[NewsFeatureStore] = None
+
+def get_news_feature_store() -> NewsFeatureStore:
+    """뉴스 Feature Store Lazy 초기화"""
+    global _news_feature_store
+    if _news_feature_store is None:
+        _news_feature_store = NewsFeatureStore(get_supabase_client())
+    return _news_feature_store
+
+
+# 🔥 종목 마스터 인덱스 (종목명 조회를 요청마다 DB에서 하지 않도록)
+_stock_master_index = StockMasterIndex(get_supabase_client)
+
+async def get_stock_master_index() -> StockMasterIndex:
+    """
+    종목 마스터 인덱스 반환 (확인 주기가 지났으면 버전 확인 후 갱신)
+
+    🔥 전체 로드 / 버전 조회는 동기 DB 호출 → 스레드에서 실행 (최초 로드는 앱 시작 시 warm_up_stock_master_index)
+    """
+    await asyncio.to_thread(_stock_master_index.refresh_if_stale)
+    return _stock_master_index
+
+
+async def warm_up_stock_master_index():
+    """앱 시작 시 종목 마스터 인덱스 로드 (첫 요청이 전체 로드를 기다리지 않도록)"""
+    await asyncio.to_thread(_stock_master_index.refresh_if_stale, True)
+
+
 class NaverNewsAPI:
     """네이버 뉴스 검색 API 클라이언트"""
 
@@ -259,38 +299,35 @@ async def fetch_realtime_news(
     """
     print(f"🔄 실시간 크롤링 시작: {stock_name} ({symbol})")
 
-    all_news = []
-    seen_urls = set()
-
-    # 1. 네이버 뉴스 크롤링
-    try:
-        naver_api = NaverNewsAPI()
-        naver_news = await naver_api.search_stock_news(stock_name, max_results=max_results)
-
-        for news in naver_news:
-            url = news["url"]
-            if url not in seen_urls:
-                seen_urls.add(url)
-                all_news.append(news)
-
-        print(f"✅ 네이버 뉴스: {len(naver_news)}개 수집")
-    except Exception as e:
-        print(f"⚠️ 네이버 뉴스 크롤링 실패: {str(e)}")
+    async def fetch_naver() -> List[Dict]:
+        try:
+            news = await NaverNewsAPI().search_stock_news(stock_name, max_results=max_results)
+            print(f"✅ 네이버 뉴스: {len(news)}개 수집")
+            return news
+        except Exception as e:
+            print(f"⚠️ 네이버 뉴스 크롤링 실패: {str(e)}")
+            return []
 
-    # 2. Google News RSS 크롤링
-    try:
-        google_rss = GoogleNewsRSS()
-        google_news = await google_rss.search_stock_news(stock_name, max_results=max_results)
+    async def fetch_google() -> List[Dict]:
+        try:
+            news = await GoogleNewsRSS().search_stock_news(stock_name, max_results=max_results)
+            print(f"✅ Google News: {len(news)}개 수집")
+            return news
+        except Exception as e:
+            print(f"⚠️ Google News 크롤링 실패: {str(e)}")
+            return []
 
-        for news in google_news:
-            url = news["url"]
-            if url not in seen_urls:
-                seen_urls.add(url)
-                all_news.append(news)
+    # 🔥 네이버 + Google News 동시 조회
+    naver_news, google_news = await asyncio.gather(fetch_naver(), fetch_google())
 
-        print(f"✅ Google News: {len(google_news)}개 수집")
-    except Exception as e:
-        print(f"⚠️ Google News 크롤링 실패: {str(e)}")
+    # URL 기준 중복 제거 (네이버 우선)
+    all_news = []
+    seen_urls = set()
+    for news in naver_news + google_news:
+        url = news["url"]
+        if url not in seen_urls:
+            seen_urls.add(url)
+            all_news.append(news)
 
     print(f"📊 실시간 크롤링 완료: 총 {len(all_news)}개 (중복 제거 후)")
     return all_news
@@ -313,26 +350,49 @@ async def analyze_and_save_news(
     if not news_items:
         return []
 
-    print(f"🤖 AI 분석 시작: {len(news_items)}개 뉴스")
+    print(f"🤖 AI 일괄 분석 시작: {len(news_items)}개 뉴스")
 
     analyzed_news = []
 
-    for news in news_items:
-        try:
-            # AI 분석 요청
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{AI_SERVICE_URL}/analyze",
-                    json={
-                        "title": news["title"],
-                        "content": news["content"],
-                        "symbols": [symbol],
-                        "url": news["url"]
-                    }
-                )
+    try:
+        # 🔥 AI 일괄 분석 요청 (/analyze/batch, 완료 순서대로 NDJSON 수신)
+        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=10.0)) as client:
+            async with client.stream(
+                "POST",
+                f"{AI_SERVICE_URL}/analyze/batch",
+                json={
+                    "articles": [
+                        {
+                            "title": news["title"],
+                            "content": news["content"],
+                            "symbols": [symbol],
+                            "url": news["url"]
+                        }
+                        for news in news_items
+                    ],
+                    "max_concurrency": REALTIME_AI_MAX_CONCURRENCY
+                }
+            ) as response:
+                if response.status_code in (429, 503):
+                    # 🔥 AI 서비스 포화 → 대기하지 않고 DB 뉴스로 진행 (크롤러가 이후 분석)
+                    print(f"⏳ AI 서비스 포화 (status {response.status_code}, Retry-After {response.headers.get('Retry-After')}s) - 실시간 분석 생략")
+                    return []
 
-                if response.status_code == 200:
-                    ai_result = response.json()
+                if response.status_code != 200:
+                    print(f"⚠️ AI 일괄 분석 실패 (status {response.status_code})")
+                    return []
+
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+
+                    item = json.loads(line)
+                    news = news_items[item["index"]]
+                    ai_result = item.get("result")
+
+                    if not ai_result:
+                        print(f"⚠️ AI 분석 실패 ({item.get('error')}): {news['title'][:50]}...")
+                        continue
 
                     # DB 저장용 데이터 준비
                     news_data = {
@@ -346,33 +406,71 @@ async def analyze_and_save_news(
                         "recommended_action": ai_result.get("recommended_action"),
                         "related_symbols": [symbol],
                     }
+                    analyzed_news.append(news_data)
 
-                    # Supabase에 저장
-                    try:
-                        get_supabase_client().table("news").insert(news_data).execute()
-                        analyzed_news.append(news_data)
-                        print(f"✅ AI 분석 + 저장 성공: {news['title'][:50]}...")
-                    except Exception as e:
-                        print(f"⚠️ DB 저장 실패 (분석은 성공): {str(e)}")
-                        # 저장 실패해도 분석된 뉴스는 반환
-                        analyzed_news.append(news_data)
-
-                else:
-                    print(f"⚠️ AI 분석 실패 (status {response.status_code}): {news['title'][:50]}...")
+    except Exception as e:
+        print(f"❌ 뉴스 일괄 분석 오류: {str(e)}")
 
+    # Supabase에 일괄 저장 (크롤러가 먼저 저장한 URL은 무시)
+    if analyzed_news:
+        try:
+            result = get_supabase_client().table("news") \
+                .upsert(analyzed_news, on_conflict="url", ignore_duplicates=True) \
+                .execute()
+            print(f"✅ AI 분석 + 저장 성공: {len(analyzed_news)}개")
+
+            # 🔥 새로 저장된 기사만 Feature Store 반영 (크롤러가 이미 저장/집계한 URL은 응답에서 제외됨)
+            feature_store = get_news_feature_store()
+            for saved in result.data or []:
+                feature_store.record(saved)
+            await asyncio.to_thread(feature_store.flush)
         except Exception as e:
-            print(f"❌ 뉴스 분석 오류: {str(e)}")
-            continue
+            # 저장 실패해도 분석된 뉴스는 반환
+            print(f"⚠️ DB 저장 실패 (분석은 성공): {str(e)}")
 
     print(f"✅ AI 분석 완료: {len(analyzed_news)}개 성공")
     return analyzed_news
 
 
+async def refresh_realtime_news(symbol: str, stock_name: str, max_results: int = 10) -> List[Dict]:
+    """실시간 크롤링 + AI 분석 + DB 저장"""
+    raw_news = await fetch_realtime_news(symbol, stock_name, max_results)
+    if not raw_news:
+        print("⚠️ 실시간 크롤링 결과 없음")
+        return []
+    return await analyze_and_save_news(raw_news, symbol)
+
+
+def schedule_background_refresh(symbol: str, stock_name: str, max_results: int = 10) -> bool:
+    """
+    백그라운드 실시간 크롤링 예약 (종목당 동시에 1개만)
+
+    Returns:
+        bool: 새로 예약했으면 True (이미 진행 중이면 False)
+    """
+    task = _refresh_tasks.get(symbol)
+    if task is not None and not task.done():
+        return False
+
+    async def run():
+        try:
+            fresh_news = await refresh_realtime_news(symbol, stock_name, max_results)
+            print(f"✅ 백그라운드 뉴스 갱신 완료: {symbol} ({len(fresh_news)}개)")
+        except Exception as e:
+            print(f"❌ 백그라운드 뉴스 갱신 실패 ({symbol}): {str(e)}")
+
+    task = asyncio.create_task(run())
+    _refresh_tasks[symbol] = task
+    task.add_done_callback(lambda _: _refresh_tasks.pop(symbol, None) if _refresh_tasks.get(symbol) is task else None)
+    return True
+
+
 async def get_news_hybrid(
     symbol: str,
     stock_name: Optional[str] = None,
     threshold_hours: int = 12,
-    max_fresh_news: int = 10
+    max_fresh_news: int = 10,
+    stale_while_revalidate: bool = False
 ) -> List[Dict]:
     """
     하이브리드 뉴스 조회 (메인 함수)
@@ -381,37 +479,29 @@ async def get_news_hybrid(
     1. DB에서 최신 뉴스 조회
     2. 신선도 확인 (< threshold_hours)
     3. 오래되었으면 실시간 크롤링 + AI 분석 + DB 저장
+       (stale_while_revalidate=True면 백그라운드로 예약하고 DB 뉴스로 즉시 응답,
+        단 DB에 뉴스가 하나도 없으면 기다림)
     4. DB 뉴스 + 신규 뉴스 병합 반환
 
     Args:
         symbol: 종목 코드
-        stock_name: 종목명 (선택사항, 없으면 stock_master에서 조회)
+        stock_name: 종목명 (선택사항, 없으면 종목 마스터 인덱스에서 조회)
         threshold_hours: 신선도 임계값 (기본 12시간)
         max_fresh_news: 실시간 크롤링 최대 개수
+        stale_while_revalidate: 오래된 뉴스로 즉시 응답 + 백그라운드 갱신
 
     Returns:
         뉴스 리스트 (DB + 신규 병합)
     """
     try:
-        # 0. 종목명이 없으면 stock_master에서 조회
+        # 0. 종목명이 없으면 종목 마스터 인덱스에서 조회
         if not stock_name:
-            try:
-                stock_result = get_supabase_client().table("stock_master") \
-                    .select("name") \
-                    .eq("symbol", symbol) \
-                    .limit(1) \
-                    .execute()
-
-                if stock_result.data and len(stock_result.data) > 0:
-                    stock_name = stock_result.data[0]["name"]
-                    print(f"✅ 종목명 조회: {symbol} → {stock_name}")
-                else:
-                    stock_name = symbol  # 폴백: 종목 코드 사용
-                    print(f"⚠️ 종목명 조회 실패, 종목 코드 사용: {symbol}")
-
-            except Exception as e:
+            stock_name = (await get_stock_master_index()).get_name(symbol)
+            if stock_name:
+                print(f"✅ 종목명 조회: {symbol} → {stock_name}")
+            else:
                 stock_name = symbol  # 폴백: 종목 코드 사용
-                print(f"⚠️ stock_master 조회 오류: {str(e)}, 종목 코드 사용")
+                print(f"⚠️ 종목명 조회 실패, 종목 코드 사용: {symbol}")
 
         # 1. 신선도 확인
         is_fresh, latest_timestamp = await check_news_freshness(symbol, threshold_hours)
@@ -419,14 +509,15 @@ async def get_news_hybrid(
         # 2. 실시간 크롤링 필요 여부 판단
         fresh_news = []
         if not is_fresh:
-            # 실시간 크롤링 트리거
-            raw_news = await fetch_realtime_news(symbol, stock_name, max_fresh_news)
-
-            if raw_news:
-                # AI 분석 + DB 저장
-                fresh_news = await analyze_and_save_news(raw_news, symbol)
+            if stale_while_revalidate and latest_timestamp is not None:
+                # 🔥 DB 뉴스로 즉시 응답, 실시간 크롤링은 다음 요청을 위해 백그라운드 실행
+                if schedule_background_refresh(symbol, stock_name, max_fresh_news):
+                    print(f"🔄 백그라운드 뉴스 갱신 예약: {symbol}")
+                else:
+                    print(f"ℹ️ 백그라운드 뉴스 갱신 진행 중: {symbol}")
             else:
-                print("⚠️ 실시간 크롤링 결과 없음")
+                # 실시간 크롤링 + AI 분석 + DB 저장
+                fresh_news = await refresh_realtime_news(symbol, stock_name, max_fresh_news)
 
         # 3. DB에서 뉴스 조회 (최근 7일, 최대 50개)
         seven_days_ago = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
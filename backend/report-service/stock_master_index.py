@@ -0,0 +1,207 @@
+"""
+🔥 종목 마스터 인메모리 인덱스
+stock_master 전체를 메모리에 올려 종목코드/종목명 O(1) 조회, 접두어 검색 제공
+
+- 주기적으로 버전(최신 last_updated + 행 수)만 확인 → 바뀐 경우에만 전체 재로드
+- 재로드 시 리스너 호출 (예: StockNER 오토마톤 재구성)
+- news-crawler / report-service에 동일 파일로 포함 (서비스별 독립 배포)
+"""
+import os
+import time
+import bisect
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from supabase import Client
+
+STOCK_MASTER_TABLE = "stock_master"
+STOCK_MASTER_COLUMNS = "symbol, name, market, sector, last_updated"
+
+# 버전 확인 주기 (초)
+REFRESH_INTERVAL_SECONDS = int(os.getenv("STOCK_MASTER_REFRESH_INTERVAL", "600"))
+
+# 전체 로드 페이지 크기 (PostgREST 기본 최대 행 수 1,000)
+PAGE_SIZE = 1000
+
+
+class StockMasterIndex:
+    """종목 마스터 인덱스"""
+
+    def __init__(
+        self,
+        get_client: Callable[[], Client],
+        refresh_interval: int = REFRESH_INTERVAL_SECONDS
+    ):
+        """
+        Args:
+            get_client: Supabase 클라이언트 반환 함수 (Lazy 초기화 지원)
+            refresh_interval: 버전 확인 주기 (초)
+        """
+        self._get_client = get_client
+        self.refresh_interval = refresh_interval
+
+        self._by_symbol: Dict[str, Dict[str, Any]] = {}
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._sorted_names: List[str] = []    # 접두어 검색용 (정렬된 종목명)
+        self._sorted_symbols: List[str] = []  # 접두어 검색용 (정렬된 종목코드)
+
+        self.version: Optional[Tuple[Optional[str], Optional[int]]] = None
+        self.loaded_at: Optional[float] = None
+        self._last_checked = 0.0
+        self._listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 로드 / 갱신
+    # ------------------------------------------------------------------
+
+    def _fetch_version(self) -> Tuple[Optional[str], Optional[int]]:
+        """버전 조회 (최신 last_updated, 행 수) - 1회 쿼리"""
+        result = self._get_client().table(STOCK_MASTER_TABLE) \
+            .select("last_updated", count="exact") \
+            .order("last_updated", desc=True) \
+            .limit(1) \
+            .execute()
+
+        latest = result.data[0].get("last_updated") if result.data else None
+        return latest, result.count
+
+    def _fetch_all(self) -> List[Dict[str, Any]]:
+        """전체 종목 조회 (페이지 단위)"""
+        rows = []
+        start = 0
+        while True:
+            result = self._get_client().table(STOCK_MASTER_TABLE) \
+                .select(STOCK_MASTER_COLUMNS) \
+                .order("symbol") \
+                .range(start, start + PAGE_SIZE - 1) \
+                .execute()
+
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+            start += PAGE_SIZE
+
+    def load(self) -> int:
+        """
+        전체 재로드
+
+        Returns:
+            int: 로드된 종목 수
+        """
+        version = self._fetch_version()
+        rows = self._fetch_all()
+
+        by_symbol = {row["symbol"]: row for row in rows if row.get("symbol")}
+        by_name = {row["name"]: row for row in rows if row.get("name")}
+
+        with self._lock:
+            self._by_symbol = by_symbol
+            self._by_name = by_name
+            self._sorted_names = sorted(by_name.keys())
+            self._sorted_symbols = sorted(by_symbol.keys())
+            self.version = version
+            self.loaded_at = time.time()
+            self._last_checked = time.monotonic()
+
+        print(f"✅ 종목 마스터 인덱스 로드: {len(by_symbol)}개 종목")
+
+        for listener in list(self._listeners):
+            try:
+                listener(rows)
+            except Exception as e:
+                print(f"⚠️ 종목 마스터 리스너 오류: {str(e)}")
+
+        return len(by_symbol)
+
+    def refresh_if_stale(self, force: bool = False) -> bool:
+        """
+        확인 주기가 지났으면 버전 확인 후 변경 시 재로드
+
+        Args:
+            force: 주기와 무관하게 버전 확인
+
+        Returns:
+            bool: 재로드 여부
+        """
+        # 최초 로드 실패 시에는 짧은 주기로 재시도
+        interval = self.refresh_interval if self.loaded_at is not None else min(60, self.refresh_interval)
+        now = time.monotonic()
+        if not force and self._last_checked and now - self._last_checked < interval:
+            return False
+        self._last_checked = now
+
+        try:
+            if self.loaded_at is None:
+                self.load()
+                return True
+
+            version = self._fetch_version()
+            if version == self.version:
+                return False
+
+            print(f"🔄 종목 마스터 변경 감지: {self.version} → {version}")
+            self.load()
+            return True
+
+        except Exception as e:
+            print(f"⚠️ 종목 마스터 갱신 실패: {str(e)}")
+            return False
+
+    def add_listener(self, listener: Callable[[List[Dict[str, Any]]], None]):
+        """재로드 시 호출할 함수 등록 (인자: 전체 종목 행)"""
+        self._listeners.append(listener)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """종목코드로 조회 → {symbol, name, market, sector, last_updated}"""
+        return self._by_symbol.get(symbol)
+
+    def get_name(self, symbol: str, default: Optional[str] = None) -> Optional[str]:
+        """종목코드 → 종목명"""
+        stock = self._by_symbol.get(symbol)
+        return stock["name"] if stock else default
+
+    def find_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """종목명으로 조회 (정확히 일치)"""
+        return self._by_name.get(name)
+
+    def search_prefix(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        종목명 접두어 검색 (종목코드 접두어도 지원)
+
+        Args:
+            prefix: 검색어 (예: "삼성", "0059")
+            limit: 최대 결과 수
+
+        Returns:
+            List[Dict]: 종목 리스트
+        """
+        if not prefix:
+            return []
+
+        keys, table = (self._sorted_symbols, self._by_symbol) if prefix.isdigit() else (self._sorted_names, self._by_name)
+
+        results = []
+        index = bisect.bisect_left(keys, prefix)
+        while index < len(keys) and keys[index].startswith(prefix) and len(results) < limit:
+            results.append(table[keys[index]])
+            index += 1
+        return results
+
+    def lookup_many(self, symbols) -> List[Dict[str, Any]]:
+        """여러 종목코드 조회 (없는 코드는 제외)"""
+        return [self._by_symbol[symbol] for symbol in symbols if symbol in self._by_symbol]
+
+    def all(self) -> List[Dict[str, Any]]:
+        """전체 종목"""
+        return list(self._by_symbol.values())
+
+    def __len__(self) -> int:
+        return len(self._by_symbol)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._by_symbol
@@ -0,0 +1,124 @@
+"""
+cache.py 단위 테스트 (fakeredis)
+
+총 7개 테스트:
+1. set_cached_report() - 레포트 저장 시 종목 인덱스 등록 + 인덱스 TTL 설정
+2. delete_cached_report() - 캐시 키 삭제 시 인덱스에서도 제거
+3. delete_symbol_reports() - 종목 인덱스 기반 일괄 삭제 (다른 종목 유지)
+4. list_cached_reports() - SCAN 커서로 전체 페이지 순회 (중복/누락 없음)
+5. list_cached_reports() - TTL / 크기 포함, 인덱스 키는 목록에서 제외
+6. list_cached_reports() - symbol 지정 시 종목 인덱스에서 조회
+7. list_cached_reports() - 만료된 레포트 키는 제외 + 종목 인덱스에서 SREM
+"""
+import pytest
+import fakeredis
+import cache
+from cache import (
+    get_cache_key,
+    get_index_key,
+    set_cached_report,
+    delete_cached_report,
+    delete_symbol_reports,
+    list_cached_reports,
+)
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(cache, "redis_client", client)
+    return client
+
+
+@pytest.mark.unit
+class TestReportIndex:
+    """종목별 보조 인덱스 테스트"""
+
+    def test_set_registers_index(self, redis_client):
+        """1. 레포트 저장 시 종목 인덱스 등록 + 인덱스 TTL 설정"""
+        assert set_cached_report("005930", "2026-10-16", {"summary": "a"})
+        assert set_cached_report("005930", "2026-10-17", {"summary": "b"})
+
+        members = redis_client.smembers(get_index_key("005930"))
+        assert members == {get_cache_key("005930", "2026-10-16"), get_cache_key("005930", "2026-10-17")}
+        assert redis_client.ttl(get_index_key("005930")) >= redis_client.ttl(get_cache_key("005930", "2026-10-17"))
+
+    def test_delete_removes_from_index(self, redis_client):
+        """2. 캐시 키 삭제 시 인덱스에서도 제거"""
+        set_cached_report("005930", "2026-10-16", {"summary": "a"})
+
+        assert delete_cached_report("005930", "2026-10-16")
+        assert redis_client.smembers(get_index_key("005930")) == set()
+        assert not delete_cached_report("005930", "2026-10-16")
+
+    def test_delete_symbol_reports(self, redis_client):
+        """3. 종목 인덱스 기반 일괄 삭제 (다른 종목 유지)"""
+        for date in ("2026-10-14", "2026-10-15", "2026-10-16"):
+            set_cached_report("005930", date, {"summary": date})
+        set_cached_report("000660", "2026-10-16", {"summary": "hynix"})
+
+        assert delete_symbol_reports("005930") == 3
+        assert redis_client.exists(get_index_key("005930")) == 0
+        assert redis_client.exists(get_cache_key("005930", "2026-10-16")) == 0
+        assert redis_client.exists(get_cache_key("000660", "2026-10-16")) == 1
+        assert delete_symbol_reports("005930") == 0
+
+
+@pytest.mark.unit
+class TestListCachedReports:
+    """SCAN 기반 캐시 목록 테스트"""
+
+    def test_scan_pages_cover_all_keys(self, redis_client):
+        """4. SCAN 커서로 전체 페이지 순회 (중복/누락 없음)"""
+        for i in range(25):
+            set_cached_report(f"{i:06d}", "2026-10-16", {"summary": i})
+
+        seen = []
+        cursor = 0
+        pages = 0
+        while True:
+            page = list_cached_reports(cursor=cursor, count=10)
+            seen.extend(report["cache_key"] for report in page["cached_reports"])
+            pages += 1
+            cursor = page["next_cursor"]
+            if not page["has_more"]:
+                break
+
+        assert pages > 1
+        assert sorted(seen) == sorted(get_cache_key(f"{i:06d}", "2026-10-16") for i in range(25))
+
+    def test_ttl_and_size_included(self, redis_client):
+        """5. TTL / 크기 포함, 인덱스 키는 목록에서 제외"""
+        set_cached_report("005930", "2026-10-16", {"summary": "삼성전자"})
+
+        page = list_cached_reports()
+
+        assert page["total"] == 1
+        report = page["cached_reports"][0]
+        assert report["symbol"] == "005930"
+        assert report["report_date"] == "2026-10-16"
+        assert report["ttl_seconds"] >= 1800
+        assert report["ttl_minutes"] == report["ttl_seconds"] // 60
+        assert report["size_bytes"] == redis_client.strlen(get_cache_key("005930", "2026-10-16"))
+
+    def test_symbol_filter_uses_index(self, redis_client):
+        """6. symbol 지정 시 종목 인덱스에서 조회"""
+        set_cached_report("005930", "2026-10-15", {"summary": "a"})
+        set_cached_report("005930", "2026-10-16", {"summary": "b"})
+        set_cached_report("000660", "2026-10-16", {"summary": "c"})
+
+        page = list_cached_reports(symbol="005930")
+
+        assert [report["report_date"] for report in page["cached_reports"]] == ["2026-10-15", "2026-10-16"]
+        assert page["has_more"] is False
+
+    def test_expired_members_removed_from_index(self, redis_client):
+        """7. 만료된 레포트 키는 제외 + 종목 인덱스에서 SREM"""
+        set_cached_report("005930", "2026-10-15", {"summary": "a"})
+        set_cached_report("005930", "2026-10-16", {"summary": "b"})
+        redis_client.delete(get_cache_key("005930", "2026-10-15"))  # TTL 만료 재현
+
+        page = list_cached_reports(symbol="005930")
+
+        assert [report["report_date"] for report in page["cached_reports"]] == ["2026-10-16"]
+        assert redis_client.smembers(get_index_key("005930")) == {get_cache_key("005930", "2026-10-16")}
@@ -0,0 +1,117 @@
+"""
+jwt_verifier.py 단위 테스트
+
+총 6개 테스트:
+1. verify() - HS256 토큰 로컬 검증 (sub 반환)
+2. verify() - 만료 토큰 거부
+3. verify() - 서명 / audience 불일치 거부
+4. verify() - SUPABASE_JWT_SECRET 미설정 시 VerifierNotConfigured
+5. verify() - ES256 토큰은 JWKS 1회 조회 후 캐시 사용
+6. verify() - 모르는 kid는 최소 간격 내 재조회하지 않음
+"""
+import time
+import pytest
+from unittest.mock import patch
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwt, jwk
+from jwt_verifier import JwtVerifier, TokenVerificationError, VerifierNotConfigured
+
+SECRET = "test-jwt-secret-with-enough-length-for-hs256"
+USER_ID = "8f14e45f-ceea-467a-9b2b-0f0c4c2f6a11"
+
+
+def _claims(**overrides):
+    now = int(time.time())
+    claims = {"sub": USER_ID, "aud": "authenticated", "role": "authenticated", "iat": now, "exp": now + 3600}
+    claims.update(overrides)
+    return claims
+
+
+@pytest.fixture
+def es256_key():
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode()
+    public_jwk = jwk.construct(
+        private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode(),
+        "ES256"
+    ).to_dict()
+    public_jwk["kid"] = "key-1"
+    return pem, public_jwk
+
+
+@pytest.mark.unit
+class TestHS256:
+    """공유 시크릿 토큰 검증 테스트"""
+
+    def test_valid_token(self):
+        """1. verify() - HS256 토큰 로컬 검증 (sub 반환)"""
+        verifier = JwtVerifier(supabase_url="https://example.supabase.co", jwt_secret=SECRET)
+        token = jwt.encode(_claims(), SECRET, algorithm="HS256")
+
+        assert verifier.verify(token)["sub"] == USER_ID
+
+    def test_expired_token(self):
+        """2. verify() - 만료 토큰 거부"""
+        verifier = JwtVerifier(supabase_url="https://example.supabase.co", jwt_secret=SECRET)
+        token = jwt.encode(_claims(exp=int(time.time()) - 10), SECRET, algorithm="HS256")
+
+        with pytest.raises(TokenVerificationError):
+            verifier.verify(token)
+
+    def test_bad_signature_and_audience(self):
+        """3. verify() - 서명 / audience 불일치 거부"""
+        verifier = JwtVerifier(supabase_url="https://example.supabase.co", jwt_secret=SECRET)
+
+        with pytest.raises(TokenVerificationError):
+            verifier.verify(jwt.encode(_claims(), "another-secret-another-secret-12345", algorithm="HS256"))
+
+        with pytest.raises(TokenVerificationError):
+            verifier.verify(jwt.encode(_claims(aud="anon"), SECRET, algorithm="HS256"))
+
+    def test_missing_secret(self):
+        """4. verify() - SUPABASE_JWT_SECRET 미설정 시 VerifierNotConfigured"""
+        verifier = JwtVerifier(supabase_url="https://example.supabase.co", jwt_secret="")
+        token = jwt.encode(_claims(), SECRET, algorithm="HS256")
+
+        with pytest.raises(VerifierNotConfigured):
+            verifier.verify(token)
+
+
+@pytest.mark.unit
+class TestJWKS:
+    """비대칭 키(JWKS) 토큰 검증 테스트"""
+
+    def test_jwks_cached(self, es256_key):
+        """5. verify() - ES256 토큰은 JWKS 1회 조회 후 캐시 사용"""
+        pem, public_jwk = es256_key
+        verifier = JwtVerifier(supabase_url="https://example.supabase.co", jwt_secret="")
+        token = jwt.encode(_claims(), pem, algorithm="ES256", headers={"kid": "key-1"})
+
+        with patch.object(verifier, "_fetch_jwks", return_value={"key-1": public_jwk}) as fetch:
+            for _ in range(3):
+                assert verifier.verify(token)["sub"] == USER_ID
+
+        assert fetch.call_count == 1
+
+    def test_unknown_kid_not_refetched(self, es256_key):
+        """6. verify() - 모르는 kid는 최소 간격 내 재조회하지 않음"""
+        pem, public_jwk = es256_key
+        verifier = JwtVerifier(supabase_url="https://example.supabase.co", jwt_secret="")
+        valid = jwt.encode(_claims(), pem, algorithm="ES256", headers={"kid": "key-1"})
+        forged = jwt.encode(_claims(), pem, algorithm="ES256", headers={"kid": "unknown"})
+
+        with patch.object(verifier, "_fetch_jwks", return_value={"key-1": public_jwk}) as fetch:
+            verifier.verify(valid)
+            for _ in range(3):
+                with pytest.raises(TokenVerificationError):
+                    verifier.verify(forged)
+
+        assert fetch.call_count == 1
@@ -0,0 +1,104 @@
+"""
+news_features.py 단위 테스트
+
+총 5개 테스트:
+1. news_features_to_trend() - daily_buckets로 1/3/7일 윈도우 계산 → 뉴스 트렌드 변환
+2. news_features_to_trend() - 빈 행
+3. get_precomputed_news_trend() - 최신 Feature 사용
+4. get_precomputed_news_trend() - 오래된 Feature → None
+5. get_precomputed_news_trend() - 행 없음 → None
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from news_features import news_features_to_trend, get_precomputed_news_trend
+
+
+def _feature_row(latest_hours_ago: float) -> dict:
+    now = datetime.now(timezone.utc)
+    latest = now - timedelta(hours=latest_hours_ago)
+
+    def day(days_ago: int) -> str:
+        return (now - timedelta(days=days_ago)).date().isoformat()
+
+    return {
+        # 7일: 10건 (긍정 6 / 부정 3 / 중립 1), 최근 3일 평균 감성 0.3 > 이전 4일 0.15
+        "daily_buckets": {
+            day(0): {"count": 2, "sentiment_sum": 1.0, "impact_sum": 1.2, "positive": 2, "negative": 0,
+                     "keywords": {"반도체": 4, "실적": 2}},
+            day(2): {"count": 2, "sentiment_sum": 0.2, "impact_sum": 1.0, "positive": 1, "negative": 1,
+                     "keywords": {"실적": 1}},
+            day(5): {"count": 6, "sentiment_sum": 0.9, "impact_sum": 3.3, "positive": 3, "negative": 2,
+                     "keywords": {}},
+        },
+        "high_impact_news": [
+            {"title": "삼성전자 실적 서프라이즈", "sentiment_score": 0.8, "impact_score": 0.9}
+        ],
+        "latest_published_at": latest.isoformat()
+    }
+
+
+def _mock_supabase(rows: list) -> MagicMock:
+    client = MagicMock()
+    query = client.table.return_value.select.return_value.eq.return_value.limit.return_value
+    query.execute.return_value = MagicMock(data=rows)
+    return client
+
+
+@pytest.mark.unit
+class TestNewsFeaturesToTrend:
+    """Feature 행 → 뉴스 트렌드 변환 테스트"""
+
+    def test_news_features_to_trend(self):
+        """1. news_features_to_trend() - daily_buckets로 1/3/7일 윈도우 계산 → 뉴스 트렌드 변환"""
+        result = news_features_to_trend(_feature_row(1))
+
+        # analyze_news_trend()와 동일한 키 구성
+        assert result["total_count"] == 10
+        assert result["positive_count"] == 6
+        assert result["negative_ratio"] == 30.0
+        assert result["avg_impact_score"] == 0.55
+        assert result["trending_keywords"] == ["반도체", "실적"]
+        assert result["recent_sentiment_change"] == "개선"
+        assert len(result["high_impact_news"]) == 1
+
+        # 1/3/7일 윈도우 포함
+        assert set(result["windows"].keys()) == {"1d", "3d", "7d"}
+        assert result["source"] == "feature_store"
+
+    def test_news_features_to_trend_empty(self):
+        """2. news_features_to_trend() - 빈 행"""
+        result = news_features_to_trend({})
+
+        assert result["total_count"] == 0
+        assert result["high_impact_news"] == []
+        assert result["trending_keywords"] == []
+        assert result["recent_sentiment_change"] == "불변"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestGetPrecomputedNewsTrend:
+    """Feature Store 조회 테스트"""
+
+    async def test_fresh_features(self):
+        """3. get_precomputed_news_trend() - 최신 Feature 사용"""
+        with patch('news_features.get_supabase_client', return_value=_mock_supabase([_feature_row(2)])):
+            result = await get_precomputed_news_trend("005930", max_age_hours=12)
+
+        assert result is not None
+        assert result["total_count"] == 10
+
+    async def test_stale_features(self):
+        """4. get_precomputed_news_trend() - 오래된 Feature → None"""
+        with patch('news_features.get_supabase_client', return_value=_mock_supabase([_feature_row(20)])):
+            result = await get_precomputed_news_trend("005930", max_age_hours=12)
+
+        assert result is None
+
+    async def test_missing_features(self):
+        """5. get_precomputed_news_trend() - 행 없음 → None"""
+        with patch('news_features.get_supabase_client', return_value=_mock_supabase([])):
+            result = await get_precomputed_news_trend("005930", max_age_hours=12)
+
+        assert result is None
@@ -0,0 +1,217 @@
+"""
+realtime_news_fetcher.py 단위 테스트
+
+총 6개 테스트:
+1. fetch_realtime_news() - 네이버 + Google News 동시 조회 및 URL 중복 제거
+2. get_news_hybrid() - 신선한 뉴스는 실시간 크롤링 없이 DB 사용
+3. get_news_hybrid() - stale-while-revalidate: DB 뉴스 즉시 반환 + 백그라운드 갱신
+4. get_news_hybrid() - DB에 뉴스가 없으면 stale-while-revalidate여도 실시간 크롤링 대기
+5. schedule_background_refresh() - 종목당 갱신 작업 1개
+6. analyze_and_save_news() - 새로 저장된 기사만 Feature Store에 반영
+"""
+import asyncio
+import json
+import time
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, AsyncMock, patch
+import realtime_news_fetcher as fetcher
+
+DB_NEWS = [
+    {"id": 1, "title": "삼성전자 실적 발표", "url": "https://news.example.com/1", "published_at": "2026-10-17T09:00:00+00:00"},
+]
+FRESH_NEWS = [
+    {"title": "삼성전자 신규 뉴스", "url": "https://news.example.com/new", "published_at": "2026-10-18T09:00:00+00:00"},
+]
+
+
+def _mock_supabase(rows):
+    client = MagicMock()
+    client.table.return_value.select.return_value.contains.return_value.gte.return_value \
+        .order.return_value.order.return_value.limit.return_value.execute.return_value = MagicMock(data=rows)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def clear_refresh_tasks():
+    fetcher._refresh_tasks.clear()
+    yield
+    fetcher._refresh_tasks.clear()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestFetchRealtimeNews:
+    """실시간 크롤링 테스트"""
+
+    async def test_sources_fetched_concurrently(self):
+        """1. fetch_realtime_news() - 네이버 + Google News 동시 조회 및 URL 중복 제거"""
+        async def slow_naver(self, stock_name, max_results=10):
+            await asyncio.sleep(0.2)
+            return [{"title": "A", "url": "https://a"}, {"title": "B", "url": "https://b"}]
+
+        async def slow_google(self, stock_name, max_results=10):
+            await asyncio.sleep(0.2)
+            return [{"title": "B'", "url": "https://b"}, {"title": "C", "url": "https://c"}]
+
+        with patch.object(fetcher.NaverNewsAPI, "search_stock_news", slow_naver), \
+                patch.object(fetcher.GoogleNewsRSS, "search_stock_news", slow_google):
+            started = time.monotonic()
+            news = await fetcher.fetch_realtime_news("005930", "삼성전자")
+            elapsed = time.monotonic() - started
+
+        assert elapsed < 0.35
+        assert [item["url"] for item in news] == ["https://a", "https://b", "https://c"]
+        assert news[1]["title"] == "B"  # 네이버 우선
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestGetNewsHybrid:
+    """하이브리드 뉴스 조회 테스트"""
+
+    async def test_fresh_news_uses_db(self):
+        """2. get_news_hybrid() - 신선한 뉴스는 실시간 크롤링 없이 DB 사용"""
+        refresh = AsyncMock(return_value=FRESH_NEWS)
+        with patch.object(fetcher, "check_news_freshness", AsyncMock(return_value=(True, datetime.now(timezone.utc)))), \
+                patch.object(fetcher, "refresh_realtime_news", refresh), \
+                patch.object(fetcher, "get_supabase_client", return_value=_mock_supabase(DB_NEWS)):
+            news = await fetcher.get_news_hybrid("005930", stock_name="삼성전자", stale_while_revalidate=True)
+
+        assert news == DB_NEWS
+        refresh.assert_not_called()
+
+    async def test_stale_while_revalidate(self):
+        """3. get_news_hybrid() - stale-while-revalidate: DB 뉴스 즉시 반환 + 백그라운드 갱신"""
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_refresh(symbol, stock_name, max_results=10):
+            started.set()
+            await release.wait()
+            return FRESH_NEWS
+
+        stale_at = datetime(2026, 10, 17, tzinfo=timezone.utc)
+        with patch.object(fetcher, "check_news_freshness", AsyncMock(return_value=(False, stale_at))), \
+                patch.object(fetcher, "refresh_realtime_news", slow_refresh), \
+                patch.object(fetcher, "get_supabase_client", return_value=_mock_supabase(DB_NEWS)):
+            news = await fetcher.get_news_hybrid("005930", stock_name="삼성전자", stale_while_revalidate=True)
+
+            # 갱신 완료를 기다리지 않고 DB 뉴스 반환
+            assert news == DB_NEWS
+            task = fetcher._refresh_tasks["005930"]
+            await asyncio.wait_for(started.wait(), timeout=1)
+            assert not task.done()
+
+            release.set()
+            await asyncio.wait_for(task, timeout=1)
+
+        assert "005930" not in fetcher._refresh_tasks
+
+    async def test_empty_db_waits_for_realtime(self):
+        """4. get_news_hybrid() - DB에 뉴스가 없으면 stale-while-revalidate여도 실시간 크롤링 대기"""
+        refresh = AsyncMock(return_value=FRESH_NEWS)
+        with patch.object(fetcher, "check_news_freshness", AsyncMock(return_value=(False, None))), \
+                patch.object(fetcher, "refresh_realtime_news", refresh), \
+                patch.object(fetcher, "get_supabase_client", return_value=_mock_supabase([])):
+            news = await fetcher.get_news_hybrid("005930", stock_name="삼성전자", stale_while_revalidate=True)
+
+        refresh.assert_awaited_once_with("005930", "삼성전자", 10)
+        assert news == FRESH_NEWS
+        assert fetcher._refresh_tasks == {}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestBackgroundRefresh:
+    """백그라운드 갱신 테스트"""
+
+    async def test_single_refresh_per_symbol(self):
+        """5. schedule_background_refresh() - 종목당 갱신 작업 1개"""
+        release = asyncio.Event()
+        calls = []
+
+        async def slow_refresh(symbol, stock_name, max_results=10):
+            calls.append(symbol)
+            await release.wait()
+            return []
+
+        with patch.object(fetcher, "refresh_realtime_news", slow_refresh):
+            assert fetcher.schedule_background_refresh("005930", "삼성전자") is True
+            assert fetcher.schedule_background_refresh("005930", "삼성전자") is False
+            assert fetcher.schedule_background_refresh("000660", "SK하이닉스") is True
+
+            release.set()
+            await asyncio.gather(*list(fetcher._refresh_tasks.values()))
+
+        assert sorted(calls) == ["000660", "005930"]
+        assert fetcher._refresh_tasks == {}
+
+
+class _FakeStreamResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, lines):
+        self._lines = lines
+
+    async def aiter_lines(self):
+        for line in self._lines:
+            yield line
+
+
+class _FakeAsyncClient:
+    """/analyze/batch NDJSON 스트림 응답 흉내"""
+    lines = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def stream(self, method, url, json=None):
+        response = _FakeStreamResponse(self.lines)
+
+        class _Context:
+            async def __aenter__(self_inner):
+                return response
+
+            async def __aexit__(self_inner, *args):
+                return False
+
+        return _Context()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestAnalyzeAndSave:
+    """실시간 분석 저장 테스트"""
+
+    async def test_feature_store_records_saved_rows_only(self):
+        """6. analyze_and_save_news() - 새로 저장된 기사만 Feature Store에 반영"""
+        news_items = [
+            {"title": f"삼성전자 뉴스 {i}", "content": "본문", "url": f"https://news.example.com/{i}",
+             "source": "naver", "published_at": "2026-10-18T09:00:00+00:00"}
+            for i in range(2)
+        ]
+        ai_result = {"summary": "요약", "sentiment_score": 0.5, "impact_score": 0.8, "recommended_action": "hold"}
+        _FakeAsyncClient.lines = [json.dumps({"index": i, "result": ai_result}) for i in range(2)]
+
+        # 두 번째 URL은 크롤러가 이미 저장 → upsert 응답에는 첫 번째 행만 포함
+        client = MagicMock()
+        saved_row = {"id": 10, "url": news_items[0]["url"], "related_symbols": ["005930"]}
+        client.table.return_value.upsert.return_value.execute.return_value = MagicMock(data=[saved_row])
+        feature_store = MagicMock()
+
+        with patch.object(fetcher.httpx, "AsyncClient", _FakeAsyncClient), \
+                patch.object(fetcher, "get_supabase_client", return_value=client), \
+                patch.object(fetcher, "get_news_feature_store", return_value=feature_store):
+            analyzed = await fetcher.analyze_and_save_news(news_items, "005930")
+
+        assert len(analyzed) == 2
+        feature_store.record.assert_called_once_with(saved_row)
+        feature_store.flush.assert_called_once()
@@ -0,0 +1,133 @@
+"""
+stock_master_index.py 단위 테스트
+
+총 6개 테스트:
+1. load() - 종목코드/종목명 조회
+2. load() - 1,000행 단위 페이지 로드
+3. search_prefix() - 종목명/종목코드 접두어 검색
+4. refresh_if_stale() - 확인 주기 내 DB 조회 생략
+5. refresh_if_stale() - 버전 변경 시 재로드 + 리스너 호출
+6. refresh_if_stale() - 버전 동일 시 재로드 생략
+"""
+import pytest
+from unittest.mock import MagicMock
+from stock_master_index import StockMasterIndex, PAGE_SIZE
+
+STOCKS = [
+    {"symbol": "005930", "name": "삼성전자", "market": "KOSPI", "sector": "전기전자", "last_updated": "2026-10-01"},
+    {"symbol": "005935", "name": "삼성전자우", "market": "KOSPI", "sector": "전기전자", "last_updated": "2026-10-01"},
+    {"symbol": "000660", "name": "SK하이닉스", "market": "KOSPI", "sector": "전기전자", "last_updated": "2026-10-01"},
+    {"symbol": "035720", "name": "카카오", "market": "KOSPI", "sector": "서비스업", "last_updated": "2026-10-01"},
+]
+
+
+class FakeStockMasterTable:
+    """stock_master 조회 체인 Mock (버전 조회 / 페이지 조회 구분)"""
+
+    def __init__(self, rows, version="2026-10-01"):
+        self.rows = rows
+        self.version = version
+        self.version_calls = 0
+        self.page_calls = 0
+
+    def client(self) -> MagicMock:
+        client = MagicMock()
+        client.table.return_value.select.side_effect = self._select
+        return client
+
+    def _select(self, columns, count=None):
+        query = MagicMock()
+        if count == "exact":
+            self.version_calls += 1
+            query.order.return_value.limit.return_value.execute.return_value = MagicMock(
+                data=[{"last_updated": self.version}], count=len(self.rows)
+            )
+        else:
+            def page(start, end):
+                self.page_calls += 1
+                return MagicMock(execute=MagicMock(return_value=MagicMock(data=self.rows[start:end + 1])))
+            query.order.return_value.range.side_effect = page
+        return query
+
+
+def _index(table: FakeStockMasterTable, refresh_interval: int = 600) -> StockMasterIndex:
+    client = table.client()
+    return StockMasterIndex(lambda: client, refresh_interval=refresh_interval)
+
+
+@pytest.mark.unit
+class TestStockMasterIndexLookup:
+    """종목 조회 테스트"""
+
+    def test_load_and_lookup(self):
+        """1. load() - 종목코드/종목명 조회"""
+        index = _index(FakeStockMasterTable(STOCKS))
+        assert index.load() == 4
+
+        assert index.get_name("005930") == "삼성전자"
+        assert index.get("000660")["market"] == "KOSPI"
+        assert index.find_by_name("카카오")["symbol"] == "035720"
+        assert index.get_name("999999", "999999") == "999999"
+        assert [s["symbol"] for s in index.lookup_many(["035720", "999999", "005930"])] == ["035720", "005930"]
+        assert "005935" in index
+
+    def test_load_paginates(self):
+        """2. load() - 1,000행 단위 페이지 로드"""
+        rows = [{"symbol": f"{i:06d}", "name": f"종목{i}"} for i in range(PAGE_SIZE + 5)]
+        table = FakeStockMasterTable(rows)
+        index = _index(table)
+
+        assert index.load() == PAGE_SIZE + 5
+        assert table.page_calls == 2
+
+    def test_search_prefix(self):
+        """3. search_prefix() - 종목명/종목코드 접두어 검색"""
+        index = _index(FakeStockMasterTable(STOCKS))
+        index.load()
+
+        assert [s["name"] for s in index.search_prefix("삼성")] == ["삼성전자", "삼성전자우"]
+        assert [s["name"] for s in index.search_prefix("삼성", limit=1)] == ["삼성전자"]
+        assert [s["symbol"] for s in index.search_prefix("0059")] == ["005930", "005935"]
+        assert index.search_prefix("없는종목") == []
+
+
+@pytest.mark.unit
+class TestStockMasterIndexRefresh:
+    """버전 기반 갱신 테스트"""
+
+    def test_refresh_skipped_within_interval(self):
+        """4. refresh_if_stale() - 확인 주기 내 DB 조회 생략"""
+        table = FakeStockMasterTable(STOCKS)
+        index = _index(table, refresh_interval=600)
+
+        assert index.refresh_if_stale() is True  # 최초 로드
+        version_calls = table.version_calls
+
+        assert index.refresh_if_stale() is False
+        assert table.version_calls == version_calls
+
+    def test_refresh_reloads_on_version_change(self):
+        """5. refresh_if_stale() - 버전 변경 시 재로드 + 리스너 호출"""
+        table = FakeStockMasterTable(list(STOCKS))
+        index = _index(table)
+        index.load()
+
+        reloaded = []
+        index.add_listener(lambda rows: reloaded.append(len(rows)))
+
+        table.rows.append({"symbol": "035420", "name": "NAVER", "last_updated": "2026-10-18"})
+        table.version = "2026-10-18"
+
+        assert index.refresh_if_stale(force=True) is True
+        assert index.get_name("035420") == "NAVER"
+        assert reloaded == [5]
+
+    def test_refresh_skips_reload_when_unchanged(self):
+        """6. refresh_if_stale() - 버전 동일 시 재로드 생략"""
+        table = FakeStockMasterTable(STOCKS)
+        index = _index(table)
+        index.load()
+        page_calls = table.page_calls
+
+        assert index.refresh_if_stale(force=True) is False
+        assert table.page_calls == page_calls
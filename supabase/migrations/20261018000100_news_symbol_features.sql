@@ -0,0 +1,20 @@
+-- 🔥 종목별 뉴스 Feature Store
+-- news-crawler가 기사 저장 시 증분 갱신, report-service는 종목당 1행만 조회
+
+CREATE TABLE IF NOT EXISTS public.news_symbol_features (
+    symbol VARCHAR(20) PRIMARY KEY,
+    daily_buckets JSONB NOT NULL DEFAULT '{}'::jsonb,     -- {YYYY-MM-DD: {count, sentiment_sum, impact_sum, positive, negative, keywords}}
+    features JSONB NOT NULL DEFAULT '{}'::jsonb,          -- {1d, 3d, 7d, recent_sentiment_change}
+    high_impact_news JSONB NOT NULL DEFAULT '[]'::jsonb,  -- 7일 이내 고영향도 뉴스 상위 5개
+    latest_published_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_symbol_features_updated_at
+    ON public.news_symbol_features (updated_at DESC);
+
+ALTER TABLE public.news_symbol_features ENABLE ROW LEVEL SECURITY;
+
+-- 서비스 키(service_role)만 읽기/쓰기
+CREATE POLICY "service role full access" ON public.news_symbol_features
+    FOR ALL TO service_role USING (true) WITH CHECK (true);
@@ -0,0 +1,7 @@
+-- 유사 뉴스(전재/통신사 기사) 클러스터링
+-- 대표 기사 1건만 저장하고 같은 기사의 다른 언론사 URL은 duplicate_urls에 연결
+
+ALTER TABLE news
+  ADD COLUMN IF NOT EXISTS duplicate_urls JSONB NOT NULL DEFAULT '[]'::jsonb;
+
+COMMENT ON COLUMN news.duplicate_urls IS '같은 기사로 판단된 다른 언론사 URL 목록 (news-crawler MinHash 클러스터링)';
@@ -0,0 +1,38 @@
+-- 🔥 뉴스 URL 유니크 제약
+-- news-crawler 일괄 저장이 url 기준 upsert(중복 무시)를 사용하므로 유니크 인덱스 필요
+-- 기존 중복 URL은 한 행만 남기고 제거
+-- 남길 행: AI 분석된 행(sentiment_score 있음) 우선 → 먼저 저장된 행(created_at, id)
+
+CREATE TEMP TABLE news_url_duplicates AS
+SELECT ranked.id AS duplicate_id, ranked.keep_id
+FROM (
+    SELECT
+        id,
+        FIRST_VALUE(id) OVER w AS keep_id,
+        ROW_NUMBER() OVER w AS rn
+    FROM news
+    WHERE url IS NOT NULL
+    WINDOW w AS (PARTITION BY url ORDER BY (sentiment_score IS NULL), created_at, id)
+) ranked
+WHERE ranked.rn > 1;
+
+-- 삭제될 뉴스를 가리키는 레포트 관련 뉴스 ID는 남길 행으로 교체 (순서 유지 + 중복 제거)
+UPDATE stock_reports r
+SET related_news_ids = (
+    SELECT array_agg(mapped.news_id ORDER BY mapped.first_ord)
+    FROM (
+        SELECT COALESCE(d.keep_id, e.news_id) AS news_id, MIN(e.ord) AS first_ord
+        FROM unnest(r.related_news_ids) WITH ORDINALITY AS e(news_id, ord)
+        LEFT JOIN news_url_duplicates d ON d.duplicate_id = e.news_id
+        GROUP BY COALESCE(d.keep_id, e.news_id)
+    ) mapped
+)
+WHERE r.related_news_ids && (SELECT array_agg(duplicate_id) FROM news_url_duplicates);
+
+DELETE FROM news n
+USING news_url_duplicates d
+WHERE n.id = d.duplicate_id;
+
+DROP TABLE news_url_duplicates;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_news_url_unique ON news (url);
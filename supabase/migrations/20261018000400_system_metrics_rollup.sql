@@ -0,0 +1,122 @@
+-- 🔥 시스템 메트릭 분 단위 롤업 + 관리자 요약 RPC
+-- admin-service /metrics/summary가 원본 행 전체를 가져와 Python에서 평균을 내던 방식 대체
+-- system_metrics INSERT 시 (서비스, 메트릭, 분) 단위 count/sum/min/max를 증분 갱신
+
+CREATE TABLE IF NOT EXISTS public.system_metrics_rollup_1m (
+    bucket TIMESTAMPTZ NOT NULL,             -- 분 단위 (date_trunc('minute', timestamp))
+    service_name TEXT NOT NULL,
+    metric_type TEXT NOT NULL,
+    sample_count BIGINT NOT NULL DEFAULT 0,
+    value_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    value_min DOUBLE PRECISION,
+    value_max DOUBLE PRECISION,
+    PRIMARY KEY (bucket, service_name, metric_type)
+);
+
+CREATE INDEX IF NOT EXISTS idx_system_metrics_rollup_1m_metric_bucket
+    ON public.system_metrics_rollup_1m (metric_type, bucket);
+
+ALTER TABLE public.system_metrics_rollup_1m ENABLE ROW LEVEL SECURITY;
+
+-- 서비스 키(service_role)만 읽기/쓰기
+CREATE POLICY "service role full access" ON public.system_metrics_rollup_1m
+    FOR ALL TO service_role USING (true) WITH CHECK (true);
+
+
+-- 1. INSERT 문 단위 트리거 (일괄 INSERT도 롤업 upsert 1회)
+CREATE OR REPLACE FUNCTION public.rollup_system_metrics()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO public.system_metrics_rollup_1m AS r
+        (bucket, service_name, metric_type, sample_count, value_sum, value_min, value_max)
+    SELECT
+        date_trunc('minute', n."timestamp"),
+        n.service_name,
+        n.metric_type,
+        COUNT(*),
+        SUM(n.value),
+        MIN(n.value),
+        MAX(n.value)
+    FROM new_rows n
+    WHERE n.value IS NOT NULL
+    GROUP BY 1, 2, 3
+    ON CONFLICT (bucket, service_name, metric_type) DO UPDATE SET
+        sample_count = r.sample_count + EXCLUDED.sample_count,
+        value_sum = r.value_sum + EXCLUDED.value_sum,
+        value_min = LEAST(r.value_min, EXCLUDED.value_min),
+        value_max = GREATEST(r.value_max, EXCLUDED.value_max);
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_rollup_system_metrics ON public.system_metrics;
+CREATE TRIGGER trg_rollup_system_metrics
+    AFTER INSERT ON public.system_metrics
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION public.rollup_system_metrics();
+
+
+-- 2. 기존 데이터 백필 (조회 최대 기간 7일)
+INSERT INTO public.system_metrics_rollup_1m
+    (bucket, service_name, metric_type, sample_count, value_sum, value_min, value_max)
+SELECT
+    date_trunc('minute', "timestamp"),
+    service_name,
+    metric_type,
+    COUNT(*),
+    SUM(value),
+    MIN(value),
+    MAX(value)
+FROM public.system_metrics
+WHERE "timestamp" >= NOW() - INTERVAL '7 days'
+  AND value IS NOT NULL
+GROUP BY 1, 2, 3
+ON CONFLICT (bucket, service_name, metric_type) DO NOTHING;
+
+
+-- 3. 관리자 대시보드 요약 (롤업 집계 + 오늘 비즈니스 메트릭 + 사용자 통계, 왕복 1회)
+CREATE OR REPLACE FUNCTION public.admin_metrics_summary(p_since TIMESTAMPTZ)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    WITH service_avg AS (
+        SELECT
+            metric_type,
+            service_name,
+            SUM(value_sum) / NULLIF(SUM(sample_count), 0) AS avg_value
+        FROM public.system_metrics_rollup_1m
+        WHERE bucket >= date_trunc('minute', p_since)
+          AND metric_type IN ('latency', 'error_rate')
+        GROUP BY metric_type, service_name
+    )
+    SELECT jsonb_build_object(
+        'avg_latency_by_service', COALESCE(
+            (SELECT jsonb_object_agg(service_name, avg_value) FROM service_avg WHERE metric_type = 'latency'),
+            '{}'::jsonb
+        ),
+        'avg_error_rate_by_service', COALESCE(
+            (SELECT jsonb_object_agg(service_name, avg_value) FROM service_avg WHERE metric_type = 'error_rate'),
+            '{}'::jsonb
+        ),
+        'business_metrics', COALESCE(
+            (SELECT jsonb_object_agg(metric_name, value)
+             FROM public.business_metrics
+             WHERE date = (NOW() AT TIME ZONE 'utc')::date),
+            '{}'::jsonb
+        ),
+        'user_statistics', jsonb_build_object(
+            'total_users', (SELECT COUNT(*) FROM public.users),
+            'total_portfolios', (SELECT COUNT(*) FROM public.portfolios),
+            'total_watchlist', (SELECT COUNT(*) FROM public.watchlist),
+            'total_reports', (SELECT COUNT(*) FROM public.stock_reports)
+        )
+    );
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.admin_metrics_summary(TIMESTAMPTZ) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.admin_metrics_summary(TIMESTAMPTZ) TO service_role;
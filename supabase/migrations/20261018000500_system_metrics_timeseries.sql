@@ -0,0 +1,171 @@
+-- 🔥 시스템 메트릭 시계열 다운샘플링
+-- admin-service /metrics/timeseries가 기간 내 원본 포인트 전체를 가져오던 방식 대체
+-- 버킷 크기에 따라 원본(짧은 기간) / 1분 롤업 / 1시간 롤업에서 버킷 집계 (avg/min/max/p95)
+
+-- 원본 티어 조회용 인덱스
+CREATE INDEX IF NOT EXISTS idx_system_metrics_type_timestamp
+    ON public.system_metrics (metric_type, "timestamp");
+
+-- 1시간 롤업 (1분 롤업과 동일 구조)
+CREATE TABLE IF NOT EXISTS public.system_metrics_rollup_1h (
+    bucket TIMESTAMPTZ NOT NULL,             -- 시간 단위 (date_trunc('hour', timestamp))
+    service_name TEXT NOT NULL,
+    metric_type TEXT NOT NULL,
+    sample_count BIGINT NOT NULL DEFAULT 0,
+    value_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    value_min DOUBLE PRECISION,
+    value_max DOUBLE PRECISION,
+    PRIMARY KEY (bucket, service_name, metric_type)
+);
+
+CREATE INDEX IF NOT EXISTS idx_system_metrics_rollup_1h_metric_bucket
+    ON public.system_metrics_rollup_1h (metric_type, bucket);
+
+ALTER TABLE public.system_metrics_rollup_1h ENABLE ROW LEVEL SECURITY;
+
+-- 서비스 키(service_role)만 읽기/쓰기
+CREATE POLICY "service role full access" ON public.system_metrics_rollup_1h
+    FOR ALL TO service_role USING (true) WITH CHECK (true);
+
+
+-- 1. 롤업 트리거 함수 교체 (1분 + 1시간 동시 갱신)
+CREATE OR REPLACE FUNCTION public.rollup_system_metrics()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO public.system_metrics_rollup_1m AS r
+        (bucket, service_name, metric_type, sample_count, value_sum, value_min, value_max)
+    SELECT
+        date_trunc('minute', n."timestamp"),
+        n.service_name,
+        n.metric_type,
+        COUNT(*),
+        SUM(n.value),
+        MIN(n.value),
+        MAX(n.value)
+    FROM new_rows n
+    WHERE n.value IS NOT NULL
+    GROUP BY 1, 2, 3
+    ON CONFLICT (bucket, service_name, metric_type) DO UPDATE SET
+        sample_count = r.sample_count + EXCLUDED.sample_count,
+        value_sum = r.value_sum + EXCLUDED.value_sum,
+        value_min = LEAST(r.value_min, EXCLUDED.value_min),
+        value_max = GREATEST(r.value_max, EXCLUDED.value_max);
+
+    INSERT INTO public.system_metrics_rollup_1h AS r
+        (bucket, service_name, metric_type, sample_count, value_sum, value_min, value_max)
+    SELECT
+        date_trunc('hour', n."timestamp"),
+        n.service_name,
+        n.metric_type,
+        COUNT(*),
+        SUM(n.value),
+        MIN(n.value),
+        MAX(n.value)
+    FROM new_rows n
+    WHERE n.value IS NOT NULL
+    GROUP BY 1, 2, 3
+    ON CONFLICT (bucket, service_name, metric_type) DO UPDATE SET
+        sample_count = r.sample_count + EXCLUDED.sample_count,
+        value_sum = r.value_sum + EXCLUDED.value_sum,
+        value_min = LEAST(r.value_min, EXCLUDED.value_min),
+        value_max = GREATEST(r.value_max, EXCLUDED.value_max);
+
+    RETURN NULL;
+END;
+$$;
+
+
+-- 2. 1시간 롤업 백필 (1분 롤업에서 재집계)
+INSERT INTO public.system_metrics_rollup_1h
+    (bucket, service_name, metric_type, sample_count, value_sum, value_min, value_max)
+SELECT
+    date_trunc('hour', bucket),
+    service_name,
+    metric_type,
+    SUM(sample_count),
+    SUM(value_sum),
+    MIN(value_min),
+    MAX(value_max)
+FROM public.system_metrics_rollup_1m
+GROUP BY 1, 2, 3
+ON CONFLICT (bucket, service_name, metric_type) DO NOTHING;
+
+
+-- 3. 버킷 집계 시계열
+--    p_bucket_seconds < 60   : 원본 (p95 정확값)
+--    p_bucket_seconds < 3600 : 1분 롤업 (p95는 분 평균의 95 백분위 근사)
+--    그 외                   : 1시간 롤업 (p95 미제공)
+CREATE OR REPLACE FUNCTION public.admin_metric_timeseries(
+    p_metric_type TEXT,
+    p_since TIMESTAMPTZ,
+    p_bucket_seconds INTEGER,
+    p_service_name TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    bucket TIMESTAMPTZ,
+    sample_count BIGINT,
+    avg_value DOUBLE PRECISION,
+    min_value DOUBLE PRECISION,
+    max_value DOUBLE PRECISION,
+    p95_value DOUBLE PRECISION
+)
+LANGUAGE plpgsql
+STABLE
+AS $$
+BEGIN
+    IF p_bucket_seconds < 60 THEN
+        RETURN QUERY
+        SELECT
+            to_timestamp(floor(extract(epoch FROM m."timestamp") / p_bucket_seconds) * p_bucket_seconds) AS b,
+            COUNT(*),
+            AVG(m.value)::DOUBLE PRECISION,
+            MIN(m.value)::DOUBLE PRECISION,
+            MAX(m.value)::DOUBLE PRECISION,
+            percentile_cont(0.95) WITHIN GROUP (ORDER BY m.value)::DOUBLE PRECISION
+        FROM public.system_metrics m
+        WHERE m.metric_type = p_metric_type
+          AND m."timestamp" >= p_since
+          AND m.value IS NOT NULL
+          AND (p_service_name IS NULL OR m.service_name = p_service_name)
+        GROUP BY b
+        ORDER BY b;
+
+    ELSIF p_bucket_seconds < 3600 THEN
+        RETURN QUERY
+        SELECT
+            to_timestamp(floor(extract(epoch FROM r.bucket) / p_bucket_seconds) * p_bucket_seconds) AS b,
+            SUM(r.sample_count)::BIGINT,
+            SUM(r.value_sum) / NULLIF(SUM(r.sample_count), 0),
+            MIN(r.value_min),
+            MAX(r.value_max),
+            percentile_cont(0.95) WITHIN GROUP (ORDER BY r.value_sum / NULLIF(r.sample_count, 0))
+        FROM public.system_metrics_rollup_1m r
+        WHERE r.metric_type = p_metric_type
+          AND r.bucket >= date_trunc('minute', p_since)
+          AND (p_service_name IS NULL OR r.service_name = p_service_name)
+        GROUP BY b
+        ORDER BY b;
+
+    ELSE
+        RETURN QUERY
+        SELECT
+            to_timestamp(floor(extract(epoch FROM r.bucket) / p_bucket_seconds) * p_bucket_seconds) AS b,
+            SUM(r.sample_count)::BIGINT,
+            SUM(r.value_sum) / NULLIF(SUM(r.sample_count), 0),
+            MIN(r.value_min),
+            MAX(r.value_max),
+            NULL::DOUBLE PRECISION
+        FROM public.system_metrics_rollup_1h r
+        WHERE r.metric_type = p_metric_type
+          AND r.bucket >= date_trunc('hour', p_since)
+          AND (p_service_name IS NULL OR r.service_name = p_service_name)
+        GROUP BY b
+        ORDER BY b;
+    END IF;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.admin_metric_timeseries(TEXT, TIMESTAMPTZ, INTEGER, TEXT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.admin_metric_timeseries(TEXT, TIMESTAMPTZ, INTEGER, TEXT) TO service_role;
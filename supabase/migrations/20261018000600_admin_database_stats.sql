@@ -0,0 +1,84 @@
+-- 🔥 관리자 데이터베이스 통계 RPC
+-- admin-service /database/tables, /database/statistics가 테이블마다 count/최근 시각 쿼리를
+-- 순차 실행하던 방식 대체 (RPC 1회)
+
+-- 1. 테이블별 통계
+--    row_count: pg_stat_user_tables.n_live_tup (추정치, autovacuum/analyze 시 갱신)
+--    size_bytes: pg_total_relation_size (인덱스/TOAST 포함)
+--    last_updated: updated_at (없으면 created_at) 최댓값
+CREATE OR REPLACE FUNCTION public.admin_table_stats(p_tables TEXT[])
+RETURNS TABLE (
+    table_name TEXT,
+    row_count BIGINT,
+    size_bytes BIGINT,
+    last_updated TIMESTAMPTZ
+)
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    t RECORD;
+    ts_column TEXT;
+BEGIN
+    FOR t IN
+        SELECT s.relname::TEXT AS relname, s.relid, s.n_live_tup
+        FROM pg_stat_user_tables s
+        WHERE s.schemaname = 'public'
+          AND s.relname = ANY(p_tables)
+    LOOP
+        SELECT c.column_name INTO ts_column
+        FROM information_schema.columns c
+        WHERE c.table_schema = 'public'
+          AND c.table_name = t.relname
+          AND c.column_name IN ('updated_at', 'created_at')
+        ORDER BY c.column_name DESC  -- updated_at 우선
+        LIMIT 1;
+
+        table_name := t.relname;
+        row_count := t.n_live_tup;
+        size_bytes := pg_total_relation_size(t.relid);
+        last_updated := NULL;
+
+        IF ts_column IS NOT NULL THEN
+            EXECUTE format('SELECT MAX(%I) FROM public.%I', ts_column, t.relname) INTO last_updated;
+        END IF;
+
+        RETURN NEXT;
+    END LOOP;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.admin_table_stats(TEXT[]) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.admin_table_stats(TEXT[]) TO service_role;
+
+
+-- 2. 데이터베이스 전체 통계 (정확한 count, 조건별 count는 FILTER로 한 번에)
+CREATE OR REPLACE FUNCTION public.admin_database_statistics()
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    WITH u AS (
+        SELECT COUNT(*) AS total, COUNT(*) FILTER (WHERE role = 'admin') AS admins
+        FROM public.users
+    ), a AS (
+        SELECT COUNT(*) AS total, COUNT(*) FILTER (WHERE status = 'unread') AS unread
+        FROM public.alerts
+    )
+    SELECT jsonb_build_object(
+        'users', u.total,
+        'admins', u.admins,
+        'portfolios', (SELECT COUNT(*) FROM public.portfolios),
+        'watchlist', (SELECT COUNT(*) FROM public.watchlist),
+        'reports', (SELECT COUNT(*) FROM public.stock_reports),
+        'news', (SELECT COUNT(*) FROM public.news),
+        'alerts', a.total,
+        'unread_alerts', a.unread,
+        'system_metrics', (SELECT COUNT(*) FROM public.system_metrics),
+        'admin_logs', (SELECT COUNT(*) FROM public.admin_activity_logs)
+    )
+    FROM u, a;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.admin_database_statistics() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.admin_database_statistics() TO service_role;
@@ -0,0 +1,69 @@
+-- 🔥 관리자 활동 로그 통계 RPC
+-- admin-service /logs/statistics가 기간 내 로그 전체를 가져와 Python에서 집계하고
+-- 상위 관리자마다 users를 개별 조회하던 방식 대체 (GROUP BY + JOIN, RPC 1회)
+
+CREATE INDEX IF NOT EXISTS idx_admin_activity_logs_created_at
+    ON public.admin_activity_logs (created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_admin_activity_logs_target_created
+    ON public.admin_activity_logs (target_id, created_at DESC);
+
+
+CREATE OR REPLACE FUNCTION public.admin_log_statistics(
+    p_since TIMESTAMPTZ,
+    p_top_admins INTEGER DEFAULT 5,
+    p_recent INTEGER DEFAULT 10
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    WITH window_logs AS (
+        SELECT action, admin_id, created_at
+        FROM public.admin_activity_logs
+        WHERE created_at >= p_since
+    ),
+    by_action AS (
+        SELECT COALESCE(action, 'unknown') AS action, COUNT(*) AS cnt
+        FROM window_logs
+        GROUP BY 1
+    ),
+    by_admin AS (
+        SELECT admin_id, COUNT(*) AS cnt
+        FROM window_logs
+        GROUP BY admin_id
+        ORDER BY cnt DESC
+        LIMIT p_top_admins
+    ),
+    recent AS (
+        SELECT action, created_at
+        FROM window_logs
+        ORDER BY created_at DESC
+        LIMIT p_recent
+    )
+    SELECT jsonb_build_object(
+        'total_logs', (SELECT COUNT(*) FROM window_logs),
+        'actions_count', COALESCE(
+            (SELECT jsonb_object_agg(action, cnt) FROM by_action),
+            '{}'::jsonb
+        ),
+        'top_admins', COALESCE(
+            (SELECT jsonb_agg(jsonb_build_object(
+                        'admin_id', b.admin_id,
+                        'email', u.email,
+                        'name', u.name,
+                        'activity_count', b.cnt
+                    ) ORDER BY b.cnt DESC)
+             FROM by_admin b
+             LEFT JOIN public.users u ON u.id = b.admin_id),
+            '[]'::jsonb
+        ),
+        'recent_activities', COALESCE(
+            (SELECT jsonb_agg(action ORDER BY created_at DESC) FROM recent),
+            '[]'::jsonb
+        )
+    );
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.admin_log_statistics(TIMESTAMPTZ, INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.admin_log_statistics(TIMESTAMPTZ, INTEGER, INTEGER) TO service_role;
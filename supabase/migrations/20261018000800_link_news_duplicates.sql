@@ -0,0 +1,27 @@
+-- 🔥 유사 뉴스 URL 일괄 연결 RPC
+-- news-crawler가 이전 사이클 대표 기사마다 duplicate_urls를 개별 UPDATE하던 방식 대체
+-- (대표 기사 URL → 추가할 유사 뉴스 URL 목록을 한 번에 병합, 순서 유지 + 중복 제거)
+
+CREATE OR REPLACE FUNCTION public.link_news_duplicates(p_links JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH updated AS (
+        UPDATE public.news n
+        SET duplicate_urls = (
+            SELECT COALESCE(jsonb_agg(merged.u ORDER BY merged.first_ord), '[]'::jsonb)
+            FROM (
+                SELECT t.u, MIN(t.ord) AS first_ord
+                FROM jsonb_array_elements(n.duplicate_urls || l.urls) WITH ORDINALITY AS t(u, ord)
+                GROUP BY t.u
+            ) merged
+        )
+        FROM jsonb_each(p_links) AS l(url, urls)
+        WHERE n.url = l.url
+        RETURNING 1
+    )
+    SELECT COUNT(*)::INTEGER FROM updated;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.link_news_duplicates(JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.link_news_duplicates(JSONB) TO service_role;
@@ -0,0 +1,120 @@
+-- 🔥 종목별 뉴스 Feature Store 원자적 병합 RPC
+-- news-crawler와 report-service(실시간 크롤링, 여러 레플리카)가 같은 종목 행을 동시에 갱신
+-- 기존 방식(행 조회 → Python 병합 → upsert)은 동시 flush 시 서로의 증분을 덮어써 집계가 작아짐
+-- → INSERT ... ON CONFLICT DO UPDATE 안에서 기존 버킷 + 델타를 JSONB 연산으로 병합 (행 잠금 하에 계산)
+-- 윈도우 Feature(1/3/7일)는 병합 결과에서 파생되므로 저장하지 않고 조회 시 daily_buckets로 계산
+
+-- 일자별 버킷 병합: 항목별 합산 + 키워드 상위 N개 + 보관 기간 지난 버킷 제거
+CREATE OR REPLACE FUNCTION public.merge_news_buckets(
+    p_existing JSONB,
+    p_delta JSONB,
+    p_retention_start TEXT,
+    p_max_keywords INTEGER
+)
+RETURNS JSONB
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT COALESCE(jsonb_object_agg(merged.day, merged.bucket), '{}'::jsonb)
+    FROM (
+        SELECT
+            COALESCE(e.day, d.day) AS day,
+            jsonb_build_object(
+                'count', COALESCE((e.b->>'count')::numeric, 0) + COALESCE((d.b->>'count')::numeric, 0),
+                'sentiment_sum', COALESCE((e.b->>'sentiment_sum')::numeric, 0) + COALESCE((d.b->>'sentiment_sum')::numeric, 0),
+                'impact_sum', COALESCE((e.b->>'impact_sum')::numeric, 0) + COALESCE((d.b->>'impact_sum')::numeric, 0),
+                'positive', COALESCE((e.b->>'positive')::numeric, 0) + COALESCE((d.b->>'positive')::numeric, 0),
+                'negative', COALESCE((e.b->>'negative')::numeric, 0) + COALESCE((d.b->>'negative')::numeric, 0),
+                'keywords', (
+                    SELECT COALESCE(jsonb_object_agg(top.word, top.cnt), '{}'::jsonb)
+                    FROM (
+                        SELECT kw.word, SUM(kw.cnt) AS cnt
+                        FROM (
+                            SELECT key AS word, value::numeric AS cnt
+                            FROM jsonb_each_text(COALESCE(e.b->'keywords', '{}'::jsonb))
+                            UNION ALL
+                            SELECT key AS word, value::numeric AS cnt
+                            FROM jsonb_each_text(COALESCE(d.b->'keywords', '{}'::jsonb))
+                        ) kw
+                        GROUP BY kw.word
+                        ORDER BY cnt DESC, kw.word
+                        LIMIT p_max_keywords
+                    ) top
+                )
+            ) AS bucket
+        FROM jsonb_each(COALESCE(p_existing, '{}'::jsonb)) AS e(day, b)
+        FULL OUTER JOIN jsonb_each(COALESCE(p_delta, '{}'::jsonb)) AS d(day, b) ON e.day = d.day
+        WHERE COALESCE(e.day, d.day) >= p_retention_start
+    ) merged;
+$$;
+
+-- 고영향도 뉴스 병합: 보관 기간 이내 + URL 중복 제거 + 영향도 순 상위 N개
+CREATE OR REPLACE FUNCTION public.merge_high_impact_news(
+    p_existing JSONB,
+    p_added JSONB,
+    p_cutoff TIMESTAMPTZ,
+    p_max_items INTEGER
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(jsonb_agg(top.n ORDER BY top.impact DESC NULLS LAST), '[]'::jsonb)
+    FROM (
+        SELECT deduped.n, deduped.impact
+        FROM (
+            SELECT DISTINCT ON (n->>'url') n, (n->>'impact_score')::numeric AS impact
+            FROM jsonb_array_elements(COALESCE(p_existing, '[]'::jsonb) || COALESCE(p_added, '[]'::jsonb)) AS n
+            WHERE n->>'published_at' IS NULL OR (n->>'published_at')::timestamptz >= p_cutoff
+            ORDER BY n->>'url', (n->>'impact_score')::numeric DESC NULLS LAST
+        ) deduped
+        ORDER BY deduped.impact DESC NULLS LAST
+        LIMIT p_max_items
+    ) top;
+$$;
+
+-- 종목별 델타 일괄 병합
+-- p_rows: [{symbol, daily_buckets(델타), high_impact_news(추가분), latest_published_at}]
+CREATE OR REPLACE FUNCTION public.merge_news_symbol_features(
+    p_rows JSONB,
+    p_retention_days INTEGER DEFAULT 7,
+    p_max_high_impact INTEGER DEFAULT 5,
+    p_max_keywords INTEGER DEFAULT 30
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_retention_start TEXT := to_char((NOW() AT TIME ZONE 'UTC')::date - (p_retention_days - 1), 'YYYY-MM-DD');
+    v_cutoff TIMESTAMPTZ := NOW() - make_interval(days => p_retention_days);
+    v_merged INTEGER;
+BEGIN
+    INSERT INTO public.news_symbol_features AS f
+        (symbol, daily_buckets, high_impact_news, latest_published_at, updated_at)
+    SELECT
+        r->>'symbol',
+        public.merge_news_buckets('{}'::jsonb, r->'daily_buckets', v_retention_start, p_max_keywords),
+        public.merge_high_impact_news('[]'::jsonb, r->'high_impact_news', v_cutoff, p_max_high_impact),
+        (r->>'latest_published_at')::timestamptz,
+        NOW()
+    FROM jsonb_array_elements(p_rows) AS r
+    ON CONFLICT (symbol) DO UPDATE SET
+        daily_buckets = public.merge_news_buckets(f.daily_buckets, EXCLUDED.daily_buckets, v_retention_start, p_max_keywords),
+        high_impact_news = public.merge_high_impact_news(f.high_impact_news, EXCLUDED.high_impact_news, v_cutoff, p_max_high_impact),
+        latest_published_at = GREATEST(f.latest_published_at, EXCLUDED.latest_published_at),
+        updated_at = NOW();
+
+    GET DIAGNOSTICS v_merged = ROW_COUNT;
+    RETURN v_merged;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.merge_news_buckets(JSONB, JSONB, TEXT, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.merge_high_impact_news(JSONB, JSONB, TIMESTAMPTZ, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.merge_news_symbol_features(JSONB, INTEGER, INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.merge_news_buckets(JSONB, JSONB, TEXT, INTEGER) TO service_role;
+GRANT EXECUTE ON FUNCTION public.merge_high_impact_news(JSONB, JSONB, TIMESTAMPTZ, INTEGER) TO service_role;
+GRANT EXECUTE ON FUNCTION public.merge_news_symbol_features(JSONB, INTEGER, INTEGER, INTEGER) TO service_role;
+
+-- 파생 Feature는 조회 측에서 daily_buckets로 계산 (동시 갱신 시 오래된 값으로 덮어쓰이지 않도록)
+ALTER TABLE public.news_symbol_features DROP COLUMN IF EXISTS features;